@@ -1,12 +1,11 @@
 import os
 from datetime import timedelta
 from fastapi.responses import RedirectResponse
-from jose import JWTError, jwt
-from authx import AuthX, AuthXConfig
+from authx import AuthX, AuthXConfig, TokenPayload
 from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import User
-from crud import get_user_by_login
+from crud import get_cached_user_by_login, get_user_role
 from secrets import compare_digest
 from functools import wraps
 from typing import Callable
@@ -31,18 +30,6 @@ async def get_db():
         yield session
 
 
-def decode_access_token(token: str):
-    try:
-        payload = jwt.decode(
-            token,
-            os.getenv("SECRET_KEY"),
-            algorithms=["HS256"]
-        )
-        return payload.get("sub")
-    except JWTError as e:
-        raise HTTPException(status_code=401, detail="Invalid token") from e
-    
-
 def get_token_from_request(request: Request):
     # Проверяем cookies
     token = request.cookies.get("access_token")
@@ -58,67 +45,77 @@ def get_token_from_request(request: Request):
     return None
 
 
+async def get_token_claims(request: Request) -> TokenPayload:
+    """
+    Проверяет access-токен из cookie один раз за запрос и сохраняет claims
+    в request.state.token_claims, а роль из токена - в request.state.role.
+    При отсутствии или ошибке токена authx выбрасывает MissingTokenError / JWTDecodeError,
+    которые обрабатываются в main.py редиректом на /login.
+    """
+    claims = getattr(request.state, "token_claims", None)
+    if claims is None:
+        claims = await security.access_token_required(request)
+        request.state.token_claims = claims
+        request.state.role = getattr(claims, "role", None)
+    return claims
+
+
 async def get_current_user(
     request: Request,
+    claims: TokenPayload = Depends(get_token_claims),
     db: AsyncSession = Depends(get_db)
 ):
-    token = request.cookies.get("access_token")
-    if not token:
-        # Перенаправляем на страницу входа с сообщением
-        response = RedirectResponse(url="/login", status_code=303)
-        response.set_cookie("message", "Для начала работы необходимо авторизоваться".encode("utf-8"))
-        return response
-    
-    try:
-        user_id = decode_access_token(token)
-    except JWTError as e:
-        # Перенаправляем на страницу входа с сообщением
-        response = RedirectResponse(url="/login", status_code=303)
-        response.set_cookie("message", "Недействительный токен. Пожалуйста, войдите снова.".encode("utf-8"))
-        return response
-    
-    user = await get_user_by_login(db, user_id)
+    user = await get_cached_user_by_login(db, claims.sub)
     if not user:
         # Перенаправляем на страницу входа с сообщением
         response = RedirectResponse(url="/login", status_code=303)
         response.set_cookie("message", "Пользователь не найден. Пожалуйста, войдите снова.".encode("utf-8"))
         return response
-    
+
+    # Пользователь уже загружен - его роль актуальнее роли из токена
+    request.state.role = user.position
     return user
 
 async def validate_csrf_token(token: str, request: Request) -> bool:
     session_token = request.session.get("csrf_token")
     return compare_digest(token, session_token)
 
+# Методы, которые ничего не меняют: для них достаточно роли из токена или кэша пользователя
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Уровни ролей: роль с большим уровнем имеет все права ролей ниже
+ROLE_LEVELS = {
+    "Ученик": 1,
+    "Проверяющий": 2,
+    "Мастер 3D": 3,
+}
+
 def require_role(role: str):
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            current_user = kwargs.get('current_user')
-            if not current_user:
+            request = kwargs.get('request')
+            if request is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Требуется авторизация"
                 )
-            
-            if role == "Ученик":
-                if current_user.position not in ["Ученик", "Проверяющий", "Мастер 3D"]:
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Недостаточно прав"
-                    )
-            elif role == "Проверяющий":
-                if current_user.position not in ["Проверяющий", "Мастер 3D"]:
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Недостаточно прав"
-                    )
-            elif role == "Мастер 3D":
-                if current_user.position != "Мастер 3D":
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Недостаточно прав"
-                    )
+
+            # Чтение (GET): роль из уже проверенного токена или из загруженного пользователя,
+            # без лишнего запроса к БД. Она может устареть: роль в токене - на время жизни токена
+            # (до 24 часов), снимок пользователя (get_current_user) - до USER_CACHE_TTL, потому что
+            # кэш у каждого воркера свой и сброс после смены роли виден только одному воркеру.
+            # Изменяющие запросы роль читают из БД без кэша: пониженный пользователь теряет
+            # право что-либо менять сразу во всех воркерах
+            claims = await get_token_claims(request)
+            if request.method not in SAFE_METHODS:
+                async with session_maker() as session:
+                    request.state.role = await get_user_role(session, claims.sub)
+            if ROLE_LEVELS.get(request.state.role, 0) < ROLE_LEVELS[role]:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Недостаточно прав"
+                )
             
             return await func(*args, **kwargs)
         return wrapper
@@ -0,0 +1,237 @@
+"""
+Нагрузочный бенчмарк страниц веб-приложения на наполненной базе (bench/seed_db.py).
+
+Каждый маршрут из ROUTES нагружается отдельно: --concurrency клиентов выполняют
+--requests запросов от имени пользователя BENCH_LOGIN. По каждому маршруту выводятся
+p50/p95/p99 времени ответа, запросы в секунду и число SQL запросов на HTTP запрос
+(по счетчику db_queries_total из common/metrics.py).
+
+По умолчанию приложение запускается в этом же процессе через ASGI транспорт httpx
+(без сети; lifespan приложения выполняется). Кроме зависимостей приложения нужен
+httpx: pip install -r bench/requirements.txt. С --url нагружается уже запущенный
+uvicorn - его нужно запустить на той же базе и с тем же SECRET_KEY:
+
+    python -m bench.seed_db --db bench.db --works 100000
+    python -m bench.http_bench --db bench.db --concurrency 20 --requests 500
+
+    DATABASE_URL=sqlite+aiosqlite:///bench.db DATABASE_ECHO=0 SECRET_KEY=... uvicorn main:app --workers 1
+    SECRET_KEY=... python -m bench.http_bench --db bench.db --url http://127.0.0.1:8000
+
+С несколькими воркерами uvicorn счетчик SQL запросов остальных воркеров попадает
+в /metrics с задержкой METRICS_SNAPSHOT_INTERVAL, поэтому запросы на HTTP запрос
+точны только с одним воркером.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from typing import Callable, NamedTuple, Optional
+
+import httpx
+
+from bench.seed_db import BENCH_LOGIN, add_seed_arguments, database_url, seed_config, seed_database
+
+
+class Route(NamedTuple):
+    name: str
+    path: Callable[[random.Random, dict], str]  # Путь очередного запроса по объемам базы
+
+
+ROUTES = {
+    route.name: route for route in (
+        Route("/", lambda rnd, counts: "/"),
+        Route("/works", lambda rnd, counts: "/works"),
+        # Дальние страницы списка: OFFSET по всей таблице работ
+        Route("/works?page", lambda rnd, counts: f"/works?page={rnd.randint(1, max(counts['works'] // 20, 1))}"),
+        Route("/works/{id}", lambda rnd, counts: f"/works/{rnd.randint(1, counts['works'])}"),
+        Route("/profile", lambda rnd, counts: "/profile"),
+        Route("/employees", lambda rnd, counts: "/employees"),
+        Route("/employees?q", lambda rnd, counts: f"/employees?q=user{rnd.randint(0, 99):02d}"),
+    )
+}
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Перцентиль методом ближайшего ранга"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class QueryCounter:
+    """Число SQL запросов, выполненных приложением с начала работы"""
+
+    def __init__(self, client: httpx.AsyncClient, in_process: bool):
+        self.client = client
+        self.in_process = in_process
+
+    async def total(self) -> Optional[float]:
+        if self.in_process:
+            from common.metrics import REGISTRY, db_queries
+            return sum(REGISTRY.snapshot()[db_queries.name].values())
+        headers = {}
+        if os.getenv("METRICS_TOKEN"):
+            headers["Authorization"] = f"Bearer {os.getenv('METRICS_TOKEN')}"
+        response = await self.client.get("/metrics", headers=headers)
+        if response.status_code != 200:
+            return None
+        return sum(
+            float(line.rsplit(" ", 1)[1]) for line in response.text.splitlines()
+            if line.startswith("db_queries_total")
+        )
+
+
+async def run_route(client, route: Route, counts: dict, args, queries: QueryCounter) -> dict:
+    rnd = random.Random(args.seed)
+    # Прогрев: шаблоны, кэш пользователя и фрагментов, страницы SQLite
+    for _ in range(args.warmup):
+        await client.get(route.path(rnd, counts))
+
+    latencies: list[float] = []
+    statuses = Counter()
+    remaining = args.requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            path = route.path(rnd, counts)
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError:
+                statuses["error"] += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    queries_before = await queries.total()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    queries_after = await queries.total()
+
+    latencies.sort()
+    ok = statuses.get(200, 0)
+    return {
+        "route": route.name,
+        "requests": args.requests,
+        "errors": args.requests - ok,
+        "statuses": {str(code): count for code, count in statuses.items()},
+        "rps": args.requests / elapsed if elapsed else None,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0) * 1000,
+        "queries_per_request": (
+            (queries_after - queries_before) / args.requests
+            if queries_before is not None and queries_after is not None else None
+        ),
+    }
+
+
+def print_results(results: list[dict]):
+    print(f"\n{'route':<16}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'queries':>9}{'errors':>8}")
+    for result in results:
+        queries = result["queries_per_request"]
+        print(
+            f"{result['route']:<16}{result['rps'] or 0:>9.1f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+            f"{result['p99_ms']:>10.1f}{result['max_ms']:>10.1f}"
+            f"{queries if queries is not None else float('nan'):>9.1f}{result['errors']:>8}"
+        )
+
+
+async def run_benchmark(args, counts: dict) -> list[dict]:
+    in_process = not args.url
+    if in_process:
+        # Настройки читаются при импорте модулей приложения, поэтому задаются до него
+        os.environ["DATABASE_URL"] = database_url(args.db)
+        os.environ.setdefault("DATABASE_ECHO", "0")
+        os.environ.setdefault("SECRET_KEY", "bench-secret-key-for-local-benchmarks")
+        os.environ.setdefault("RETENTION_ENABLED", "0")
+        os.environ.setdefault("METRICS_SNAPSHOT_INTERVAL", "0")
+    from auth import security
+    token = security.create_access_token(uid=BENCH_LOGIN, data={"role": "Мастер 3D"})
+
+    if in_process:
+        import main
+        transport = httpx.ASGITransport(app=main.app)
+        lifespan = main.app.router.lifespan_context(main.app)
+        base_url = "http://bench"
+    else:
+        transport, lifespan, base_url = None, None, args.url
+
+    results = []
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, cookies={"access_token": token}, timeout=args.timeout,
+    ) as client:
+        if lifespan is not None:
+            await lifespan.__aenter__()
+        try:
+            queries = QueryCounter(client, in_process)
+            for name in args.routes.split(","):
+                print(f"Benchmarking {name}...")
+                results.append(await run_route(client, ROUTES[name], counts, args, queries))
+        finally:
+            if lifespan is not None:
+                await lifespan.__aexit__(None, None, None)
+    return results
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="HTTP load benchmark for the web app")
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--routes", default=",".join(ROUTES), help=f"Comma separated: {', '.join(ROUTES)}")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--warmup", type=int, default=10, help="Warm-up requests per route (not measured)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--reseed", action="store_true", help="Recreate the database even if it exists")
+    parser.add_argument("--report", help="Write the results as JSON")
+    # Параметры наполнения базы - те же, что у bench/seed_db.py (если базы еще нет)
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+
+    config = seed_config(args)
+    if args.reseed and os.path.exists(args.db):
+        os.remove(args.db)
+    if not os.path.exists(args.db):
+        if args.url:
+            parser.error(f"{args.db} does not exist: seed it and start the server on it first")
+        print(f"Seeding {args.db}...")
+        asyncio.run(seed_database(database_url(args.db), config))
+    # Объемы для генерации путей (номера работ, страницы) - из самой базы
+    counts = asyncio.run(table_counts(args.db))
+    print(f"Database {args.db}: {counts}")
+
+    results = asyncio.run(run_benchmark(args, counts))
+    print_results(results)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"database": counts, "concurrency": args.concurrency, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+async def table_counts(path: str) -> dict:
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from database.models import User, Work, CompletedWorks
+
+    engine = create_async_engine(database_url(path))
+    try:
+        async with engine.connect() as conn:
+            return {
+                "users": (await conn.execute(select(func.count(User.id)))).scalar(),
+                "works": (await conn.execute(select(func.count(Work.id)))).scalar(),
+                "completed_works": (await conn.execute(select(func.count(CompletedWorks.id)))).scalar(),
+            }
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    main_cli()
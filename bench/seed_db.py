@@ -0,0 +1,143 @@
+"""
+Наполнение SQLite тестовыми данными для нагрузочного бенчмарка (bench/http_bench.py).
+
+Создает пользователей, работы и завершенные работы в заданных объемах. Первый
+пользователь - BENCH_LOGIN с ролью "Мастер 3D": от его имени бенчмарк открывает
+страницы, поэтому у него есть текущий проект и завершенные работы.
+
+    python -m bench.seed_db --db bench.db --users 2000 --works 100000 --completed 50000
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import random
+import time
+from typing import NamedTuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from database.models import Base, User, Work, CompletedWorks, TableVersion
+
+BENCH_LOGIN = "bench"
+# Распределение ролей среди остальных пользователей
+ROLE_WEIGHTS = {"Ученик": 0.85, "Проверяющий": 0.12, "Мастер 3D": 0.03}
+INSERT_CHUNK = 5000  # Строк в одном executemany
+STREETS = ("Ленина", "Мира", "Садовая", "Сигнальная", "Лесная", "Победы", "Гагарина", "Школьная")
+
+
+class SeedConfig(NamedTuple):
+    users: int = 1000
+    works: int = 10000
+    completed: int = 5000
+    in_progress_share: float = 0.2  # Доля работ, взятых на проверку
+    bench_completed: int = 50  # Завершенных работ у BENCH_LOGIN (страница /profile)
+    seed: int = 1
+
+
+SEED_DEFAULTS = SeedConfig()
+
+
+def database_url(path: str) -> str:
+    return f"sqlite+aiosqlite:///{os.path.abspath(path)}"
+
+
+def _users(config: SeedConfig, rnd: random.Random) -> list[dict]:
+    roles, weights = zip(*ROLE_WEIGHTS.items())
+    users = [{"id": 1, "login": BENCH_LOGIN, "full_name": "Бенчмарк", "position": "Мастер 3D"}]
+    for user_id in range(2, config.users + 1):
+        users.append({
+            "id": user_id,
+            "login": f"user{user_id:06d}",
+            "full_name": f"Сотрудник {user_id}",
+            "position": rnd.choices(roles, weights)[0],
+        })
+    return users
+
+
+def _works(config: SeedConfig, rnd: random.Random, inspectors: list[int]) -> list[dict]:
+    now = dt.datetime.now(dt.timezone.utc)
+    works = []
+    for work_id in range(1, config.works + 1):
+        in_progress = work_id == 1 or rnd.random() < config.in_progress_share
+        works.append({
+            "id": work_id,
+            "title": f"{rnd.choice(STREETS)} {work_id}",
+            "work_link": f"https://example.com/works/{work_id}",
+            "booklet": f"https://example.com/booklets/{work_id}.pdf",
+            # Первая работа - текущий проект BENCH_LOGIN
+            "inspector": 1 if work_id == 1 else rnd.choice(inspectors) if in_progress else None,
+            "assigned_to": in_progress,
+            "created_at": now - dt.timedelta(minutes=rnd.randrange(365 * 24 * 60)),
+        })
+    return works
+
+
+def _completed(config: SeedConfig, rnd: random.Random) -> list[dict]:
+    completed = []
+    for i in range(config.completed):
+        user_id = 1 if i < config.bench_completed else rnd.randint(1, config.users)
+        work_id = rnd.randint(1, config.works)
+        completed.append({"title": f"Работа {work_id}", "user_id": user_id, "work_id": work_id})
+    return completed
+
+
+async def _insert(conn, model, rows: list[dict]):
+    for start in range(0, len(rows), INSERT_CHUNK):
+        await conn.execute(insert(model), rows[start:start + INSERT_CHUNK])
+
+
+async def seed_database(url: str, config: SeedConfig) -> dict:
+    """Создает таблицы и заполняет их. База должна быть пустой. Возвращает число строк по таблицам"""
+    rnd = random.Random(config.seed)
+    users = _users(config, rnd)
+    inspectors = [user["id"] for user in users if user["position"] != "Ученик"]
+    works = _works(config, rnd, inspectors)
+    completed = _completed(config, rnd)
+
+    engine = create_async_engine(url)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await _insert(conn, User, users)
+            await _insert(conn, Work, works)
+            await _insert(conn, CompletedWorks, completed)
+            # Текущий проект проверяющих - любая из их работ (для справочника сотрудников)
+            current = {}
+            for work in works:
+                if work["inspector"] is not None:
+                    current.setdefault(work["inspector"], work["id"])
+            for user_id, work_id in current.items():
+                await conn.execute(update(User).where(User.id == user_id).values(current_project_id=work_id))
+            await conn.execute(insert(TableVersion), [{"name": "works", "version": 1}, {"name": "review_screenshots", "version": 1}])
+    finally:
+        await engine.dispose()
+    return {"users": len(users), "works": len(works), "completed_works": len(completed)}
+
+
+def add_seed_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--db", default="bench.db", help="SQLite file")
+    parser.add_argument("--users", type=int, default=SEED_DEFAULTS.users)
+    parser.add_argument("--works", type=int, default=SEED_DEFAULTS.works)
+    parser.add_argument("--completed", type=int, default=SEED_DEFAULTS.completed)
+    parser.add_argument("--in-progress-share", type=float, default=SEED_DEFAULTS.in_progress_share)
+    parser.add_argument("--seed", type=int, default=SEED_DEFAULTS.seed)
+
+
+def seed_config(args) -> SeedConfig:
+    return SeedConfig(
+        users=max(args.users, 1), works=max(args.works, 1), completed=args.completed,
+        in_progress_share=args.in_progress_share, seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed SQLite for the HTTP benchmark (the file is recreated)")
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+    if os.path.exists(args.db):
+        os.remove(args.db)
+    started = time.perf_counter()
+    counts = asyncio.run(seed_database(database_url(args.db), seed_config(args)))
+    print(f"Seeded {args.db} in {time.perf_counter() - started:.1f}s: {counts}")
@@ -9,8 +9,14 @@ import shutil
 from PIL import Image
 import re
 import tempfile
+import time
+from contextlib import contextmanager, nullcontext
 from typing import Dict
 import json
+try:
+    import resource  # Пиковый RSS процесса (только Unix; в Blender под Windows замер памяти пропускается)
+except ImportError:
+    resource = None
 
 # ANSI-коды для цветного вывода
 GREEN = "\033[92m"
@@ -32,6 +38,15 @@ NAMING_DETAILS = {
     'duplicates': []  # Новый раздел для дубликатов
 }
 
+# Те же результаты нейминга в виде структурированных замечаний (для JSON результатов)
+NAMING_ISSUES = {
+    'geometry': [],
+    'materials': [],
+    'textures': [],
+    'invalid_chars': [],
+    'duplicates': []
+}
+
 # Глобальная переменная для хранения деталей ошибок Geometry Data
 GEOMETRY_DETAILS = {
     'archive_size': {'status': 'Not Checked', 'messages': []},
@@ -62,6 +77,167 @@ TRANSFORM_TOLERANCE = 0.000001  # Допустимая погрешность т
 BLENDER_ROTATION_BUG = -0.000008  # Погрешность поворота за каждую выгрузку (баг Blender)
 BUG_TOLERANCE = 0.000001  # Допустимая погрешность для проверки кратности (на случай ошибок округления)
 MAX_ROTATION_BUG_COUNT = 5  # Максимальное количество выгрузок (n <= 5)
+ISSUE_SAMPLE_LIMIT = 5  # Сколько координат сохранять в примерах однотипных замечаний по объекту
+MAX_ISSUES_PER_CHECK = 200  # Сколько замечаний одной проверки попадает в JSON, остальные только считаются
+
+# Структурированные замечания проверок: {"code": ..., "object": ..., "params": {...}}.
+# В JSON результатов уходят только коды и параметры, текст на нужном языке строит веб-приложение
+# (utils/issues.py). Английские шаблоны ниже - для консоли и панелей Blender.
+ISSUE_MESSAGES = {
+    'ARCHIVE_NOT_FOUND': "Archive does not exist",
+    'ARCHIVE_SIZE': "Archive size {size_mb} MB",
+    'ARCHIVE_TOO_LARGE': "Archive size {size_mb} MB exceeds 1 GB limit",
+    'ARCHIVE_CONTENTS_OK': "Archive contents are valid",
+    'ARCHIVE_CONTENTS_ERROR': "Error checking archive contents: {error}",
+    'FBX_COUNT_INVALID': "Found {count} FBX files, expected {min} to {max}",
+    'GROUND_FBX_MISSING': "No Ground FBX file found",
+    'GROUND_FBX_MULTIPLE': "Multiple Ground FBX files found: {files}",
+    'OKS_FBX_TOO_MANY': "Too many OKS FBX files: {count}, expected up to {max}",
+    'OKS_FBX_NAME_INVALID': "Invalid OKS FBX name: {object}, expected [xxxx]_[address]_[01-20].fbx",
+    'FBX_NAME_VALID': "Valid FBX name: {object}",
+    'FBX_NAME_INVALID': "Invalid FBX name: {object}. Expected OKS or Ground pattern.",
+    'SCENE_INVALID_OBJECT_TYPE': "{object} (type: {type})",
+    'SCENE_OBJECT_HAS_HIERARCHY': "{object} (has parent or children)",
+    'SCENE_OBJECT_HAS_ANIMATION': "{object} (has animation data)",
+    'SCENE_HAS_ARMATURES': "Armatures found",
+    'SCENE_HAS_CAMERAS': "Cameras found",
+    'SCENE_HAS_LIGHTS': "Lights found",
+    'SCENE_HAS_SOUNDS': "Sounds found",
+    'GROUND_NOT_FOUND': "No Ground objects found",
+    'GROUND_NO_FACES': "{object}: No faces found",
+    'GROUND_DROP_TOO_SMALL': "{object}: Ground drop {drop}m is less than {min}m",
+    'GROUND_DROP_OK': "Ground drop check passed",
+    'FLOATING_VERTEX': "{object}: {count} floating vertices, e.g. at {samples}",
+    'DEGENERATE_EDGE': "{object}: {count} degenerate edges, e.g. at {samples}",
+    'NON_TRIANGULATED_POLYGON': "{object}: Non-triangulated polygon found (vertices: {vertices})",
+    'TRIANGULATION_OK': "All geometry is triangulated",
+    'ROTATION_NOT_RESET': "{object}: Rotation not reset (Euler {axis}: {angle})",
+    'SCALE_NOT_RESET': "{object}: Scale not reset ({scale})",
+    'UV_MISSING': "{object}: No UV map",
+    'UV_OUT_OF_BOUNDS': "{object}: UV outside 0-1 or closer than {padding}px to the edge",
+    'POLY_COUNT_OKS': "OKS polygon count: {count}/{limit}",
+    'POLY_COUNT_GROUND': "Ground polygon count: {count}/{limit}",
+    'POLY_COUNT_OTHER': "Other polygon count: {count}",
+    'NO_TEXTURES': "No textures found.",
+    'TEXTURE_NOT_PNG': "Texture {object} is not PNG",
+    'TEXTURE_HAS_ALPHA': "{object} has alpha channel (mode: {mode}, bits: {bits})",
+    'TEXTURE_SIZE_INVALID': "{object} size is {size}, expected {expected}",
+    'NO_GLASS_OBJECTS': "No glass objects found.",
+    'GLASS_TOO_MANY_MATERIALS': "{object} has {count} materials (max {max} allowed)",
+    'GLASS_HAS_TEXTURE': "{object} material {material} has texture {texture} (textures not allowed for glass)",
+    'NO_GROUND_OBJECTS': "No ground objects found.",
+    'GROUND_TOO_MANY_MATERIALS': "{object} has {count} materials (max {max} allowed)",
+    'NO_MESH_OBJECTS': "No mesh objects found in the scene.",
+    'GEOMETRY_NAME_OK': "{object}: PASSED",
+    'GEOMETRY_NAME_INVALID': "{object}: FAILED",
+    'MATERIAL_NAME_OK': "{object}: PASSED",
+    'MATERIAL_NAME_INVALID': "{object}: FAILED",
+    'INVALID_CHARS': "{object}: Invalid chars ({chars})",
+    'DUPLICATE_MATERIAL': "{object}: Duplicate material name detected",
+    'DUPLICATE_TEXTURE': "{object}: Duplicate texture name detected",
+    'MORE_ISSUES': "...and {count} more issues",
+}
+
+def make_issue(code, obj=None, **params):
+    """Замечание проверки. Пустые поля не пишем, чтобы JSON был компактнее"""
+    issue = {'code': code}
+    if obj is not None:
+        issue['object'] = obj
+    if params:
+        issue['params'] = params
+    return issue
+
+def format_issue(issue):
+    """Английский текст замечания (консоль, интерфейс Blender)"""
+    template = ISSUE_MESSAGES.get(issue['code'], issue['code'])
+    try:
+        return template.format(object=issue.get('object'), **issue.get('params', {}))
+    except (KeyError, IndexError):
+        return template
+
+class IssueAggregator:
+    """
+    Собирает однотипные замечания (летающие вершины, вырожденные рёбра и т.п.) по объектам:
+    на пару (код, объект) одно замечание с общим количеством и не более sample_limit примеров.
+    Размер результата не зависит от того, сколько ошибок в модели.
+    """
+
+    def __init__(self, sample_limit=ISSUE_SAMPLE_LIMIT):
+        self.sample_limit = sample_limit
+        self._groups = {}
+
+    def add(self, code, obj, sample=None):
+        group = self._groups.setdefault((code, obj), {'count': 0, 'samples': []})
+        group['count'] += 1
+        if sample is not None and len(group['samples']) < self.sample_limit:
+            group['samples'].append(sample)
+
+    def issues(self):
+        return [make_issue(code, obj, **group) for (code, obj), group in self._groups.items()]
+
+def cap_issues(issues, limit=MAX_ISSUES_PER_CHECK):
+    """Обрезает список замечаний до limit, остаток заменяется одним замечанием MORE_ISSUES"""
+    if len(issues) <= limit:
+        return issues
+    return issues[:limit] + [make_issue('MORE_ISSUES', count=len(issues) - limit)]
+
+def bound_results(results):
+    """Ограничивает число замечаний в каждой проверке перед записью JSON"""
+    for group in ('geometry_data', 'texture_material'):
+        for details in results.get(group, {}).values():
+            if isinstance(details, dict) and 'issues' in details:
+                details['issues'] = cap_issues(details['issues'])
+    naming = results.get('naming', {})
+    for section, issues in naming.items():
+        naming[section] = cap_issues(issues)
+    return results
+
+def rounded(vector, digits=4):
+    """Координаты/масштаб как список чисел (mathutils.Vector не сериализуется в JSON)"""
+    return [round(value, digits) for value in vector]
+
+def peak_rss_mb():
+    """Пиковый RSS процесса Blender в МБ (ru_maxrss в Linux - в КБ) или None"""
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+class PhaseTimings:
+    """
+    Время (perf_counter) и прирост пикового RSS по этапам проверки: распаковка, импорт
+    каждого FBX, каждая проверка, запись JSON. Прирост пика ненулевой только у этапов,
+    которые подняли потребление памяти выше прежнего максимума.
+    """
+
+    def __init__(self, started_at):
+        self.started_at = started_at  # time.time() старта скрипта
+        self._started = time.perf_counter()
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        rss_before = peak_rss_mb()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = {'phase': name, 'seconds': round(time.perf_counter() - started, 4)}
+            if rss_before is not None:
+                entry['peak_rss_delta_mb'] = round(peak_rss_mb() - rss_before, 1)
+            self.phases.append(entry)
+
+    def run(self, name, func, *args, **kwargs):
+        """Выполняет func как отдельный этап и возвращает ее результат"""
+        with self.phase(name):
+            return func(*args, **kwargs)
+
+    def as_dict(self):
+        return {
+            'started_at': self.started_at,
+            'total_seconds': round(time.perf_counter() - self._started, 4),
+            'peak_rss_mb': peak_rss_mb(),
+            'phases': self.phases,
+        }
 
 # Добавляем кэш для результатов проверки
 CHECK_CACHE = {}
@@ -85,7 +261,7 @@ def check_archive_with_cache(archive_path: str, output_path: str) -> Dict:
         if os.path.exists(archive_path) and os.path.getmtime(archive_path) == cached_result.get('mtime'):
             # Сохраняем результаты в файл
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(cached_result['data'], f, ensure_ascii=False, indent=4)
+                json.dump(cached_result['data'], f, ensure_ascii=False, separators=(',', ':'))
             return cached_result['data']
     
     # Если нет в кэше или файл изменился, выполняем проверку
@@ -147,8 +323,9 @@ def check_archive(archive_path: str, output_path: str) -> Dict:
             results["naming"] = check_naming()
             
             # Сохраняем результаты
+            bound_results(results)
             with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=4)
+                json.dump(results, f, ensure_ascii=False, separators=(',', ':'))
             
             return results
             
@@ -160,56 +337,56 @@ def check_geometry() -> Dict:
     Проверяет геометрию модели
     """
     results = {
-        "archive_size": {"status": "Not Checked", "messages": []},
-        "fbx_files": {"status": "Not Checked", "messages": []},
-        "scene_content": {"status": "Not Checked", "messages": []},
-        "ground_drop": {"status": "Not Checked", "messages": []},
-        "geometry_cleanliness": {"status": "Not Checked", "messages": []},
-        "triangulation": {"status": "Not Checked", "messages": []},
-        "transforms": {"status": "Not Checked", "messages": []},
-        "uv_maps": {"status": "Not Checked", "messages": []},
-        "polygons": {"status": "Not Checked", "messages": []}
+        "archive_size": {"status": "Not Checked", "issues": []},
+        "fbx_files": {"status": "Not Checked", "issues": []},
+        "scene_content": {"status": "Not Checked", "issues": []},
+        "ground_drop": {"status": "Not Checked", "issues": []},
+        "geometry_cleanliness": {"status": "Not Checked", "issues": []},
+        "triangulation": {"status": "Not Checked", "issues": []},
+        "transforms": {"status": "Not Checked", "issues": []},
+        "uv_maps": {"status": "Not Checked", "issues": []},
+        "polygons": {"status": "Not Checked", "issues": []}
     }
     
     # Проверка размера архива
     size_ok, size_msg = check_archive_size(archive_path)
     results["archive_size"]["status"] = "PASSED" if size_ok else "FAILED"
-    results["archive_size"]["messages"].append(size_msg)
+    results["archive_size"]["issues"].append(size_msg)
     
     # Проверка FBX файлов
     fbx_ok, fbx_files, fbx_msg = check_archive_contents(archive_path)
     results["fbx_files"]["status"] = "PASSED" if fbx_ok else "FAILED"
-    results["fbx_files"]["messages"].append(fbx_msg)
+    results["fbx_files"]["issues"].append(fbx_msg)
     
     # Проверка содержимого сцены
     content_ok, content_issues = check_scene_contents()
     results["scene_content"]["status"] = "PASSED" if content_ok else "FAILED"
-    results["scene_content"]["messages"].extend(content_issues)
+    results["scene_content"]["issues"].extend(content_issues)
     
     # Проверка опуска Ground
     ground_ok, ground_msg = check_ground_drop()
     results["ground_drop"]["status"] = "PASSED" if ground_ok else "FAILED"
-    results["ground_drop"]["messages"].append(ground_msg)
+    results["ground_drop"]["issues"].append(ground_msg)
     
     # Проверка чистоты геометрии
     clean_ok, clean_issues = check_geometry_cleanliness()
     results["geometry_cleanliness"]["status"] = "PASSED" if clean_ok else "FAILED"
-    results["geometry_cleanliness"]["messages"].extend(clean_issues)
+    results["geometry_cleanliness"]["issues"].extend(clean_issues)
     
     # Проверка триангуляции
     triang_ok, triang_msg = check_triangulation()
     results["triangulation"]["status"] = "PASSED" if triang_ok else "FAILED"
-    results["triangulation"]["messages"].append(triang_msg)
+    results["triangulation"]["issues"].append(triang_msg)
     
     # Проверка трансформаций
     trans_ok, trans_issues = check_transforms()
     results["transforms"]["status"] = "PASSED" if trans_ok else "FAILED"
-    results["transforms"]["messages"].extend(trans_issues)
+    results["transforms"]["issues"].extend(trans_issues)
     
     # Проверка UV-развёртки
     uv_ok, uv_issues = check_uv_maps()
     results["uv_maps"]["status"] = "PASSED" if uv_ok else "FAILED"
-    results["uv_maps"]["messages"].extend(uv_issues)
+    results["uv_maps"]["issues"].extend(uv_issues)
     
     # Подсчёт полигонов
     poly_counts = count_polygons()
@@ -275,17 +452,17 @@ def unregister_scene_properties():
 # Проверка размера архива (с округлением)
 def check_archive_size(archive_path):
     if not os.path.exists(archive_path):
-        return False, "Archive does not exist"
+        return False, make_issue('ARCHIVE_NOT_FOUND')
     size = os.path.getsize(archive_path)
     size_mb = round(size / (1024 * 1024))  # Округляем до целого числа мегабайт
     if size > MAX_ARCHIVE_SIZE:
-        return False, f"Archive size {size_mb} MB exceeds 1 GB limit"
-    return True, f"Archive size {size_mb} MB"
+        return False, make_issue('ARCHIVE_TOO_LARGE', size_mb=size_mb)
+    return True, make_issue('ARCHIVE_SIZE', size_mb=size_mb)
 
 # Проверка состава архива
 def check_archive_contents(archive_path):
     if not os.path.exists(archive_path):
-        return False, [], "Archive does not exist"
+        return False, [], make_issue('ARCHIVE_NOT_FOUND')
 
     fbx_files = []
     try:
@@ -296,51 +473,51 @@ def check_archive_contents(archive_path):
 
         # Проверка количества FBX файлов
         if len(fbx_files) < MIN_FBX_FILES or len(fbx_files) > MAX_FBX_FILES:
-            return False, fbx_files, f"Found {len(fbx_files)} FBX files, expected 1 to 21"
+            return False, fbx_files, make_issue('FBX_COUNT_INVALID', count=len(fbx_files), min=MIN_FBX_FILES, max=MAX_FBX_FILES)
 
         # Проверка наличия Ground FBX
         ground_fbx = [f for f in fbx_files if re.match(GROUND_FBX_PATTERN, os.path.basename(f), re.IGNORECASE)]
         if not ground_fbx:
-            return False, fbx_files, "No Ground FBX file found"
+            return False, fbx_files, make_issue('GROUND_FBX_MISSING')
         if len(ground_fbx) > 1:
-            return False, fbx_files, f"Multiple Ground FBX files found: {ground_fbx}"
+            return False, fbx_files, make_issue('GROUND_FBX_MULTIPLE', files=ground_fbx)
 
         # Проверка ОКС FBX файлов
         oks_fbx = [f for f in fbx_files if f not in ground_fbx]
         if len(oks_fbx) > 20:
-            return False, fbx_files, f"Too many OKS FBX files: {len(oks_fbx)}, expected up to 20"
+            return False, fbx_files, make_issue('OKS_FBX_TOO_MANY', count=len(oks_fbx), max=20)
 
         for fbx in oks_fbx:
             if not re.match(OKS_FBX_PATTERN, os.path.basename(fbx)):
-                return False, fbx_files, f"Invalid OKS FBX name: {fbx}, expected [xxxx]_[address]_[01-20].fbx"
+                return False, fbx_files, make_issue('OKS_FBX_NAME_INVALID', fbx)
 
-        return True, fbx_files, "Archive contents are valid"
+        return True, fbx_files, make_issue('ARCHIVE_CONTENTS_OK')
     except Exception as e:
-        return False, fbx_files, f"Error checking archive contents: {e}"
+        return False, fbx_files, make_issue('ARCHIVE_CONTENTS_ERROR', error=str(e))
 
 # Проверка содержимого сцены (только меши и вшитые текстуры)
 def check_scene_contents():
     invalid_objects = []
     for obj in bpy.data.objects:
         if obj.type not in ('MESH', 'EMPTY'):  # EMPTY может быть временным при импорте
-            invalid_objects.append(f"{obj.name} (type: {obj.type})")
+            invalid_objects.append(make_issue('SCENE_INVALID_OBJECT_TYPE', obj.name, type=obj.type))
         elif obj.type == 'MESH':
             # Проверяем наличие иерархических связей
             if obj.parent or obj.children:
-                invalid_objects.append(f"{obj.name} (has parent or children)")
+                invalid_objects.append(make_issue('SCENE_OBJECT_HAS_HIERARCHY', obj.name))
             # Проверяем наличие анимации
             if obj.animation_data:
-                invalid_objects.append(f"{obj.name} (has animation data)")
+                invalid_objects.append(make_issue('SCENE_OBJECT_HAS_ANIMATION', obj.name))
 
     # Проверяем наличие костей, звуков и других данных
     if bpy.data.armatures:
-        invalid_objects.append("Armatures found")
+        invalid_objects.append(make_issue('SCENE_HAS_ARMATURES'))
     if bpy.data.cameras:
-        invalid_objects.append("Cameras found")
+        invalid_objects.append(make_issue('SCENE_HAS_CAMERAS'))
     if bpy.data.lights:
-        invalid_objects.append("Lights found")
+        invalid_objects.append(make_issue('SCENE_HAS_LIGHTS'))
     if bpy.data.sounds:
-        invalid_objects.append("Sounds found")
+        invalid_objects.append(make_issue('SCENE_HAS_SOUNDS'))
 
     return len(invalid_objects) == 0, invalid_objects
 
@@ -348,7 +525,7 @@ def check_scene_contents():
 def check_ground_drop():
     ground_objects = [obj for obj in bpy.data.objects if obj.type == 'MESH' and "Ground" in obj.name]
     if not ground_objects:
-        return True, "No Ground objects found"
+        return True, make_issue('GROUND_NOT_FOUND')
 
     for obj in ground_objects:
         bpy.context.view_layer.objects.active = obj
@@ -360,7 +537,7 @@ def check_ground_drop():
         largest_face = max(bm.faces, key=lambda face: face.calc_area(), default=None)
         if not largest_face:
             bpy.ops.object.mode_set(mode='OBJECT')
-            return False, f"{obj.name}: No faces found"
+            return False, make_issue('GROUND_NO_FACES', obj.name)
 
         # Определяем граничные вершины этой грани
         boundary_verts = set(largest_face.verts)
@@ -377,15 +554,15 @@ def check_ground_drop():
         drop = max_z - global_min_z
         if drop < MIN_GROUND_DROP:
             bpy.ops.object.mode_set(mode='OBJECT')
-            return False, f"{obj.name}: Ground drop {drop}m is less than {MIN_GROUND_DROP}m"
+            return False, make_issue('GROUND_DROP_TOO_SMALL', obj.name, drop=round(drop, 4), min=MIN_GROUND_DROP)
 
         bpy.ops.object.mode_set(mode='OBJECT')
 
-    return True, "Ground drop check passed"
+    return True, make_issue('GROUND_DROP_OK')
 
 # Проверка геометрии на дубликаты, летающие точки, вырожденные элементы
 def check_geometry_cleanliness():
-    issues = []
+    aggregator = IssueAggregator()
     for obj in bpy.data.objects:
         if obj.type != 'MESH':
             continue
@@ -398,12 +575,12 @@ def check_geometry_cleanliness():
         # Проверка на летающие точки (вершины без рёбер)
         for vert in bm.verts:
             if not vert.link_edges:
-                issues.append(f"{obj.name}: Floating vertex at {vert.co}")
+                aggregator.add('FLOATING_VERTEX', obj.name, rounded(vert.co))
 
         # Проверка на вырожденные элементы (рёбра с длиной 0)
         for edge in bm.edges:
             if edge.verts[0].co == edge.verts[1].co:
-                issues.append(f"{obj.name}: Degenerate edge at {edge.verts[0].co}")
+                aggregator.add('DEGENERATE_EDGE', obj.name, rounded(edge.verts[0].co))
 
         # Проверка на дубликаты вершин и сшивание
         bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=MERGE_DISTANCE)
@@ -411,6 +588,7 @@ def check_geometry_cleanliness():
 
         bpy.ops.object.mode_set(mode='OBJECT')
 
+    issues = aggregator.issues()
     return len(issues) == 0, issues
 
 # Проверка триангуляции
@@ -420,8 +598,8 @@ def check_triangulation():
             continue
         for poly in obj.data.polygons:
             if len(poly.vertices) != 3:
-                return False, f"{obj.name}: Non-triangulated polygon found (vertices: {len(poly.vertices)})"
-    return True, "All geometry is triangulated"
+                return False, make_issue('NON_TRIANGULATED_POLYGON', obj.name, vertices=len(poly.vertices))
+    return True, make_issue('TRIANGULATION_OK')
 
 # Проверка трансформаций (с учётом бага Blender и ограничением n <= 5)
 def check_transforms():
@@ -448,11 +626,11 @@ def check_transforms():
                         continue  # Если кратно и n <= 5, это баг Blender, пропускаем
 
             # Если угол не равен 0 и не подпадает под условие бага, это ошибка
-            issues.append(f"{obj.name}: Rotation not reset (Euler {axis}: {angle})")
+            issues.append(make_issue('ROTATION_NOT_RESET', obj.name, axis=axis, angle=angle))
 
         # Проверяем масштаб
         if any(abs(scale - 1.0) > TRANSFORM_TOLERANCE for scale in obj.scale):
-            issues.append(f"{obj.name}: Scale not reset ({obj.scale})")
+            issues.append(make_issue('SCALE_NOT_RESET', obj.name, scale=rounded(obj.scale)))
 
     return len(issues) == 0, issues
 
@@ -464,7 +642,7 @@ def check_uv_maps():
             continue
 
         if not obj.data.uv_layers:
-            issues.append(f"{obj.name}")
+            issues.append(make_issue('UV_MISSING', obj.name))
             continue
 
         # Определяем размер текстуры в зависимости от типа объекта
@@ -487,23 +665,49 @@ def check_uv_maps():
                    uv.y < uv_padding_normalized or uv.y > (1 - uv_padding_normalized):
                     has_padding_issue = True
 
-        # Если есть проблемы, добавляем только имя объекта
+        # Если есть проблемы, добавляем одно замечание на объект
         if has_udim_issue or has_padding_issue:
-            issues.append(f"{obj.name}")
+            issues.append(make_issue('UV_OUT_OF_BOUNDS', obj.name, padding=UV_PADDING))
 
     return len(issues) == 0, issues
 
+# Подсчёт треугольников ОКС (Main, MainGlass) и благоустройства (Ground, Flora, GroundEl)
+def check_polygons():
+    oks_count = ground_count = other_count = 0
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH':
+            bpy.context.view_layer.objects.active = obj
+            bpy.ops.object.mode_set(mode='EDIT')
+            bm = bmesh.from_edit_mesh(obj.data)
+            bm.faces.ensure_lookup_table()
+            tri_count = len([face for face in bm.faces if len(face.verts) == 3])
+            bpy.ops.object.mode_set(mode='OBJECT')
+            if 'Main' in obj.name or 'MainGlass' in obj.name:
+                oks_count += tri_count
+            elif any(s in obj.name for s in ['Ground', 'Flora', 'GroundEl']):
+                ground_count += tri_count
+            else:
+                other_count += tri_count
+    passed = oks_count <= POLY_LIMIT_MAIN and ground_count <= POLY_LIMIT_GROUND
+    issues = [
+        make_issue('POLY_COUNT_OKS', count=oks_count, limit=POLY_LIMIT_MAIN),
+        make_issue('POLY_COUNT_GROUND', count=ground_count, limit=POLY_LIMIT_GROUND),
+    ]
+    if other_count > 0:
+        issues.append(make_issue('POLY_COUNT_OTHER', count=other_count))
+    return passed, issues
+
 # Рекурсивное извлечение содержимого архивов
-def extract_archive_contents(archive_path, extract_to_dir):
+def extract_archive_contents(archive_path, extract_to_dir=None):
     # Используем переданный extract_to_dir вместо глобальной EXTRACT_DIR
     if not os.path.exists(archive_path):
         print(f"Error: Archive path {archive_path} does not exist")
         return None, None, None
 
-    # Очищаем и создаем директорию для извлечения
+    # Очищаем и создаем директорию для извлечения (по умолчанию - рядом с архивом)
     archive_dir = os.path.dirname(archive_path)
     archive_name = os.path.splitext(os.path.basename(archive_path))[0]
-    EXTRACT_DIR = os.path.join(archive_dir, f"Extracted_{archive_name}")
+    EXTRACT_DIR = extract_to_dir or os.path.join(archive_dir, f"Extracted_{archive_name}")
     if os.path.exists(EXTRACT_DIR):
         shutil.rmtree(EXTRACT_DIR)
     os.makedirs(EXTRACT_DIR)
@@ -571,7 +775,7 @@ def extract_embedded_textures(textures_dir):
     return extracted_textures
 
 # Импорт всех FBX-файлов
-def import_fbx(fbx_files, textures_dir):
+def import_fbx(fbx_files, textures_dir, timings=None):
     # Очищаем сцену перед загрузкой новой модели
     bpy.ops.object.select_all(action='SELECT')
     bpy.ops.object.delete()
@@ -585,12 +789,14 @@ def import_fbx(fbx_files, textures_dir):
 
     extracted_textures = []
     for fbx_path in fbx_files:
-        try:
-            bpy.ops.import_scene.fbx(filepath=fbx_path)
-            print(f"Imported FBX: {fbx_path}")
-            extracted_textures.extend(extract_embedded_textures(textures_dir))
-        except Exception as e:
-            print(f"Error importing FBX {fbx_path}: {e}")
+        # Импорт каждого файла - отдельный этап в timings (если замер включен)
+        with timings.phase(f"import:{os.path.basename(fbx_path)}") if timings else nullcontext():
+            try:
+                bpy.ops.import_scene.fbx(filepath=fbx_path)
+                print(f"Imported FBX: {fbx_path}")
+                extracted_textures.extend(extract_embedded_textures(textures_dir))
+            except Exception as e:
+                print(f"Error importing FBX {fbx_path}: {e}")
     return extracted_textures
 
 # Очистка неиспользуемых текстур из bpy.data.images
@@ -691,7 +897,7 @@ def analyze_embedded_textures():
     
     # Добавляем дубликаты в NAMING_DETAILS
     for dup_name in duplicate_names:
-        NAMING_DETAILS['duplicates'].append([f"{dup_name}: Duplicate texture name detected"])
+        add_naming_result('duplicates', make_issue('DUPLICATE_TEXTURE', dup_name))
     
     # Анализируем все текстуры (не удаляем дубликаты)
     for img in bpy.data.images:
@@ -716,15 +922,20 @@ def check_invalid_characters(name, category):
         # Собираем недопустимые символы (кроме пробела, который уже выделен)
         invalid_chars = ''.join(set(char for char in name if not char.isalnum() and char != '_' and char != ' '))
         # Формируем компактное сообщение
-        error_msg = [f"{modified_name}: Invalid chars ({invalid_chars if invalid_chars else 'space'})"]
-        NAMING_DETAILS['invalid_chars'].append(error_msg)
+        add_naming_result('invalid_chars', make_issue('INVALID_CHARS', modified_name, chars=invalid_chars if invalid_chars else 'space'))
         return False
     return True
 
+# Добавляет результат проверки нейминга: строки для панели Blender и замечание для JSON
+def add_naming_result(section, issue, *extra_lines):
+    NAMING_DETAILS[section].append([format_issue(issue), *extra_lines])
+    NAMING_ISSUES[section].append(issue)
+
 # Проверка нейминга геометрий, материалов и текстур
 def validate_naming_all(texture_info):
-    global NAMING_DETAILS
+    global NAMING_DETAILS, NAMING_ISSUES
     NAMING_DETAILS = {'geometry': [], 'materials': [], 'textures': [], 'invalid_chars': [], 'duplicates': []}  # Очищаем предыдущие результаты
+    NAMING_ISSUES = {'geometry': [], 'materials': [], 'textures': [], 'invalid_chars': [], 'duplicates': []}
     
     # Проверка на дубликаты материалов
     processed_materials = set()
@@ -738,7 +949,7 @@ def validate_naming_all(texture_info):
     
     # Добавляем дубликаты материалов в NAMING_DETAILS
     for dup_name in duplicate_materials:
-        NAMING_DETAILS['duplicates'].append([f"{dup_name}: Duplicate material name detected"])
+        add_naming_result('duplicates', make_issue('DUPLICATE_MATERIAL', dup_name))
     
     # Проверка нейминга геометрий
     valid_geometry_patterns = [
@@ -761,18 +972,18 @@ def validate_naming_all(texture_info):
     mesh_objects = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
     
     if not mesh_objects:
-        NAMING_DETAILS['geometry'].append(["No mesh objects found in the scene."])
+        add_naming_result('geometry', make_issue('NO_MESH_OBJECTS'))
     else:
         for obj in mesh_objects:
             is_valid = False
             for pattern in valid_geometry_patterns:
                 if re.match(pattern, obj.name):
                     is_valid = True
-                    NAMING_DETAILS['geometry'].append([f"{obj.name}: PASSED"])
+                    add_naming_result('geometry', make_issue('GEOMETRY_NAME_OK', obj.name))
                     break
             if not is_valid:
                 naming_passed = False
-                NAMING_DETAILS['geometry'].append([f"{obj.name}: FAILED", "- expected: SM_[street name]_[building number]_Main, SM_[street name]_[building number]_MainGlass, SM_[street name]_Ground, SM_[street name]_GroundEl, SM_[street name]_GroundElGlass, SM_[street name]_Flora"])
+                add_naming_result('geometry', make_issue('GEOMETRY_NAME_INVALID', obj.name), "- expected: SM_[street name]_[building number]_Main, SM_[street name]_[building number]_MainGlass, SM_[street name]_Ground, SM_[street name]_GroundEl, SM_[street name]_GroundElGlass, SM_[street name]_Flora")
             # Проверка на недопустимые символы
             if not check_invalid_characters(obj.name, "Object"):
                 naming_passed = False
@@ -783,11 +994,11 @@ def validate_naming_all(texture_info):
         for pattern in valid_material_patterns:
             if re.match(pattern, mat.name):
                 is_valid = True
-                NAMING_DETAILS['materials'].append([f"{mat.name}: PASSED"])
+                add_naming_result('materials', make_issue('MATERIAL_NAME_OK', mat.name))
                 break
         if not is_valid:
             naming_passed = False
-            NAMING_DETAILS['materials'].append([f"{mat.name}: FAILED", "- expected: M_[street name]_[building number]_Main_[slot number], M_Glass_0[1-7], M_[street name]_Ground_[slot number], M_[street name]_GroundEl_[slot number], M_[street name]_Flora_[slot number]"])
+            add_naming_result('materials', make_issue('MATERIAL_NAME_INVALID', mat.name), "- expected: M_[street name]_[building number]_Main_[slot number], M_Glass_0[1-7], M_[street name]_Ground_[slot number], M_[street name]_GroundEl_[slot number], M_[street name]_Flora_[slot number]")
         # Проверка на недопустимые символы
         if not check_invalid_characters(mat.name, "Material"):
             naming_passed = False
@@ -845,6 +1056,7 @@ class CHECK_OT_GeometryData(Operator):
         archive_passed, archive_message = check_archive_size(scene.archive_path)
         scene.archive_status = "PASSED" if archive_passed else "FAILED"
         GEOMETRY_DETAILS['archive_size']['status'] = scene.archive_status
+        archive_message = format_issue(archive_message)
         GEOMETRY_DETAILS['archive_size']['messages'].append(archive_message)
         print(f"Archive Check: {GREEN if archive_passed else RED}{scene.archive_status}{RESET} - {archive_message}")
 
@@ -852,11 +1064,13 @@ class CHECK_OT_GeometryData(Operator):
         fbx_passed, fbx_files, fbx_message = check_archive_contents(scene.archive_path)
         scene.fbx_files_status = "PASSED" if fbx_passed else "FAILED"
         GEOMETRY_DETAILS['fbx_files']['status'] = scene.fbx_files_status
+        fbx_message = format_issue(fbx_message)
         GEOMETRY_DETAILS['fbx_files']['messages'].append(fbx_message)
         print(f"FBX Files Check: {GREEN if fbx_passed else RED}{scene.fbx_files_status}{RESET} - {fbx_message}")
 
         # Проверка содержимого сцены
         content_passed, content_issues = check_scene_contents()
+        content_issues = [format_issue(issue) for issue in content_issues]
         scene.fbx_content_status = "PASSED" if content_passed else "FAILED"
         GEOMETRY_DETAILS['scene_content']['status'] = scene.fbx_content_status
         if content_passed:
@@ -871,11 +1085,13 @@ class CHECK_OT_GeometryData(Operator):
         ground_drop_passed, ground_drop_message = check_ground_drop()
         scene.ground_drop_status = "PASSED" if ground_drop_passed else "FAILED"
         GEOMETRY_DETAILS['ground_drop']['status'] = scene.ground_drop_status
+        ground_drop_message = format_issue(ground_drop_message)
         GEOMETRY_DETAILS['ground_drop']['messages'].append(ground_drop_message)
         print(f"Ground Drop Check: {GREEN if ground_drop_passed else RED}{scene.ground_drop_status}{RESET} - {ground_drop_message}")
 
         # Проверка чистоты геометрии
         geometry_clean_passed, geometry_issues = check_geometry_cleanliness()
+        geometry_issues = [format_issue(issue) for issue in geometry_issues]
         scene.geometry_clean_status = "PASSED" if geometry_clean_passed else "FAILED"
         GEOMETRY_DETAILS['geometry_cleanliness']['status'] = scene.geometry_clean_status
         if geometry_clean_passed:
@@ -890,11 +1106,13 @@ class CHECK_OT_GeometryData(Operator):
         triangulation_passed, triangulation_message = check_triangulation()
         scene.triangulation_status = "PASSED" if triangulation_passed else "FAILED"
         GEOMETRY_DETAILS['triangulation']['status'] = scene.triangulation_status
+        triangulation_message = format_issue(triangulation_message)
         GEOMETRY_DETAILS['triangulation']['messages'].append(triangulation_message)
         print(f"Triangulation Check: {GREEN if triangulation_passed else RED}{scene.triangulation_status}{RESET} - {triangulation_message}")
 
         # Проверка трансформаций
         transform_passed, transform_issues = check_transforms()
+        transform_issues = [format_issue(issue) for issue in transform_issues]
         scene.transform_status = "PASSED" if transform_passed else "FAILED"
         GEOMETRY_DETAILS['transforms']['status'] = scene.transform_status
         if transform_passed:
@@ -909,7 +1127,7 @@ class CHECK_OT_GeometryData(Operator):
         uv_ok, uv_issues = check_uv_maps()
         geometry_results['uv_maps'] = {
             'status': 'PASSED' if uv_ok else 'FAILED',
-            'messages': uv_issues
+            'messages': [format_issue(issue) for issue in uv_issues]
         }
 
         # Polygons Count
@@ -1865,9 +2083,9 @@ def check_texture_format():
             has_textures = True
             if not img.filepath.lower().endswith('.png'):
                 passed = False
-                issues.append(f"Texture {img.name} is not PNG")
+                issues.append(make_issue('TEXTURE_NOT_PNG', img.name))
     if not has_textures:
-        return True, ["No textures found to check format."] # Consider PASS if no textures?
+        return True, [make_issue('NO_TEXTURES')] # Consider PASS if no textures?
     return passed, issues
 
 # Helper function for Alpha Channel Check
@@ -1877,12 +2095,12 @@ def check_alpha_channel():
     has_textures = False
     texture_info = analyze_embedded_textures() # Re-analyze or pass info
     if not texture_info:
-        return True, ["No textures found to check alpha channel."]
+        return True, [make_issue('NO_TEXTURES')]
     for texture_name, info in texture_info.items():
         has_textures = True
         if info.get('has_alpha_channel', False):
             passed = False
-            issues.append(f"{texture_name} has alpha channel (mode: {info.get('color_mode', 'N/A')}, bits: {info.get('bits_per_channel', 'N/A')})")
+            issues.append(make_issue('TEXTURE_HAS_ALPHA', texture_name, mode=info.get('color_mode', 'N/A'), bits=info.get('bits_per_channel', 'N/A')))
     return passed, issues
 
 # Helper function for Texture Size Check
@@ -1892,13 +2110,13 @@ def check_texture_size():
     has_textures = False
     texture_info = analyze_embedded_textures()
     if not texture_info:
-        return True, ["No textures found to check size."]
+        return True, [make_issue('NO_TEXTURES')]
     for texture_name, info in texture_info.items():
         has_textures = True
         expected_size = (TEXTURE_SIZE_DEFAULT, TEXTURE_SIZE_DEFAULT) if "GroundEl" not in texture_name else (TEXTURE_SIZE_GROUNDEL, TEXTURE_SIZE_GROUNDEL)
         if info.get('size', (0,0)) != expected_size:
             passed = False
-            issues.append(f"{texture_name} size is {info.get('size', 'N/A')}, expected {expected_size}")
+            issues.append(make_issue('TEXTURE_SIZE_INVALID', texture_name, size=info.get('size', 'N/A'), expected=expected_size))
     return passed, issues
 
 # Helper function for Glass Material Check
@@ -1912,15 +2130,15 @@ def check_glass_material():
             if obj.data.materials:
                 if len(obj.data.materials) > 7:
                     passed = False
-                    issues.append(f"{obj.name} has {len(obj.data.materials)} materials (max 7 allowed)")
+                    issues.append(make_issue('GLASS_TOO_MANY_MATERIALS', obj.name, count=len(obj.data.materials), max=7))
                 for mat in obj.data.materials:
                     if mat and mat.node_tree:
                         for node in mat.node_tree.nodes:
                             if node.type == 'TEX_IMAGE' and node.image:
                                 passed = False
-                                issues.append(f"{obj.name} material {mat.name} has texture {node.image.name} (textures not allowed for glass)")
+                                issues.append(make_issue('GLASS_HAS_TEXTURE', obj.name, material=mat.name, texture=node.image.name))
     if not has_glass_objects:
-        return True, ["No glass objects found."]
+        return True, [make_issue('NO_GLASS_OBJECTS')]
     return passed, issues
 
 # Helper function for Ground Material Check
@@ -1933,18 +2151,23 @@ def check_ground_material():
             has_ground_objects = True
             if obj.data.materials and len(obj.data.materials) > 20:
                 passed = False
-                issues.append(f"{obj.name} has {len(obj.data.materials)} materials (max 20 allowed)")
+                issues.append(make_issue('GROUND_TOO_MANY_MATERIALS', obj.name, count=len(obj.data.materials), max=20))
     if not has_ground_objects:
-        return True, ["No ground objects found."]
+        return True, [make_issue('NO_GROUND_OBJECTS')]
     return passed, issues
 
 # Точка входа для запуска из командной строки
 if __name__ == "__main__":
     import sys
     import json
+    import time
     import argparse
     import traceback
 
+    # Время старта скрипта: веб-приложение отделяет по нему запуск контейнера и Blender от самой проверки.
+    # Этапы проверки замеряются отдельно и пишутся в results['timings']
+    timings = PhaseTimings(time.time())
+
     print("Запуск model_checker.py из командной строки...")
     print(f"Аргументы: {sys.argv}")
 
@@ -1974,6 +2197,9 @@ if __name__ == "__main__":
         textures_list = [] # Инициализируем как пустой список
         is_zip = False
         extracted_dir_for_script = None
+        # Рабочая папка проверки (распаковка, текстуры). Веб-приложение передает отдельную папку
+        # на каждую проверку, без нее промежуточные файлы пишутся рядом с output_path
+        work_dir = os.environ.get("CHECK_WORKDIR") or os.path.dirname(output_path)
 
         try:
             # Проверяем, существует ли входной путь
@@ -1984,10 +2210,10 @@ if __name__ == "__main__":
             if input_path.lower().endswith('.zip'):
                 is_zip = True
                 print(f"Обработка ZIP архива: {input_path}")
-                # Создаем временную директорию для распаковки рядом с output_path
-                extracted_dir_for_script = os.path.join(os.path.dirname(output_path), "extracted_model")
+                # Создаем временную директорию для распаковки в рабочей папке проверки
+                extracted_dir_for_script = os.path.join(work_dir, "extracted_model")
                 
-                extraction = extract_archive_contents(input_path, extracted_dir_for_script)
+                extraction = timings.run('extraction', extract_archive_contents, input_path, extracted_dir_for_script)
                 if extraction is None or not extraction[1]:  # Проверяем на ошибку извлечения или отсутствие FBX
                     raise ValueError("Error during archive extraction or no FBX files found.")
                 _, fbx_files_list, textures_list = extraction
@@ -2003,10 +2229,10 @@ if __name__ == "__main__":
 
             # 2. Импорт FBX в Blender
             print("Очистка сцены и импорт FBX...")
-            textures_dir = os.path.join(os.path.dirname(output_path), "textures")
+            textures_dir = os.path.join(work_dir, "textures")
             if not os.path.exists(textures_dir):
                 os.makedirs(textures_dir, exist_ok=True)
-            import_fbx(fbx_files_list, textures_dir)
+            import_fbx(fbx_files_list, textures_dir, timings)
             print("Импорт завершен.")
 
             # 3. Запуск проверок
@@ -2015,125 +2241,110 @@ if __name__ == "__main__":
             # ---- Geometry Data Checks ----
             geometry_results = {}
             # Archive Size
-            size_ok, size_msg = check_archive_size(input_path)
+            size_ok, size_msg = timings.run('check:archive_size', check_archive_size, input_path)
             geometry_results['archive_size'] = {
                 'status': 'PASSED' if size_ok else 'FAILED',
-                'messages': [size_msg]
+                'issues': [size_msg]
             }
             # FBX Files (Archive Contents)
             if is_zip:
-                contents_ok, _, contents_msg = check_archive_contents(input_path)
+                contents_ok, _, contents_msg = timings.run('check:fbx_files', check_archive_contents, input_path)
             else:
                 base_name = os.path.basename(input_path)
                 is_ground = re.match(GROUND_FBX_PATTERN, base_name, re.IGNORECASE)
                 is_oks = re.match(OKS_FBX_PATTERN, base_name)
                 contents_ok = bool(is_ground or is_oks)
-                contents_msg = f"Valid FBX name: {base_name}" if contents_ok else f"Invalid FBX name: {base_name}. Expected OKS or Ground pattern."
+                contents_msg = make_issue('FBX_NAME_VALID' if contents_ok else 'FBX_NAME_INVALID', base_name)
             geometry_results['fbx_files'] = {
                 'status': 'PASSED' if contents_ok else 'FAILED',
-                'messages': [contents_msg]
+                'issues': [contents_msg]
             }
             # Scene Content
-            scene_ok, scene_issues = check_scene_contents()
+            scene_ok, scene_issues = timings.run('check:scene_content', check_scene_contents)
             geometry_results['scene_content'] = {
                 'status': 'PASSED' if scene_ok else 'FAILED',
-                'messages': scene_issues
+                'issues': scene_issues
             }
             # Ground Drop
-            ground_ok, ground_msg = check_ground_drop()
+            ground_ok, ground_msg = timings.run('check:ground_drop', check_ground_drop)
             geometry_results['ground_drop'] = {
                 'status': 'PASSED' if ground_ok else 'FAILED',
-                'messages': [ground_msg]
+                'issues': [ground_msg]
             }
             # Geometry Cleanliness
-            clean_ok, clean_issues = check_geometry_cleanliness()
+            clean_ok, clean_issues = timings.run('check:geometry_cleanliness', check_geometry_cleanliness)
             geometry_results['geometry_cleanliness'] = {
                 'status': 'PASSED' if clean_ok else 'FAILED',
-                'messages': clean_issues
+                'issues': clean_issues
             }
             # Triangulation
-            triang_ok, triang_msg = check_triangulation()
+            triang_ok, triang_msg = timings.run('check:triangulation', check_triangulation)
             geometry_results['triangulation'] = {
                 'status': 'PASSED' if triang_ok else 'FAILED',
-                'messages': [triang_msg]
+                'issues': [triang_msg]
             }
             # Transforms
-            trans_ok, trans_issues = check_transforms()
+            trans_ok, trans_issues = timings.run('check:transforms', check_transforms)
             geometry_results['transforms'] = {
                 'status': 'PASSED' if trans_ok else 'FAILED',
-                'messages': trans_issues
+                'issues': trans_issues
             }
             # UV Maps
-            uv_ok, uv_issues = check_uv_maps()
+            uv_ok, uv_issues = timings.run('check:uv_maps', check_uv_maps)
             geometry_results['uv_maps'] = {
                 'status': 'PASSED' if uv_ok else 'FAILED',
-                'messages': uv_issues
+                'issues': uv_issues
             }
             # Polygons Count
-            oks_count = ground_count = other_count = 0
-            for obj in bpy.data.objects:
-                if obj.type == 'MESH':
-                    bpy.context.view_layer.objects.active = obj
-                    bpy.ops.object.mode_set(mode='EDIT')
-                    bm = bmesh.from_edit_mesh(obj.data)
-                    bm.faces.ensure_lookup_table()
-                    tri_count = len([face for face in bm.faces if len(face.verts) == 3])
-                    bpy.ops.object.mode_set(mode='OBJECT')
-                    if 'Main' in obj.name or 'MainGlass' in obj.name:
-                        oks_count += tri_count
-                    elif any(s in obj.name for s in ['Ground', 'Flora', 'GroundEl']):
-                        ground_count += tri_count
-                    else:
-                        other_count += tri_count
-            poly_status = 'PASSED' if oks_count <= POLY_LIMIT_MAIN and ground_count <= POLY_LIMIT_GROUND else 'FAILED'
-            poly_messages = [f"OKS polygon count: {oks_count}/{POLY_LIMIT_MAIN}", f"Ground polygon count: {ground_count}/{POLY_LIMIT_GROUND}"]
-            if other_count > 0:
-                poly_messages.append(f"Other polygon count: {other_count}")
-            geometry_results['polygons'] = {'status': poly_status, 'messages': poly_messages}
+            poly_ok, poly_issues = timings.run('check:polygons', check_polygons)
+            geometry_results['polygons'] = {
+                'status': 'PASSED' if poly_ok else 'FAILED',
+                'issues': poly_issues
+            }
 
             results['geometry_data'] = geometry_results
             
             # ---- Texture & Material Checks ----
             texture_material_results = {}
             
-            format_ok, format_issues = check_texture_format()
+            format_ok, format_issues = timings.run('check:texture_format', check_texture_format)
             texture_material_results['texture_format'] = {
                 'status': 'PASSED' if format_ok else 'FAILED',
-                'messages': format_issues
+                'issues': format_issues
             }
             
-            alpha_ok, alpha_issues = check_alpha_channel()
+            alpha_ok, alpha_issues = timings.run('check:alpha_channel', check_alpha_channel)
             texture_material_results['alpha_channel'] = {
                 'status': 'PASSED' if alpha_ok else 'FAILED',
-                'messages': alpha_issues
+                'issues': alpha_issues
             }
             
-            size_ok, size_issues = check_texture_size()
+            size_ok, size_issues = timings.run('check:texture_size', check_texture_size)
             texture_material_results['texture_size'] = {
                 'status': 'PASSED' if size_ok else 'FAILED',
-                'messages': size_issues
+                'issues': size_issues
             }
             
-            glass_ok, glass_issues = check_glass_material()
+            glass_ok, glass_issues = timings.run('check:glass_material', check_glass_material)
             texture_material_results['glass_material'] = {
                 'status': 'PASSED' if glass_ok else 'FAILED',
-                'messages': glass_issues
+                'issues': glass_issues
             }
             
-            ground_ok, ground_issues = check_ground_material()
+            ground_ok, ground_issues = timings.run('check:ground_material', check_ground_material)
             texture_material_results['ground_material'] = {
                 'status': 'PASSED' if ground_ok else 'FAILED',
-                'messages': ground_issues
+                'issues': ground_issues
             }
             
             results['texture_material'] = texture_material_results
             
              # ---- Naming Checks ----
-            texture_analysis_results = analyze_embedded_textures() # Needed for naming checks that require texture info?
-            validate_naming_all(texture_analysis_results) # Populates global NAMING_DETAILS
+            texture_analysis_results = timings.run('texture_analysis', analyze_embedded_textures) # Needed for naming checks that require texture info?
+            timings.run('check:naming', validate_naming_all, texture_analysis_results) # Populates global NAMING_DETAILS
             results['geometry_data'] = geometry_results
             results['texture_material'] = texture_material_results
-            results['naming'] = NAMING_DETAILS # Assign the populated global dict
+            results['naming'] = NAMING_ISSUES # Structured naming issues (codes instead of text)
            
             print("Проверки завершены.")
 
@@ -2147,9 +2358,16 @@ if __name__ == "__main__":
             try:
                 print(f"Запись результатов в {output_path}...")
                 os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                with timings.phase('json_write'):
+                    bound_results(results)
+                    # Без отступов: результаты читает только веб-приложение, а размер файла заметно меньше
+                    payload = json.dumps(results, ensure_ascii=False, separators=(',', ':'))
+                # timings дописываются в уже сериализованный объект, чтобы в них попало и время сериализации
+                timings_json = json.dumps(timings.as_dict(), ensure_ascii=False, separators=(',', ':'))
+                payload = f"{payload[:-1]}{',' if len(payload) > 2 else ''}\"timings\":{timings_json}}}"
                 with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, ensure_ascii=False, indent=4)
-                print("Результаты успешно записаны.")
+                    f.write(payload)
+                print(f"Результаты успешно записаны. Время проверки: {timings.as_dict()['total_seconds']} с")
             except Exception as e_write:
                 print(f"ОШИБКА ПРИ ЗАПИСИ JSON: {e_write}")
                 if not os.path.exists(output_path):
@@ -0,0 +1,367 @@
+"""
+Генератор синтетических сцен для проверки model_checker.py и бенчмарков.
+
+Собирает ZIP архив в том виде, в каком его загружает студент:
+    0001_<улица>_01.fbx ... _NN.fbx  - N файлов ОКС (SM_<улица>_<n>_Main и стекло SM_<улица>_<n>_MainGlass)
+    0001_<улица>_Ground.fbx          - Ground из M треугольников с опуском по краю
+Текстуры (K штук заданного размера, с альфа-каналом или без) вшиваются в FBX.
+По желанию в сцену вносятся ошибки (defects), которые должна найти проверка.
+Рядом с архивом пишется <архив>.json: параметры, фактические размеры сцены
+и проверки, которые должны упасть из-за внесенных ошибок.
+
+Запуск в Blender:
+    blender -b --python generate_scene.py -- --output /data/scene.zip \
+        --oks 3 --oks-tris 5000 --ground-tris 50000 --textures 8 --texture-size 2048 \
+        --alpha --defects floating_vertices,non_triangulated
+"""
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from typing import NamedTuple
+
+import bmesh
+import bpy
+from PIL import Image
+
+STREET = "Lenina"
+FBX_CODE = "0001"
+UV_MARGIN = 0.01  # Отступ UV от краев (больше 8 px при 2048)
+BUILDING_SIZE = 12.0
+GROUND_DROP = 1.5  # Опуск Ground по краю (проверка требует не меньше 1 м)
+POLY_LIMIT_MAIN = 150000  # Как в model_checker.py
+POLY_LIMIT_GROUND = 180000
+
+# Ошибка -> проверка (ключ в результатах model_checker.py), которая должна ее найти
+DEFECTS = {
+    'floating_vertices': 'geometry_cleanliness',  # Вершины без ребер
+    'degenerate_edges': 'geometry_cleanliness',  # Ребра нулевой длины
+    'non_triangulated': 'triangulation',  # Здание из квадов
+    'unapplied_transforms': 'transforms',  # Не сброшены вращение и масштаб
+    'missing_uv': 'uv_maps',  # Нет UV-развертки
+    'uv_out_of_bounds': 'uv_maps',  # UV за пределами 0-1
+    'bad_names': 'naming',  # Имена объекта и материала не по шаблону
+    'shallow_ground': 'ground_drop',  # Опуск Ground меньше 1 м
+    'extra_objects': 'scene_content',  # Камера и источник света в файле Ground
+    'wrong_texture_size': 'texture_size',  # Текстура не 2048x2048
+    'non_png_texture': 'texture_format',  # Текстура в JPEG
+    'glass_with_texture': 'glass_material',  # Текстура на материале стекла
+}
+
+
+class SceneConfig(NamedTuple):
+    name: str = "scene"
+    oks: int = 1  # Файлов ОКС (1-20)
+    oks_tris: int = 5000  # Треугольников в каждом здании
+    ground_tris: int = 20000  # Треугольников в Ground (без опуска)
+    textures: int = 4  # Всего текстур (первая - Ground, остальные - по зданиям)
+    texture_size: int = 2048
+    alpha: bool = False  # Текстуры с альфа-каналом (проверка alpha_channel должна упасть)
+    glass: bool = True  # Стекло без текстур у каждого здания
+    defects: tuple[str, ...] = ()
+    seed: int = 0
+
+
+def expected_failures(config: SceneConfig, oks_tris: int, ground_tris: int) -> list[str]:
+    """Проверки, которые должны упасть: из внесенных ошибок, альфа-канала и фактического числа треугольников"""
+    failures = {DEFECTS[defect] for defect in config.defects}
+    if config.alpha and config.textures:
+        failures.add('alpha_channel')
+    if oks_tris > POLY_LIMIT_MAIN or ground_tris > POLY_LIMIT_GROUND:
+        failures.add('polygons')
+    return sorted(failures)
+
+
+def reset_scene():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+#______________________________________________________________________________________________________________________
+# Текстуры и материалы
+
+def make_texture(path, size, alpha, seed, file_format="PNG"):
+    """Шумовая текстура; с alpha - RGBA с градиентом прозрачности"""
+    image = Image.effect_noise((size, size), 32 + seed % 32).convert("RGB")
+    if alpha:
+        image.putalpha(Image.linear_gradient("L").resize((size, size)))
+    image.save(path, file_format)
+    return path
+
+
+def make_material(name, texture_path=None):
+    material = bpy.data.materials.new(name)
+    material.use_nodes = True
+    if texture_path:
+        nodes = material.node_tree.nodes
+        texture = nodes.new("ShaderNodeTexImage")
+        texture.image = bpy.data.images.load(texture_path)
+        bsdf = nodes.get("Principled BSDF")
+        material.node_tree.links.new(texture.outputs["Color"], bsdf.inputs["Base Color"])
+    return material
+
+
+#______________________________________________________________________________________________________________________
+# Геометрия
+
+def _planar_uv(bm, shift=0.0):
+    """Простая проекция в квадрат [UV_MARGIN, 1 - UV_MARGIN] (перекрытия островов проверке не важны)"""
+    uv_layer = bm.loops.layers.uv.new("UVMap")
+    coords = [v.co for v in bm.verts]
+    min_x = min(c.x + c.y for c in coords)
+    min_z = min(c.z for c in coords)
+    span = max(max(c.x + c.y for c in coords) - min_x, max(c.z for c in coords) - min_z, 1e-6)
+    scale = 1 - 2 * UV_MARGIN
+    for face in bm.faces:
+        for loop in face.loops:
+            co = loop.vert.co
+            u = (co.x + co.y - min_x) / span
+            v = (co.z - min_z) / span
+            loop[uv_layer].uv = (UV_MARGIN + u * scale + shift, UV_MARGIN + v * scale + shift)
+
+
+def _mesh_object(name, bm):
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def make_building(name, tris, offset, triangulate=True, uv=True, uv_shift=0.0):
+    """Коробка здания; ребра делятся так, чтобы вышло около tris треугольников"""
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=BUILDING_SIZE)
+    cuts = max(0, round(math.sqrt(tris / 12)) - 1)  # 6 граней * (cuts + 1)^2 квадов * 2
+    if cuts:
+        bmesh.ops.subdivide_edges(bm, edges=bm.edges[:], cuts=cuts, use_grid_fill=True)
+    # Смещение и высота здания - в самой геометрии, трансформации объекта остаются сброшенными
+    for vert in bm.verts:
+        vert.co.z = (vert.co.z + BUILDING_SIZE / 2) * 2
+        vert.co.x += offset
+    if triangulate:
+        bmesh.ops.triangulate(bm, faces=bm.faces[:])
+    if uv:
+        _planar_uv(bm, uv_shift)
+    return _mesh_object(name, bm)
+
+
+def make_glass(name, offset):
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=1, y_segments=1, size=BUILDING_SIZE / 4)
+    for vert in bm.verts:
+        vert.co.x += offset
+        vert.co.z += BUILDING_SIZE
+    bmesh.ops.triangulate(bm, faces=bm.faces[:])
+    _planar_uv(bm)
+    return _mesh_object(name, bm)
+
+
+def make_ground(name, tris, size, drop):
+    """Сетка из ~tris треугольников; край опущен вниз на drop (опуск Ground)"""
+    segments = max(1, round(math.sqrt(tris / 2)))
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=segments, y_segments=segments, size=size / 2)
+    boundary = [edge for edge in bm.edges if edge.is_boundary]
+    extruded = bmesh.ops.extrude_edge_only(bm, edges=boundary)
+    skirt = [item for item in extruded["geom"] if isinstance(item, bmesh.types.BMVert)]
+    bmesh.ops.translate(bm, verts=skirt, vec=(0, 0, -drop))
+    bmesh.ops.triangulate(bm, faces=bm.faces[:])
+    _planar_uv(bm)
+    return _mesh_object(name, bm)
+
+
+def assign_materials(obj, materials):
+    for material in materials:
+        obj.data.materials.append(material)
+    for index, polygon in enumerate(obj.data.polygons):
+        polygon.material_index = index % len(materials)
+
+
+def add_floating_vertices(obj, count=10):
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    for i in range(count):
+        bm.verts.new((i * 0.5, -BUILDING_SIZE, 1.0))
+    bm.to_mesh(obj.data)
+    bm.free()
+
+
+def add_degenerate_edges(obj, count=5):
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    for i in range(count):
+        a = bm.verts.new((i * 0.5, BUILDING_SIZE, 1.0))
+        b = bm.verts.new((i * 0.5, BUILDING_SIZE, 1.0))
+        bm.edges.new((a, b))
+    bm.to_mesh(obj.data)
+    bm.free()
+
+
+def triangle_count(obj):
+    return sum(len(polygon.vertices) - 2 for polygon in obj.data.polygons)
+
+
+def export_fbx(objects, path):
+    bpy.ops.object.select_all(action='DESELECT')
+    for obj in objects:
+        obj.select_set(True)
+    bpy.ops.export_scene.fbx(filepath=path, use_selection=True, path_mode='COPY', embed_textures=True)
+
+
+#______________________________________________________________________________________________________________________
+# Сборка архива
+
+def build_archive(config: SceneConfig, output_path: str) -> dict:
+    """Собирает архив сцены и возвращает ее описание (оно же пишется в <архив>.json)"""
+    unknown = set(config.defects) - DEFECTS.keys()
+    if unknown:
+        raise ValueError(f"Unknown defects: {', '.join(sorted(unknown))}")
+    if not 1 <= config.oks <= 20:
+        raise ValueError("oks must be between 1 and 20")
+    if not config.textures and {'wrong_texture_size', 'non_png_texture', 'glass_with_texture'} & set(config.defects):
+        raise ValueError("texture defects need at least one texture")
+    if not config.glass and 'glass_with_texture' in config.defects:
+        raise ValueError("glass_with_texture needs glass objects")
+    defects = set(config.defects)
+
+    reset_scene()
+    work_dir = tempfile.mkdtemp(prefix="scene_")
+    try:
+        # Текстуры: первая - Ground, остальные по кругу по зданиям
+        texture_paths = []
+        for index in range(config.textures):
+            size = config.texture_size
+            file_format, suffix = "PNG", "png"
+            if index == 0 and 'wrong_texture_size' in defects:
+                size //= 2
+            if index == 0 and 'non_png_texture' in defects:
+                file_format, suffix = "JPEG", "jpg"
+            path = os.path.join(work_dir, f"T_{STREET}_{index + 1:02d}.{suffix}")
+            # JPEG не хранит альфа-канал
+            texture_paths.append(make_texture(path, size, config.alpha and file_format == "PNG", config.seed + index, file_format))
+        building_textures = [[] for _ in range(config.oks)]
+        for index, path in enumerate(texture_paths[1:]):
+            building_textures[index % config.oks].append(path)
+
+        fbx_paths = []
+        objects_tris = {}
+        for n in range(1, config.oks + 1):
+            first = n == 1
+            obj = make_building(
+                f"SM_{STREET}_{n}_Main",
+                config.oks_tris,
+                offset=(n - 1) * BUILDING_SIZE * 2,
+                triangulate=not (first and 'non_triangulated' in defects),
+                uv=not (first and 'missing_uv' in defects),
+                uv_shift=0.5 if first and 'uv_out_of_bounds' in defects else 0.0,
+            )
+            textures = building_textures[n - 1] or [None]
+            assign_materials(obj, [
+                make_material(f"M_{STREET}_{n}_Main_{slot}", path) for slot, path in enumerate(textures, start=1)
+            ])
+            if first and 'floating_vertices' in defects:
+                add_floating_vertices(obj)
+            if first and 'degenerate_edges' in defects:
+                add_degenerate_edges(obj)
+            if first and 'unapplied_transforms' in defects:
+                obj.rotation_euler = (0.0, 0.0, 0.3)
+                obj.scale = (1.2, 1.2, 1.2)
+            if first and 'bad_names' in defects:
+                obj.name = "Building 1"
+                obj.data.materials[0].name = "Material 1"
+            objects = [obj]
+            if config.glass:
+                glass = make_glass(f"SM_{STREET}_{n}_MainGlass", offset=(n - 1) * BUILDING_SIZE * 2)
+                glass_texture = texture_paths[0] if first and 'glass_with_texture' in defects and texture_paths else None
+                assign_materials(glass, [make_material(f"M_Glass_{min(n, 7):02d}", glass_texture)])
+                objects.append(glass)
+            for item in objects:
+                objects_tris[item.name] = triangle_count(item)
+            path = os.path.join(work_dir, f"{FBX_CODE}_{STREET}_{n:02d}.fbx")
+            export_fbx(objects, path)
+            fbx_paths.append(path)
+
+        ground = make_ground(
+            f"SM_{STREET}_Ground",
+            config.ground_tris,
+            size=BUILDING_SIZE * 2 * config.oks + BUILDING_SIZE * 2,
+            drop=0.2 if 'shallow_ground' in defects else GROUND_DROP,
+        )
+        assign_materials(ground, [make_material(f"M_{STREET}_Ground_1", texture_paths[0] if texture_paths else None)])
+        objects_tris[ground.name] = triangle_count(ground)
+        ground_objects = [ground]
+        if 'extra_objects' in defects:
+            camera = bpy.data.objects.new("Camera", bpy.data.cameras.new("Camera"))
+            light = bpy.data.objects.new("Light", bpy.data.lights.new("Light", type='POINT'))
+            for obj in (camera, light):
+                bpy.context.scene.collection.objects.link(obj)
+            ground_objects += [camera, light]
+        path = os.path.join(work_dir, f"{FBX_CODE}_{STREET}_Ground.fbx")
+        export_fbx(ground_objects, path)
+        fbx_paths.append(path)
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in fbx_paths:
+                archive.write(path, os.path.basename(path))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    manifest = {
+        "config": config._asdict(),
+        "archive": os.path.abspath(output_path),
+        "archive_bytes": os.path.getsize(output_path),
+        "fbx_files": [os.path.basename(path) for path in fbx_paths],
+        "triangles": sum(objects_tris.values()),
+        "objects": objects_tris,
+        "expected_failures": expected_failures(
+            config,
+            oks_tris=sum(tris for name, tris in objects_tris.items() if "Main" in name),
+            ground_tris=objects_tris[ground.name],
+        ),
+    }
+    with open(f"{output_path}.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def parse_args(argv):
+    import argparse
+    parser = argparse.ArgumentParser(description="Synthetic scene generator for model_checker.py")
+    parser.add_argument("--output", required=True, help="Path to the ZIP archive to create")
+    parser.add_argument("--oks", type=int, default=1, help="Number of OKS FBX files (1-20)")
+    parser.add_argument("--oks-tris", type=int, default=5000, help="Triangles per building")
+    parser.add_argument("--ground-tris", type=int, default=20000, help="Triangles in the Ground mesh")
+    parser.add_argument("--textures", type=int, default=4, help="Number of textures")
+    parser.add_argument("--texture-size", type=int, default=2048)
+    parser.add_argument("--alpha", action="store_true", help="Textures with an alpha channel")
+    parser.add_argument("--no-glass", action="store_true", help="Do not add MainGlass objects")
+    parser.add_argument("--defects", default="", help=f"Comma separated: {', '.join(DEFECTS)}")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    return args.output, SceneConfig(
+        name=os.path.splitext(os.path.basename(args.output))[0],
+        oks=args.oks,
+        oks_tris=args.oks_tris,
+        ground_tris=args.ground_tris,
+        textures=args.textures,
+        texture_size=args.texture_size,
+        alpha=args.alpha,
+        glass=not args.no_glass,
+        defects=tuple(defect for defect in args.defects.split(",") if defect),
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    output_path, config = parse_args(argv)
+    manifest = build_archive(config, output_path)
+    print(f"Scene {config.name}: {len(manifest['fbx_files'])} FBX, {manifest['triangles']} triangles, "
+          f"{manifest['archive_bytes']} bytes -> {manifest['archive']}")
+    if manifest["expected_failures"]:
+        print(f"Expected failing checks: {', '.join(manifest['expected_failures'])}")
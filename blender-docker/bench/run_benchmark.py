@@ -0,0 +1,240 @@
+"""
+Бенчмарк проверок model_checker.py на синтетических сценах (generate_scene.py).
+
+Для каждой сцены из SCENES архив генерируется один раз (кэшируется в --work-dir
+по параметрам сцены), затем --repeat раз выполняется тот же конвейер, что и при
+проверке в веб-приложении: распаковка, импорт, каждая проверка по отдельности.
+Для каждого этапа берется медиана времени; пропускная способность считается
+в треугольниках в секунду и проверках в час.
+
+Медианы сравниваются с сохраненными базовыми значениями (baselines.json рядом
+со скриптом). Этап считается регрессией, если он медленнее базового значения
+больше чем на --tolerance и больше чем на MIN_REGRESSION_SECONDS (шум на
+быстрых этапах). Также проверяется, что внесенные в сцену ошибки найдены.
+При регрессии или ненайденной ошибке код выхода 1.
+
+Запуск (из корня blender-docker):
+    docker run --rm -v "$PWD:/work" blender-docker_blender \
+        blender -b --python-exit-code 1 --python /work/bench/run_benchmark.py -- \
+        --scenes small,typical --repeat 3 --report /work/output/bench.json
+
+Новые базовые значения (после осознанного изменения производительности):
+    ... --python /work/bench/run_benchmark.py -- --update-baselines
+"""
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import bpy
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from generate_scene import SceneConfig, build_archive, reset_scene  # noqa: E402
+
+DEFAULT_BASELINES = os.path.join(BENCH_DIR, "baselines.json")
+DEFAULT_ADDONS = os.path.join(BENCH_DIR, "..", "addons")
+MIN_REGRESSION_SECONDS = 0.05
+
+# Сцены бенчмарка: от минимальной до предельной по лимитам полигонов, и сцена со всеми ошибками
+SCENES = {
+    "small": SceneConfig("small", oks=1, oks_tris=2000, ground_tris=2000, textures=2, texture_size=1024),
+    "typical": SceneConfig("typical", oks=3, oks_tris=20000, ground_tris=50000, textures=8),
+    "heavy": SceneConfig("heavy", oks=10, oks_tris=15000, ground_tris=180000, textures=20, alpha=True),
+    "defects": SceneConfig(
+        "defects", oks=2, oks_tris=5000, ground_tris=20000, textures=4,
+        defects=(
+            'floating_vertices', 'degenerate_edges', 'non_triangulated', 'unapplied_transforms',
+            'uv_out_of_bounds', 'bad_names', 'shallow_ground', 'extra_objects',
+            'wrong_texture_size', 'non_png_texture', 'glass_with_texture',
+        ),
+    ),
+}
+
+
+def import_model_checker(addons_dir):
+    sys.path.insert(0, os.path.abspath(addons_dir))
+    import model_checker
+    return model_checker
+
+
+def scene_archive(config, work_dir):
+    """Архив сцены из кэша или только что сгенерированный (ключ - параметры сцены)"""
+    key = hashlib.sha256(json.dumps(config._asdict(), sort_keys=True).encode()).hexdigest()[:12]
+    path = os.path.join(work_dir, f"{config.name}_{key}.zip")
+    if os.path.exists(path) and os.path.exists(f"{path}.json"):
+        with open(f"{path}.json", encoding="utf-8") as f:
+            return path, json.load(f)
+    print(f"Generating scene {config.name}...")
+    return path, build_archive(config, path)
+
+
+def pipeline(mc, archive_path):
+    """Этапы в том же порядке и с теми же именами, что и timings в model_checker.py"""
+    state = {}
+
+    def texture_analysis():
+        state['texture_info'] = mc.analyze_embedded_textures()
+        return state['texture_info']
+
+    def naming():
+        mc.validate_naming_all(state['texture_info'])
+        # Как issue_status в utils/issues.py: провалом считаются только *_INVALID
+        failed = [
+            issue for issues in mc.NAMING_ISSUES.values() for issue in issues
+            if issue['code'].endswith('_INVALID')
+        ]
+        return not failed, failed
+
+    return [
+        ('check:archive_size', lambda: mc.check_archive_size(archive_path)),
+        ('check:fbx_files', lambda: mc.check_archive_contents(archive_path)),
+        ('check:scene_content', mc.check_scene_contents),
+        ('check:ground_drop', mc.check_ground_drop),
+        ('check:geometry_cleanliness', mc.check_geometry_cleanliness),
+        ('check:triangulation', mc.check_triangulation),
+        ('check:transforms', mc.check_transforms),
+        ('check:uv_maps', mc.check_uv_maps),
+        ('check:polygons', mc.check_polygons),
+        ('check:texture_format', mc.check_texture_format),
+        ('check:alpha_channel', mc.check_alpha_channel),
+        ('check:texture_size', mc.check_texture_size),
+        ('check:glass_material', mc.check_glass_material),
+        ('check:ground_material', mc.check_ground_material),
+        ('texture_analysis', texture_analysis),
+        ('check:naming', naming),
+    ]
+
+
+def run_once(mc, archive_path, work_dir):
+    """Один прогон: {этап: секунды} и {проверка: прошла ли}"""
+    reset_scene()
+    seconds, passed = {}, {}
+    extract_dir = tempfile.mkdtemp(prefix="extract_", dir=work_dir)
+
+    started = time.perf_counter()
+    _, fbx_files, _ = mc.extract_archive_contents(archive_path, extract_dir)
+    seconds['extraction'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    mc.import_fbx(fbx_files, os.path.join(extract_dir, "Textures"))
+    seconds['import'] = time.perf_counter() - started
+
+    for name, check in pipeline(mc, archive_path):
+        started = time.perf_counter()
+        result = check()
+        seconds[name] = time.perf_counter() - started
+        if isinstance(result, tuple):
+            passed[name.split(':', 1)[-1]] = bool(result[0])
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    return seconds, passed
+
+
+def benchmark_scene(mc, config, work_dir, repeat):
+    archive_path, manifest = scene_archive(config, work_dir)
+    runs = []
+    passed = {}
+    for _ in range(repeat):
+        seconds, passed = run_once(mc, archive_path, work_dir)
+        runs.append(seconds)
+    phases = {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+    total = sum(phases.values())
+    failed = sorted(name for name, ok in passed.items() if not ok)
+    return {
+        "scene": config.name,
+        "triangles": manifest["triangles"],
+        "archive_bytes": manifest["archive_bytes"],
+        "phases": phases,
+        "total_seconds": total,
+        "triangles_per_second": manifest["triangles"] / total if total else None,
+        "checks_per_hour": 3600 / total if total else None,
+        "failed_checks": failed,
+        # Внесенные ошибки, которые проверка не нашла
+        "missed_defects": sorted(set(manifest["expected_failures"]) - set(failed)),
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Этапы, ставшие медленнее базовых значений: [(этап, было, стало)]"""
+    regressions = []
+    for name, seconds in result["phases"].items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if seconds > base * (1 + tolerance) and seconds - base > MIN_REGRESSION_SECONDS:
+            regressions.append((name, base, seconds))
+    return regressions
+
+
+def print_result(result, baseline):
+    print(f"\n=== {result['scene']}: {result['triangles']} triangles, {result['archive_bytes'] / 1024 / 1024:.1f} MB ===")
+    for name, seconds in sorted(result["phases"].items(), key=lambda item: -item[1]):
+        base = baseline.get(name)
+        delta = f"  ({(seconds / base - 1) * 100:+.0f}% vs {base:.3f}s)" if base else ""
+        print(f"  {name:<30} {seconds:8.3f}s{delta}")
+    print(f"  {'total':<30} {result['total_seconds']:8.3f}s  "
+          f"{result['triangles_per_second'] or 0:,.0f} tris/s, {result['checks_per_hour'] or 0:.0f} checks/hour")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark for model_checker.py checks")
+    parser.add_argument("--scenes", default=",".join(SCENES), help=f"Comma separated: {', '.join(SCENES)}")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--baselines", default=DEFAULT_BASELINES)
+    parser.add_argument("--update-baselines", action="store_true", help="Store the current medians as baselines")
+    parser.add_argument("--addons", default=DEFAULT_ADDONS if os.path.isdir(DEFAULT_ADDONS) else "/app/addons")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "model-checker-bench"))
+    parser.add_argument("--report", help="Write the full results as JSON")
+    args = parser.parse_args(argv)
+
+    mc = import_model_checker(args.addons)
+    os.makedirs(args.work_dir, exist_ok=True)
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines, encoding="utf-8") as f:
+            baselines = json.load(f)
+    else:
+        print(f"No baselines at {args.baselines}: run with --update-baselines to store them")
+
+    results, failures = [], []
+    for name in args.scenes.split(","):
+        config = SCENES[name]
+        result = benchmark_scene(mc, config, args.work_dir, args.repeat)
+        baseline = baselines.get(name, {})
+        print_result(result, baseline)
+        results.append(result)
+        if result["missed_defects"]:
+            failures.append(f"{name}: defects not detected by {', '.join(result['missed_defects'])}")
+        if not args.update_baselines:
+            for phase, base, seconds in compare(result, baseline, args.tolerance):
+                failures.append(f"{name}: {phase} regressed {base:.3f}s -> {seconds:.3f}s")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.update_baselines:
+        for result in results:
+            baselines[result["scene"]] = {phase: round(seconds, 4) for phase, seconds in result["phases"].items()}
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"\nBaselines saved to {args.baselines}")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    sys.exit(main(argv))
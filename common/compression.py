@@ -0,0 +1,155 @@
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.static_assets import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # без brotli ответы сжимаются только gzip
+    brotli = None
+
+# Уже сжатые форматы - повторное сжатие только тратит CPU
+SKIP_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/pdf",
+    "application/octet-stream",
+    "application/vnd.openxmlformats",
+    "text/event-stream",
+)
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        # wbits=31 - формат gzip (заголовок и контрольная сумма)
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware сжатия ответов (brotli, если поддерживается клиентом, иначе gzip).
+    Тело сжимается потоково, по мере отправки частей ответа, без сборки всего ответа в памяти.
+    Не сжимаются: ответы меньше minimum_size, уже сжатые ответы (есть Content-Encoding)
+    и уже сжатые форматы (картинки, архивы и т.п.).
+
+    Vary: Accept-Encoding ставится всем ответам сжимаемых типов, даже несжатым (маленький
+    ответ, клиент без gzip): тот же URL позже может уйти сжатым, и общий кэш не должен
+    отдавать один вариант вместо другого.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            encoding = None  # Не сжимаем, но Vary все равно ставим
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str | None, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Message | None = None
+        self.stream = None
+        self.passthrough = False
+
+    @staticmethod
+    def _compressible(headers: Headers) -> bool:
+        """Тип, который сжимается (если ответ достаточно большой и клиент это поддерживает)"""
+        if "content-encoding" in headers:
+            return False
+        return not headers.get("content-type", "").lower().startswith(SKIP_CONTENT_TYPES)
+
+    def _should_compress(self, headers: Headers, body: bytes, more_body: bool) -> bool:
+        if self.encoding is None or self.start_message["status"] in (204, 304):
+            return False
+        if more_body:
+            # Потоковый ответ: ориентируемся на Content-Length, если он известен
+            content_length = headers.get("content-length")
+            return content_length is None or int(content_length) >= self.middleware.minimum_size
+        return len(body) >= self.middleware.minimum_size
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Заголовки отправим вместе с первой частью тела, когда станет ясно, сжимаем ли ответ
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            compressible = self._compressible(headers)
+            if compressible and "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if not compressible or not self._should_compress(headers, body, more_body):
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            if self.encoding == "br":
+                self.stream = _BrotliStream(self.middleware.brotli_quality)
+            else:
+                self.stream = _GzipStream(self.middleware.gzip_level)
+            headers["Content-Encoding"] = self.encoding
+            if "content-length" in headers:
+                del headers["content-length"]
+            # Сильный ETag описывает несжатое тело - для сжатого он становится слабым
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            await self._send(self.start_message)
+
+        data = self.stream.compress(body)
+        if not more_body:
+            data += self.stream.finish()
+        if data or not more_body:
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
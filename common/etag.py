@@ -0,0 +1,39 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+# Страницы персональные (в них имя и роль пользователя), поэтому кэшировать их
+# может только браузер, и каждый раз он должен перепроверять ETag
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_weak_etag(*parts: Any) -> str:
+    """Слабый ETag из частей, от которых зависит содержимое страницы"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Проверяет заголовок If-None-Match. Сравнение слабое (RFC 9110):
+    префикс W/ не учитывается, поддерживаются списки и "*".
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Ответ 304 без тела"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
@@ -0,0 +1,225 @@
+"""
+Структурированное логирование (JSON, одна запись - одна строка) без записи в поток
+вывода на пути запроса.
+
+Обработчик корневого логгера только кладет запись в очередь (QueueHandler), а
+форматирует и пишет ее отдельный поток (QueueListener). К каждой записи добавляются:
+- request_id - идентификатор запроса из заголовка X-Request-ID или новый; его ставит
+  CorrelationIdMiddleware и возвращает в ответе, фоновые задачи запроса его наследуют;
+- поля log_context(...) - например, check_id проверки;
+- поля из extra={...} самого вызова логгера.
+
+Строковые поля длиннее LOG_MAX_FIELD_CHARS (вывод Docker, лог Blender) обрезаются:
+остаются начало и конец, где обычно видна ошибка. Построчный отладочный вывод
+контейнера идет через sampled_logger - DEBUG записи проходят с вероятностью
+LOG_DEBUG_SAMPLE_RATE.
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json или text (читаемый вывод для разработки)
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "4000"))
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Чужой идентификатор принимаем, только если он не сломает строку лога
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_context_var: ContextVar[dict] = ContextVar("log_context", default={})
+
+# Атрибуты, которые есть у любой LogRecord: все остальное пришло из extra
+_RECORD_ATTRS = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime", "request_id", "context"}
+
+_listener: Optional[QueueListener] = None
+
+
+@contextmanager
+def log_context(**fields):
+    """Добавляет поля ко всем записям внутри блока (в том числе из вложенных задач)"""
+    token = _context_var.set({**_context_var.get(), **fields})
+    try:
+        yield
+    finally:
+        _context_var.reset(token)
+
+
+def cap(text: str, limit: int = LOG_MAX_FIELD_CHARS) -> str:
+    """Обрезает длинную строку, оставляя начало и конец"""
+    if len(text) <= limit:
+        return text
+    half = limit // 2
+    return f"{text[:half]}\n...[{len(text) - 2 * half} chars omitted]...\n{text[-half:]}"
+
+
+def record_fields(record: logging.LogRecord) -> dict:
+    """Поля записи: request_id, log_context и extra (строки обрезаны)"""
+    fields = {}
+    if getattr(record, "request_id", None):
+        fields["request_id"] = record.request_id
+    fields.update(getattr(record, "context", None) or {})
+    for key, value in record.__dict__.items():
+        if key not in _RECORD_ATTRS:
+            fields[key] = value
+    return {key: cap(value) if isinstance(value, str) else value for key, value in fields.items()}
+
+
+class ContextFilter(logging.Filter):
+    """Переносит request_id и log_context в запись. Работает в потоке, который пишет в лог"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.context = _context_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает DEBUG записи с вероятностью rate, остальные уровни - всегда"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if random.random() >= self.rate:
+            return False
+        record.sample_rate = self.rate
+        return True
+
+
+def sampled_logger(name: str, rate: float = LOG_DEBUG_SAMPLE_RATE) -> logging.Logger:
+    """Логгер для шумного отладочного потока: фильтр на логгере отбрасывает запись до очереди"""
+    logger = logging.getLogger(name)
+    if not any(isinstance(f, SamplingFilter) for f in logger.filters):
+        logger.addFilter(SamplingFilter(rate))
+    return logger
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": cap(record.getMessage()),
+        }
+        entry.update(record_fields(record))
+        if record.exc_info:
+            entry["exc"] = cap(self.formatException(record.exc_info))
+        return orjson.dumps(entry, default=str).decode()
+
+
+class TextFormatter(logging.Formatter):
+    """Прежний формат строк лога, поля - в конце строки"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = cap(record.getMessage())
+        record.asctime = self.formatTime(record)
+        text = self.formatMessage(record)
+        fields = record_fields(record)
+        if fields:
+            text += " | " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            text += "\n" + cap(self.formatException(record.exc_info))
+        return text
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # В вызывающем потоке только подставляем аргументы в сообщение: объекты из args
+        # могут измениться, пока запись ждет в очереди. JSON и traceback - в потоке QueueListener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging():
+    """
+    Направляет корневой логгер (и логи uvicorn) через очередь в поток записи.
+    Повторный вызов ничего не делает.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+    # uvicorn пишет access и error логи своими обработчиками напрямую в поток
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Дописывает записи из очереди и останавливает поток записи"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class CorrelationIdMiddleware:
+    """
+    ASGI middleware: идентификатор запроса для всех записей лога, сделанных при его обработке.
+    Берется из заголовка X-Request-ID (например, от nginx) или создается, и возвращается в ответе.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex[:16]
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode())]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,330 @@
+"""
+Метрики в формате Prometheus (/metrics).
+
+Реестр без блокировок: у каждого потока свой набор значений (шард), который меняет
+только этот поток, поэтому inc/observe не берут lock ни в event loop, ни в потоках
+run_in_executor. При сборе шарды суммируются.
+
+Несколько воркеров uvicorn: каждый процесс периодически сбрасывает снимок своих
+метрик в METRICS_DIR/metrics_<pid>.json, а /metrics в любом воркере складывает
+свой живой снимок со снимками остальных. Счетчики и гистограммы завершившихся
+процессов учитываются, пока их файл не удалит очистка (services/retention.py),
+gauge - только у живых процессов.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+METRICS_DIR = Path(os.getenv("METRICS_DIR", "uploads/metrics"))
+
+logger = logging.getLogger(__name__)
+
+# Границы по умолчанию - секунды, от быстрых запросов до проверки в Blender
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+SIZE_BUCKETS = tuple(float(1024 * 4 ** i) for i in range(10))  # 1 КБ ... 256 МБ
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, "_Metric"] = {}
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._collectors: list[tuple[str, Callable[[], Iterable[tuple[tuple, float]]]]] = []
+
+    def shard(self) -> dict:
+        """Значения текущего потока: {(имя, значения меток): число или [корзины..., сумма]}"""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            self._shards.append(values)  # list.append атомарен
+            return values
+
+    def add_collector(self, name: str, collect: Callable[[], Iterable[tuple[tuple, float]]]):
+        """Значения, которые считаются при сборе (например, счетчики TTLCache)"""
+        self._collectors.append((name, collect))
+
+    def snapshot(self) -> dict:
+        """Сумма шардов всех потоков: {имя: {значения меток: значение}}"""
+        merged: dict[str, dict] = {name: {} for name in self.metrics}
+        for values in list(self._shards):
+            for (name, labels), value in _items(values):
+                _merge_value(merged[name], labels, value)
+        for name, collect in self._collectors:
+            for labels, value in collect():
+                _merge_value(merged[name], tuple(labels), value)
+        return merged
+
+
+def _items(values: dict) -> list:
+    # Поток-владелец может добавить ключ во время копирования - тогда повторяем
+    while True:
+        try:
+            return list(values.items())
+        except RuntimeError:
+            continue
+
+
+def _merge_value(target: dict, labels: tuple, value):
+    current = target.get(labels)
+    if isinstance(value, list):
+        if current is None:
+            target[labels] = list(value)
+        else:
+            for i, item in enumerate(value):
+                current[i] += item
+    else:
+        target[labels] = (current or 0) + value
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        registry.metrics[name] = self
+
+    def _key(self, labels: dict) -> tuple:
+        return self.name, tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        shard = self.registry.shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Gauge хранится как сумма изменений (inc/dec), чтобы шарды потоков можно было складывать"""
+    type = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        shard = self.registry.shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        """Увеличивает значение на время блока (например, число выполняющихся проверок)"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS, registry: Registry = REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        shard = self.registry.shard()
+        key = self._key(labels)
+        # Корзины (без накопления, +Inf - последняя), затем сумма
+        counts = shard.get(key)
+        if counts is None:
+            counts = shard[key] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+
+#______________________________________________________________________________________________________________________
+# Снимки процессов (несколько воркеров)
+
+def _snapshot_path(pid: int) -> Path:
+    return METRICS_DIR / f"metrics_{pid}.json"
+
+
+def _encode(snapshot: dict) -> bytes:
+    return orjson.dumps({
+        "pid": os.getpid(),
+        "metrics": {name: [[list(labels), value] for labels, value in values.items()] for name, values in snapshot.items()},
+    })
+
+
+def write_snapshot(registry: Registry = REGISTRY):
+    """Атомарно записывает снимок метрик этого процесса"""
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    path = _snapshot_path(os.getpid())
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(_encode(registry.snapshot()))
+    os.replace(tmp_path, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect_all(registry: Registry = REGISTRY) -> dict:
+    """Живой снимок этого процесса + последние снимки остальных процессов"""
+    merged = registry.snapshot()
+    own_pid = os.getpid()
+    for path in METRICS_DIR.glob("metrics_*.json"):
+        try:
+            data = orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            continue  # Файл удалили или дописывают прямо сейчас
+        pid = data.get("pid")
+        if pid == own_pid:
+            continue
+        alive = _pid_alive(pid)
+        for name, samples in data.get("metrics", {}).items():
+            metric = registry.metrics.get(name)
+            if metric is None or (metric.type == "gauge" and not alive):
+                continue
+            for labels, value in samples:
+                _merge_value(merged[name], tuple(labels), value)
+    return merged
+
+
+async def run_snapshot_writer(interval: float, registry: Registry = REGISTRY):
+    """Фоновая задача воркера: периодически обновляет его снимок для остальных воркеров"""
+    while True:
+        try:
+            await asyncio.to_thread(write_snapshot, registry)
+        except Exception as e:
+            logger.warning("Could not write metrics snapshot: %s", e)
+        await asyncio.sleep(interval)
+
+
+#______________________________________________________________________________________________________________________
+# Текстовый формат Prometheus
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels_text(names: tuple, values: tuple, extra: Optional[tuple] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render(snapshot: dict, registry: Registry = REGISTRY) -> str:
+    lines = []
+    for name, metric in registry.metrics.items():
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.type}")
+        for labels, value in sorted(snapshot.get(name, {}).items()):
+            if metric.type != "histogram":
+                lines.append(f"{name}{_labels_text(metric.labelnames, labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + (float("inf"),), value[:-1]):
+                cumulative += count
+                le = _labels_text(metric.labelnames, labels, ("le", _number(bound)))
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            lines.append(f"{name}_sum{_labels_text(metric.labelnames, labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels_text(metric.labelnames, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+#______________________________________________________________________________________________________________________
+# Метрики приложения
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Время обработки HTTP запроса", ("method", "route", "status"),
+)
+db_queries = Counter("db_queries_total", "Количество SQL запросов", ("operation",))
+db_query_duration = Histogram(
+    "db_query_duration_seconds", "Время выполнения SQL запроса", ("operation",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+check_queue_depth = Gauge("check_queue_depth", "Проверки, ожидающие свободного слота")
+checks_running = Gauge("checks_running", "Проверки, выполняющиеся сейчас")
+check_runs = Counter("check_runs_total", "Запуски проверки в Docker по результату", ("outcome",))
+container_start_duration = Histogram(
+    "check_container_start_seconds", "От docker run до начала работы скрипта проверки в Blender",
+)
+blender_run_duration = Histogram(
+    "check_blender_run_seconds", "От начала работы скрипта проверки до завершения контейнера",
+)
+check_result_size = Histogram("check_result_bytes", "Размер файла результатов проверки", buckets=SIZE_BUCKETS)
+cache_requests = Counter("cache_requests_total", "Обращения к кэшам по результату (hit/miss)", ("cache", "result"))
+
+
+def register_ttl_cache(name: str, cache, registry: Registry = REGISTRY):
+    """Попадания и промахи TTLCache (common/cache.py) в cache_requests_total"""
+    registry.add_collector(
+        cache_requests.name,
+        lambda: [((name, "hit"), cache.hits), ((name, "miss"), cache.misses)],
+    )
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: время обработки запроса по маршруту (шаблон пути, а не сам путь -
+    /works/{work_id}, а не /works/15). Запросы без маршрута (404) идут одной строкой.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Маршрут записывается роутером в тот же scope; для смонтированных приложений (/static) - root_path
+            route = getattr(scope.get("route"), "path", None) or scope.get("root_path") or "<unmatched>"
+            http_request_duration.observe(
+                time.perf_counter() - started, method=scope["method"], route=route, status=status_code,
+            )
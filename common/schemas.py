@@ -1,7 +1,11 @@
 import io
+import os
+import warnings
+from datetime import datetime
+from typing import Any, Optional
 from fastapi import UploadFile
 from PIL import Image
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 from docx import Document
 from docx.shared import Inches
 
@@ -16,22 +20,182 @@ class UserRegister(BaseModel):
             raise ValueError("Пароль должен быть не менее 8 символов")
         return value
 
-async def is_valid_image(file: UploadFile) -> bool:
+#######################################################################################################################
+# Модели ответов JSON API (/api/v1)
+
+class InspectorOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    login: str
+    full_name: Optional[str] = None
+
+
+class WorkOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    work_link: Optional[str] = None
+    booklet: Optional[str] = None
+    corrections: Optional[str] = None
+    assigned_to: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    # Проверяющий берется из уже загруженной связи Work.inspector_user
+    inspector: Optional[InspectorOut] = Field(None, validation_alias="inspector_user")
+
+
+class WorksPage(BaseModel):
+    items: list[WorkOut]
+    page: int
+    pages: int
+    total: int
+    waiting: int
+    in_progress: int
+
+
+class EmployeeOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    login: str
+    full_name: Optional[str] = None
+    position: str
+    created_at: Optional[datetime] = None
+    completed_works_count: int = 0
+    inspected_works_count: int = 0
+    current_project_title: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row) -> "EmployeeOut":
+        """Из строки справочника сотрудников (User + агрегаты)"""
+        employee = cls.model_validate(row.User)
+        employee.completed_works_count = row.completed_works_count
+        employee.inspected_works_count = row.inspected_works_count
+        employee.current_project_title = row.current_project_title
+        return employee
+
+
+class EmployeesPage(BaseModel):
+    items: list[EmployeeOut]
+    page: int
+    pages: int
+    total: int
+
+
+class CheckResultOut(BaseModel):
+    id: str
+    results: dict[str, Any]
+
+
+class UploadInit(BaseModel):
+    """Начало загрузки архива частями"""
+    filename: str
+    size: int
+    sha256: Optional[str] = Field(None, pattern=r"^[0-9a-fA-F]{64}$")  # Хэш всего архива, проверяется при завершении
+
+
+class UploadStatusOut(BaseModel):
+    upload_id: str
+    filename: str
+    size: int
+    offset: int  # Сколько байт принято - следующая часть начинается отсюда
+    chunk_size: int
+
+
+class UploadFinalizeOut(BaseModel):
+    check_id: str
+    status_url: str  # /api/v1/checks/{check_id}: 202 - проверка идет, 200 - результаты, 410 - проверка потеряна
+    results_url: str
+
+# Проверка загружаемых картинок: формат определяется по сигнатуре, размеры - по заголовку.
+# Файл целиком не читается и не декодируется
+IMAGE_SIGNATURES = {
+    b"\x89PNG\r\n\x1a\n": "PNG",
+    b"\xff\xd8\xff": "JPEG",
+    b"BM": "BMP",
+}
+IMAGE_HEADER_BYTES = int(os.getenv("IMAGE_HEADER_BYTES", str(256 * 1024)))  # У JPEG размеры могут идти после EXIF (до 64 КБ)
+MAX_IMAGE_PIXELS = int(os.getenv("MAX_IMAGE_PIXELS", str(50_000_000)))  # ~ 8K x 6K
+
+
+class ImageHeader(BaseModel):
+    format: str
+    width: int
+    height: int
+    mode: str
+
+
+def sniff_image_format(prefix: bytes) -> Optional[str]:
+    """Формат картинки по магическим байтам"""
+    if prefix[:4] == b"RIFF" and prefix[8:12] == b"WEBP":
+        return "WEBP"
+    for signature, image_format in IMAGE_SIGNATURES.items():
+        if prefix.startswith(signature):
+            return image_format
+    return None
+
+
+async def read_image_header(file: UploadFile, max_bytes: int = IMAGE_HEADER_BYTES) -> Optional[ImageHeader]:
+    """
+    Читает только начало файла и разбирает заголовок картинки (формат, размеры, режим).
+    После чтения поток возвращается в начало, чтобы файл можно было сохранить.
+    """
+    try:
+        prefix = await file.read(max_bytes)
+    finally:
+        await file.seek(0)
+
+    image_format = sniff_image_format(prefix)
+    if image_format is None:
+        return None
     try:
-        image = Image.open(io.BytesIO(await file.read()))
-        image.verify()  # Проверяем, что файл является изображением
-        return True
-    except Exception:
-        return False
+        with warnings.catch_warnings():
+            # Лимит пикселей проверяем сами, предупреждение PIL о "бомбе" не нужно
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            # Image.open ленивый: пиксели не декодируются, читается только заголовок
+            with Image.open(io.BytesIO(prefix), formats=[image_format]) as image:
+                return ImageHeader(format=image_format, width=image.width, height=image.height, mode=image.mode)
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        return None
+
+
+async def is_valid_image(file: UploadFile, max_pixels: int = MAX_IMAGE_PIXELS) -> bool:
+    """Файл - картинка допустимого формата, и число пикселей не превышает max_pixels"""
+    header = await read_image_header(file)
+    return header is not None and 0 < header.width * header.height <= max_pixels
     
-async def create_docx_with_screenshots_and_comments(screenshots, comments, output_path):
+# Ширина скриншота в отчете и плотность, под которую он уменьшается перед вставкой
+REPORT_IMAGE_WIDTH_INCHES = 2.0
+REPORT_IMAGE_DPI = int(os.getenv("REPORT_IMAGE_DPI", "150"))
+
+
+def _downscaled_picture(screenshot_path, width_px: int) -> io.BytesIO:
+    """Копия скриншота шириной width_px (JPEG в памяти) для вставки в DOCX"""
+    with Image.open(screenshot_path) as image:
+        image.draft("RGB", (width_px, width_px * 4))
+        if image.width > width_px:
+            image = image.resize((width_px, max(1, round(image.height * width_px / image.width))), Image.LANCZOS)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=85, optimize=True)
+    buffer.seek(0)
+    return buffer
+
+
+def create_docx_with_screenshots_and_comments(screenshots, comments, output_path):
     """
     Создает DOCX-файл, содержащий скриншоты и комментарии в таблице.
+    Функция синхронная и тяжелая - вызывать в пуле процессов (services/review_report.py).
 
     :param screenshots: Список путей к файлам скриншотов.
     :param comments: Список комментариев (по одному для каждого скриншота).
     :param output_path: Путь для сохранения DOCX-файла.
     """
+    # Скриншот в отчете всего 2 дюйма шириной - полное разрешение только раздувает файл
+    width_px = int(REPORT_IMAGE_WIDTH_INCHES * REPORT_IMAGE_DPI)
+
     # Создаем новый документ
     doc = Document()
 
@@ -53,9 +217,9 @@ async def create_docx_with_screenshots_and_comments(screenshots, comments, outpu
         # Добавляем скриншот в первую ячейку
         paragraph = row_cells[0].paragraphs[0]
         run = paragraph.add_run()
-        run.add_picture(screenshot_path, width=Inches(2.0))  # Ширина скриншота 2 дюйма
+        run.add_picture(_downscaled_picture(screenshot_path, width_px), width=Inches(REPORT_IMAGE_WIDTH_INCHES))
         # Добавляем комментарий во вторую ячейку
-        row_cells[1].text = comment
+        row_cells[1].text = comment or ''
 
     # Сохраняем документ
-    doc.save(output_path)
\ No newline at end of file
+    doc.save(output_path)
@@ -0,0 +1,52 @@
+import time
+import threading
+from typing import Hashable
+
+
+class AttemptThrottle:
+    """
+    Ограничение количества попыток в фиксированном окне времени.
+    Ключом может быть IP-адрес, логин и т.п.
+    """
+
+    def __init__(self, max_attempts: int, window: float, maxsize: int = 10000):
+        self.max_attempts = max_attempts
+        self.window = window
+        self.maxsize = maxsize
+        self._attempts: dict[Hashable, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: Hashable) -> bool:
+        """
+        Регистрирует попытку. Возвращает False, если лимит для ключа в текущем окне исчерпан.
+        """
+        now = time.monotonic()
+        with self._lock:
+            window_start, count = self._attempts.get(key, (now, 0))
+            if now - window_start >= self.window:
+                window_start, count = now, 0
+            if count >= self.max_attempts:
+                return False
+            self._attempts[key] = (window_start, count + 1)
+            if len(self._attempts) > self.maxsize:
+                self._prune(now)
+            return True
+
+    def retry_after(self, key: Hashable) -> int:
+        """Через сколько секунд для ключа откроется новое окно"""
+        with self._lock:
+            window_start, _ = self._attempts.get(key, (0.0, 0))
+        return max(int(self.window - (time.monotonic() - window_start)) + 1, 0)
+
+    def reset(self, key: Hashable):
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def _prune(self, now: float):
+        # Удаляем истекшие окна, чтобы словарь не рос бесконечно
+        expired = [key for key, (start, _) in self._attempts.items() if now - start >= self.window]
+        for key in expired:
+            del self._attempts[key]
+        # Если все окна живые - вытесняем самые старые записи
+        while len(self._attempts) > self.maxsize:
+            del self._attempts[next(iter(self._attempts))]
@@ -1,25 +1,79 @@
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from database.models import User
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from common.schemas import UserRegister
+from common.cache import TTLCache
 from database.orm_query import orm_add_user
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Отдельный ограниченный пул потоков для bcrypt, чтобы хеширование не блокировало event loop
+# и пачка логинов не занимала общий executor
+password_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+    thread_name_prefix="password-hash",
+)
+
+# Кэш снимков пользователей по логину для get_current_user
+user_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "60")),
+)
 #######################################################################################################################
 async def get_user_by_login(session: AsyncSession, login: str):
     result = await session.execute(select(User).where(User.login == login))
     return result.scalar()
 
+#######################################################################################################################
+async def get_cached_user_by_login(session: AsyncSession, login: str):
+    """
+    То же, что get_user_by_login, но через кэш. Возвращает отсоединенную от сессии
+    копию пользователя (только колонки, без связей), чтобы запросы не делили один объект.
+    """
+    snapshot = user_cache.get(login)
+    if snapshot is None:
+        user = await get_user_by_login(session, login)
+        if user is None:
+            return None
+        snapshot = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        user_cache.set(login, snapshot)
+    return User(**snapshot)
+
+def invalidate_cached_user(login: str):
+    """
+    Сбрасывает кэшированный снимок пользователя после его изменения.
+    Кэш у каждого воркера свой: остальные воркеры видят старые данные до USER_CACHE_TTL
+    """
+    user_cache.invalidate(login)
+
+#######################################################################################################################
+async def get_user_role(session: AsyncSession, login: str):
+    """Текущая роль пользователя прямо из БД, без кэша (None - пользователя нет)"""
+    result = await session.execute(select(User.position).where(User.login == login))
+    return result.scalar()
+
 #######################################################################################################################
 async def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+    if not hashed_password:
+        # Приглашенный пользователь, пароль еще не установлен
+        return False
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.verify, plain_password, hashed_password)
+
+#######################################################################################################################
+async def hash_password(plain_password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.hash, plain_password)
 
 #######################################################################################################################
 async def create_user(db: AsyncSession, user_data: UserRegister):
     try:
-        hashed_password = pwd_context.hash(user_data.password)
+        hashed_password = await hash_password(user_data.password)
         await orm_add_user(db, user_data.login, hashed_password)
         return
     except ValueError as e:
@@ -38,5 +92,6 @@ async def update_user_position(session: AsyncSession, user_id: int, new_position
     if user:
         user.position = new_position
         await session.commit()
+        invalidate_cached_user(user.login)
         return user
     return None
\ No newline at end of file
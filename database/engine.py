@@ -1,9 +1,48 @@
+import logging
+import os
+import time
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from database.models import Base
+from common.metrics import db_queries, db_query_duration
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///checking_works.db")
+DATABASE_ECHO = os.getenv("DATABASE_ECHO", "1") == "1"  # Вывод всех SQL запросов в лог
 
-engine = create_async_engine("sqlite+aiosqlite:///checking_works.db", echo=True)
+# Не echo=True: с ним SQLAlchemy пишет в stdout своим обработчиком, а так запросы идут
+# через общие обработчики логов (очередь и поток записи, common/log.py)
+if DATABASE_ECHO:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+engine = create_async_engine(DATABASE_URL)
 session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
 
+# Метрики SQL запросов (/metrics): количество и время по типу запроса
+DB_METRIC_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started_at"] = time.perf_counter()
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info.pop("query_started_at", time.perf_counter())
+    operation = statement.lstrip()[:6].upper()
+    if operation not in DB_METRIC_OPERATIONS:
+        operation = "OTHER"
+    db_queries.inc(operation=operation)
+    db_query_duration.observe(elapsed, operation=operation)
+
+# lower() и LIKE в SQLite не меняют регистр не-ASCII символов, поэтому поиск по кириллице
+# идет через функцию casefold на Python (str.casefold)
+def _casefold(value):
+    return value.casefold() if isinstance(value, str) else value
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    if engine.dialect.name == "sqlite":
+        dbapi_connection.create_function("casefold", 1, _casefold, deterministic=True)
+
 async def get_session():
     async with session_maker() as session:
         yield session
@@ -81,6 +81,29 @@ class CompletedWorks(Base):
     work: Mapped["Work"] = relationship("Work", back_populates="completed_by_users")
 
 
+class ReviewScreenshot(Base):
+    """Скриншот с комментарием проверяющего к работе"""
+    __tablename__ = "review_screenshots"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    work_id: Mapped[int] = mapped_column(ForeignKey("works.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))  # Проверяющий, загрузивший скриншот
+    position: Mapped[int] = mapped_column(Integer)  # Порядковый номер скриншота в загрузке
+    comment: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    original_path: Mapped[str] = mapped_column(String(255))
+    thumb_path: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # Миниатюра WebP (появляется после обработки)
+    web_path: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)  # Уменьшенная WebP-версия для просмотра
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class TableVersion(Base):
+    """Счетчик изменений таблицы. Увеличивается в той же транзакции, что и изменение данных"""
+    __tablename__ = "table_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)  # Имя таблицы
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+
 # Таблица для связи пользователей и завершенных проектов
 user_completed_projects = Table(
     "user_completed_projects",
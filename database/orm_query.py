@@ -1,11 +1,20 @@
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, insert
 import sqlalchemy
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, aliased
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from database.models import *
 
+# Предел числа параметров в одном запросе для SQLite до 3.32 (SQLITE_MAX_VARIABLE_NUMBER = 999;
+# с 3.32 - 32766). Многострочный INSERT передает по параметру на каждый столбец каждой строки
+SQLITE_MAX_VARIABLES = 999
+
+def bulk_insert_chunk(model) -> int:
+    """Строк в одном многострочном INSERT: столбцов таблицы * строк не больше SQLITE_MAX_VARIABLES"""
+    return max(SQLITE_MAX_VARIABLES // len(model.__table__.columns), 1)
+
 #______________________________________________________________________________________________________________________
 async def orm_add_user(session: AsyncSession, login: str, password: str):
     user = User(login=login, password=password)
@@ -71,11 +80,63 @@ async def orm_get_user_completed_projects(session: AsyncSession, user_id: int):
 #######################################################################################################################
 async def orm_get_works(
         session: AsyncSession,
+        assigned_to: bool | None = None,
+        limit: int | None = None,
+        offset: int = 0,
 ):
-    query = select(Work).order_by(Work.created_at.desc())
+    """
+    Получает работы (новые первыми) вместе с проверяющим.
+    assigned_to - фильтр по статусу: True - в работе, False - ожидают проверки.
+    """
+    query = (
+        select(Work)
+        .options(selectinload(Work.inspector_user))
+        .order_by(Work.created_at.desc(), Work.id.desc())
+    )
+    if assigned_to is True:
+        query = query.where(Work.assigned_to.is_(True))
+    elif assigned_to is False:
+        query = query.where(Work.assigned_to.is_not(True))
+    if limit is not None:
+        query = query.limit(limit).offset(offset)
     result = await session.execute(query)
     return result.scalars().all()
 
+#______________________________________________________________________________________________________________________
+async def orm_get_works_status_counts(session: AsyncSession):
+    """
+    Возвращает (ожидают проверки, в работе) одним запросом.
+    """
+    query = select(
+        func.count(Work.id).filter(Work.assigned_to.is_not(True)),
+        func.count(Work.id).filter(Work.assigned_to.is_(True)),
+    )
+    result = await session.execute(query)
+    waiting, in_progress = result.one()
+    return waiting, in_progress
+
+#______________________________________________________________________________________________________________________
+async def orm_bump_table_version(session: AsyncSession, name: str):
+    """
+    Увеличивает счетчик изменений таблицы. Вызывается до commit в той же транзакции,
+    что и само изменение, поэтому версия меняется атомарно с данными.
+    """
+    query = (
+        sqlite_insert(TableVersion)
+        .values(name=name, version=1)
+        .on_conflict_do_update(
+            index_elements=[TableVersion.name],
+            set_={"version": TableVersion.version + 1}
+        )
+    )
+    await session.execute(query)
+
+#______________________________________________________________________________________________________________________
+async def orm_get_table_version(session: AsyncSession, name: str) -> int:
+    query = select(TableVersion.version).where(TableVersion.name == name)
+    result = await session.execute(query)
+    return result.scalar() or 0
+
 #______________________________________________________________________________________________________________________
 async def orm_get_works_count(session: AsyncSession):
     query = select(func.count(Work.id))
@@ -89,26 +150,56 @@ async def orm_add_work(
     work_link: str,
     booklet: str,
 ):
-    query = select(Work).where(Work.title == title)
-    result = await session.execute(query)
-    if result.first() is None:
-        session.add(
-            Work(
-                title=title,
-                work_link=work_link,
-                booklet=booklet
+    await orm_add_works_bulk(
+        session,
+        [{"title": title, "work_link": work_link, "booklet": booklet}]
+    )
+
+#______________________________________________________________________________________________________________________
+async def orm_add_works_bulk(session: AsyncSession, works: list[dict]):
+    """
+    Добавляет пачку работ в одной транзакции через INSERT ... ON CONFLICT(title) DO NOTHING.
+    Повторы внутри пачки и уже существующие названия не вставляются.
+
+    Возвращает множество названий, которые были созданы.
+    """
+    # Первое вхождение названия внутри пачки побеждает
+    unique_works = {}
+    for work in works:
+        unique_works.setdefault(work["title"], work)
+    unique_works = list(unique_works.values())
+    created = set()
+    try:
+        chunk_size = bulk_insert_chunk(Work)
+        for start in range(0, len(unique_works), chunk_size):
+            chunk = unique_works[start:start + chunk_size]
+            query = (
+                sqlite_insert(Work)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[Work.title])
+                .returning(Work.title)
             )
-        )
-    await session.commit()
+            result = await session.execute(query)
+            created.update(result.scalars().all())
+        if created:
+            await orm_bump_table_version(session, "works")
+        await session.commit()
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
+    return created
 #______________________________________________________________________________________________________________________
 async def orm_delete_work(session: AsyncSession, work_id: str):
     query = delete(Work).where(Work.id == work_id)
     await session.execute(query)
+    await orm_bump_table_version(session, "works")
     await session.commit()
 
 #______________________________________________________________________________________________________________________
-async def orm_get_work(session: AsyncSession, work_id: int):
+async def orm_get_work(session: AsyncSession, work_id: int, with_inspector: bool = False):
     query = select(Work).where(Work.id == work_id)
+    if with_inspector:
+        query = query.options(selectinload(Work.inspector_user))
     result = await session.execute(query)
     return result.scalar()
 
@@ -120,6 +211,7 @@ async def orm_add_inspector(session: AsyncSession, work_id: int, inspector_id: i
         .values(inspector=inspector_id)
     )
     await session.execute(query)
+    await orm_bump_table_version(session, "works")
     await session.commit()
 
 #______________________________________________________________________________________________________________________
@@ -134,6 +226,7 @@ async def orm_assigned_to(session: AsyncSession, work_id: int, assigned_to: bool
         .values(assigned_to=assigned_to)
     )
     await session.execute(query)
+    await orm_bump_table_version(session, "works")
     await session.commit()
 
 #______________________________________________________________________________________________________________________
@@ -192,4 +285,138 @@ async def orm_get_user_completed_works(session: AsyncSession, user_id: int):
         return result.scalars().all()
     except SQLAlchemyError as e:
         raise ValueError(f"Ошибка при получении завершенных работ: {str(e)}")
-    
\ No newline at end of file
+    
+
+#######################################################################################################################
+EMPLOYEES_PER_PAGE = 50
+
+def _employees_directory_query():
+    """
+    Строит запрос справочника сотрудников: пользователь, количество завершенных работ,
+    количество проверяемых работ и название текущего проекта — одним SELECT.
+    """
+    completed_sq = (
+        select(CompletedWorks.user_id, func.count(CompletedWorks.id).label("completed_count"))
+        .group_by(CompletedWorks.user_id)
+        .subquery()
+    )
+    inspected_sq = (
+        select(Work.inspector.label("user_id"), func.count(Work.id).label("inspected_count"))
+        .where(Work.inspector.is_not(None))
+        .group_by(Work.inspector)
+        .subquery()
+    )
+    current_project = aliased(Work)
+
+    return (
+        select(
+            User,
+            func.coalesce(completed_sq.c.completed_count, 0).label("completed_works_count"),
+            func.coalesce(inspected_sq.c.inspected_count, 0).label("inspected_works_count"),
+            current_project.title.label("current_project_title"),
+        )
+        .outerjoin(completed_sq, completed_sq.c.user_id == User.id)
+        .outerjoin(inspected_sq, inspected_sq.c.user_id == User.id)
+        .outerjoin(current_project, current_project.id == User.current_project_id)
+    )
+
+#______________________________________________________________________________________________________________________
+async def orm_get_employees_directory(
+    session: AsyncSession,
+    search: str | None = None,
+    page: int = 1,
+    per_page: int = EMPLOYEES_PER_PAGE,
+):
+    """
+    Получает страницу справочника сотрудников со статистикой.
+    Поиск по логину или ФИО. Общее количество найденных строк считается
+    оконной функцией в том же запросе.
+
+    Возвращает (список строк, общее количество).
+    """
+    query = _employees_directory_query().add_columns(func.count().over().label("total"))
+    if search:
+        # Без учета регистра и для кириллицы (функция casefold - database/engine.py);
+        # % и _ в строке поиска экранируются и ищутся как обычные символы
+        needle = search.casefold()
+        query = query.where(
+            func.casefold(User.login).contains(needle, autoescape=True)
+            | func.casefold(User.full_name).contains(needle, autoescape=True)
+        )
+    query = query.order_by(User.id).limit(per_page).offset((max(page, 1) - 1) * per_page)
+
+    try:
+        result = await session.execute(query)
+        rows = result.all()
+    except SQLAlchemyError as e:
+        raise ValueError(f"Ошибка при получении списка сотрудников: {str(e)}")
+
+    total = rows[0].total if rows else 0
+    return rows, total
+
+#______________________________________________________________________________________________________________________
+async def orm_get_employee_stats(session: AsyncSession, user_id: int):
+    """
+    Получает сотрудника со статистикой (та же выборка, что и в справочнике).
+    """
+    query = _employees_directory_query().where(User.id == user_id)
+    result = await session.execute(query)
+    return result.first()
+
+#______________________________________________________________________________________________________________________
+async def orm_add_review_screenshots(session: AsyncSession, screenshots: list[dict]):
+    """
+    Добавляет скриншоты проверки одной пачкой (одна транзакция, INSERT по bulk_insert_chunk строк).
+
+    Возвращает список пар (id, original_path) в порядке вставки.
+    """
+    created = []
+    try:
+        chunk_size = bulk_insert_chunk(ReviewScreenshot)
+        for start in range(0, len(screenshots), chunk_size):
+            chunk = screenshots[start:start + chunk_size]
+            query = (
+                insert(ReviewScreenshot)
+                .values(chunk)
+                .returning(ReviewScreenshot.id, ReviewScreenshot.original_path)
+            )
+            result = await session.execute(query)
+            created.extend(tuple(row) for row in result.all())
+        if created:
+            await orm_bump_table_version(session, "review_screenshots")
+        await session.commit()
+    except SQLAlchemyError:
+        await session.rollback()
+        raise
+    return created
+
+#______________________________________________________________________________________________________________________
+async def orm_set_screenshot_variants(session: AsyncSession, variants: list[dict]):
+    """
+    Записывает пути миниатюр и WebP-версий.
+    variants - список словарей {"id": ..., "thumb_path": ..., "web_path": ...}
+    """
+    if not variants:
+        return
+    await session.execute(update(ReviewScreenshot), variants)
+    await orm_bump_table_version(session, "review_screenshots")
+    await session.commit()
+
+#______________________________________________________________________________________________________________________
+async def orm_get_review_screenshots(session: AsyncSession, work_id: int):
+    query = (
+        select(ReviewScreenshot)
+        .where(ReviewScreenshot.work_id == work_id)
+        .order_by(ReviewScreenshot.created_at, ReviewScreenshot.position)
+    )
+    result = await session.execute(query)
+    return result.scalars().all()
+
+#______________________________________________________________________________________________________________________
+async def orm_get_review_screenshot(session: AsyncSession, work_id: int, screenshot_id: int):
+    query = select(ReviewScreenshot).where(
+        ReviewScreenshot.id == screenshot_id,
+        ReviewScreenshot.work_id == work_id,
+    )
+    result = await session.execute(query)
+    return result.scalar()
@@ -3,9 +3,7 @@ import asyncio
 import subprocess
 import os
 import json
-import tempfile
 import io
-import tempfile
 import uvicorn
 import shutil
 import json
@@ -13,6 +11,7 @@ import time
 import logging
 import asyncio
 import aiofiles
+import orjson
 import uuid
 import aiosmtplib
 import datetime as dt
@@ -20,12 +19,11 @@ from datetime import timedelta
 import traceback
 
 from pydantic import BaseModel
-from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from contextlib import asynccontextmanager
 from typing import Annotated, List, Optional
-from fastapi import FastAPI, File, Request, Form, Depends, HTTPException, UploadFile, status, Query
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi import FastAPI, File, Request, Form, Depends, HTTPException, UploadFile, status, Query, BackgroundTasks
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, ORJSONResponse, FileResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
@@ -33,25 +31,59 @@ from authx.exceptions import MissingTokenError, JWTDecodeError
 from urllib.parse import quote, unquote
 from fastapi.security import APIKeyHeader
 from starlette.middleware.sessions import SessionMiddleware
-from sqlalchemy import select, func
+from sqlalchemy import select
 from email_validator import validate_email, EmailNotValidError
 from email.message import EmailMessage
 
-from auth import get_db, security, get_current_user, require_role
-from crud import create_user, verify_password, get_all_users, get_user_by_id, update_user_position, get_user_by_login, pwd_context
+from auth import get_db, security, get_current_user, get_token_claims, require_role, ROLE_LEVELS
+from crud import verify_password, hash_password, update_user_position, get_user_by_login, invalidate_cached_user, user_cache
 from templates import *
 from database.orm_query import *
 from database.engine import get_session, session_maker
 from database.engine import create_db_and_tables
-from common.schemas import UserRegister
+from common.schemas import UserRegister, WorkOut, WorksPage, EmployeeOut, EmployeesPage, CheckResultOut, UploadInit, UploadStatusOut, UploadFinalizeOut, is_valid_image
+from common.throttle import AttemptThrottle
+from common.cache import TTLCache
+from common.compression import CompressionMiddleware
+from common.etag import make_weak_etag, etag_matches, not_modified, set_etag
+from common.log import setup_logging, log_context, sampled_logger, CorrelationIdMiddleware
+from common.metrics import (
+    MetricsMiddleware, run_snapshot_writer, collect_all, render, register_ttl_cache,
+    cache_requests, check_queue_depth, checks_running, check_runs, check_result_size,
+    container_start_duration, blender_run_duration,
+)
 from services.blender_service import BlenderService
+from services.screenshots import screenshot_executor, store_screenshot, generate_variants
+from services.review_report import ensure_report, report_failed, report_key, report_path
+from services.blob_store import blob_store, file_digest
+from services.retention import default_rules, run_sweeper
+from services.workspace import job_workspace
+from services.chunked_upload import (
+    UPLOAD_CHUNK_SIZE, ChunkOffsetError, ChunkChecksumError, UploadGoneError,
+    create_upload, load_upload, write_chunk, finalize_upload, cancel_upload,
+)
 from utils.filters import datetimeformat
-from database.models import User, Work, CompletedWorks
+from utils.issues import issue_text, issue_status, check_verdict
+from utils.static_assets import PrecompressedStaticFiles, static_url
+from utils.templating import create_template_env, warm_up_templates
+from database.models import User, Work
 from services.fbx_checker import FBXChecker
 
+# Логирование: JSON записи через очередь, форматирование и вывод - в отдельном потоке (common/log.py)
+setup_logging()
+logger = logging.getLogger(__name__)
+checker_output_log = sampled_logger("checker.output")  # Вывод контейнера проверки (DEBUG, прореживается)
+
 # Инициализация шаблонов с добавлением фильтра
-templates = Jinja2Templates(directory="templates")
+templates = Jinja2Templates(env=create_template_env(
+    "templates",
+    cache_dir=os.getenv("TEMPLATES_CACHE_DIR", ".jinja_cache"),
+    auto_reload=os.getenv("TEMPLATES_AUTO_RELOAD", "1") == "1",
+))
 templates.env.filters["datetimeformat"] = datetimeformat
+templates.env.filters["issue_text"] = issue_text
+templates.env.filters["issue_status"] = issue_status
+templates.env.globals["static_url"] = static_url
 
 # Создание директории для загрузок, если её нет
 UPLOAD_DIR = Path("uploads")
@@ -64,10 +96,28 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 # SMTP_PASSWORD = os.getenv("SMTP_PASSWORD") # "your_password"
 # SMTP_FROM_EMAIL = os.getenv("SMTP_FROM_EMAIL", SMTP_USERNAME) # Адрес отправителя
 
+METRICS_SNAPSHOT_INTERVAL = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "5"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # Если задан, /metrics требует заголовок Authorization: Bearer <token>
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await create_db_and_tables()
+    # Компилируем шаблоны до первого запроса (байткод берется из кэша, если он уже есть)
+    warm_up_templates(templates.env)
+    # Периодическая очистка старых результатов, логов и брошенных временных файлов
+    sweeper = None
+    if os.getenv("RETENTION_ENABLED", "1") == "1":
+        sweeper = asyncio.create_task(run_sweeper(default_rules(), float(os.getenv("RETENTION_INTERVAL", "600"))))
+    # Снимок метрик воркера для /metrics в остальных воркерах (common/metrics.py)
+    metrics_writer = None
+    if METRICS_SNAPSHOT_INTERVAL > 0:
+        metrics_writer = asyncio.create_task(run_snapshot_writer(METRICS_SNAPSHOT_INTERVAL))
     yield
+    if sweeper is not None:
+        sweeper.cancel()
+    if metrics_writer is not None:
+        metrics_writer.cancel()
+    screenshot_executor.shutdown(wait=False, cancel_futures=True)
 
 app = FastAPI(lifespan=lifespan)
 
@@ -79,25 +129,42 @@ app.add_middleware(
     max_age=86400  # Время жизни сессии в секундах (24 часа)
 )
 
+# Сжатие ответов (HTML страниц и JSON результатов проверки) - gzip/brotli
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    gzip_level=int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+)
+
+# Время обработки запросов по маршрутам (/metrics). Добавляется после остальных - измеряет весь их стек
+app.add_middleware(MetricsMiddleware)
+
+# Идентификатор запроса (X-Request-ID) во всех записях лога. Самый внешний middleware
+app.add_middleware(CorrelationIdMiddleware)
+
 # Обработчик исключения для отсутствующего токена
 @app.exception_handler(MissingTokenError)
 async def missing_token_exception_handler(request: Request, exc: MissingTokenError):
+    if request.url.path.startswith("/api/"):
+        return ORJSONResponse({"detail": "Требуется авторизация"}, status_code=status.HTTP_401_UNAUTHORIZED)
     return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
 
 # Обработчик исключения для истекшего токена
 @app.exception_handler(JWTDecodeError)
 async def jwt_decode_exception_handler(request: Request, exc: JWTDecodeError):
+    if request.url.path.startswith("/api/"):
+        return ORJSONResponse({"detail": "Недействительный токен"}, status_code=status.HTTP_401_UNAUTHORIZED)
     return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
 
-# Монтирование статических файлов
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Монтирование статических файлов (сжатые варианты и immutable-кэш - см. utils/static_assets.py)
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 api_key_header = APIKeyHeader(name="X-API-Key")
 
-# Настройка логирования
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
-
 #####################################################################################################################
+# Максимальное количество сообщений в одной пачке от бота
+MAX_TELEGRAM_BATCH = 1000
+
 # Модель для валидации входящих данных
 class TelegramMessage(BaseModel):
     title: str
@@ -127,27 +194,125 @@ async def save_telegram_message(
         )
 
 
+#____________________________________________________________________________________________________________________
+@app.post("/api/telegram/messages")
+async def save_telegram_messages(
+    messages: List[TelegramMessage],
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Пакетное сохранение сообщений бота (например, после простоя).
+    Вся пачка вставляется одной транзакцией, дубликаты по названию пропускаются.
+    """
+    if len(messages) > MAX_TELEGRAM_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Слишком много сообщений в пачке (максимум {MAX_TELEGRAM_BATCH})"
+        )
+    try:
+        created = await orm_add_works_bulk(session, [message.model_dump() for message in messages])
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+    results = []
+    for message in messages:
+        if message.title in created:
+            results.append({"title": message.title, "status": "created"})
+            # Повтор того же названия ниже по пачке - уже дубликат
+            created.discard(message.title)
+        else:
+            results.append({"title": message.title, "status": "duplicate"})
+    return {
+        "created": sum(1 for item in results if item["status"] == "created"),
+        "duplicates": sum(1 for item in results if item["status"] == "duplicate"),
+        "items": results
+    }
+
+
 #####################################################################################################################
-@app.get("/", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+# Количество работ на одной странице списка
+WORKS_PER_PAGE = int(os.getenv("WORKS_PER_PAGE", "60"))
+
+# Фильтры списка работ по статусу -> значение Work.assigned_to
+WORKS_STATUS_FILTERS = {"waiting": False, "in_progress": True}
+
+# Кэш отрендеренных фрагментов списка работ и счетчиков статусов.
+# В ключ входит версия таблицы works, поэтому после любого изменения работ старые записи
+# просто перестают запрашиваться и вытесняются по LRU/TTL
+works_fragment_cache = TTLCache(
+    maxsize=int(os.getenv("WORKS_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("WORKS_CACHE_TTL", "300")),
+)
+register_ttl_cache("works_fragment", works_fragment_cache)
+register_ttl_cache("user", user_cache)
+
+async def get_works_counters(session: AsyncSession, version: int):
+    """Возвращает (ожидают проверки, в работе) из кэша"""
+    key = ("counters", version)
+    counters = works_fragment_cache.get(key)
+    if counters is None:
+        counters = await orm_get_works_status_counts(session)
+        works_fragment_cache.set(key, counters)
+    return counters
+
+async def render_works_fragment(
+    session: AsyncSession,
+    template_name: str,
+    version: int,
+    page: int = 1,
+    status_filter: Optional[str] = None,
+) -> str:
+    """
+    Рендерит фрагмент списка работ (без данных текущего пользователя) и кэширует HTML
+    по шаблону, версии таблицы, странице и фильтру.
+    """
+    key = (template_name, version, page, status_filter)
+    html = works_fragment_cache.get(key)
+    if html is None:
+        works = await orm_get_works(
+            session,
+            assigned_to=WORKS_STATUS_FILTERS.get(status_filter),
+            limit=WORKS_PER_PAGE,
+            offset=(page - 1) * WORKS_PER_PAGE,
+        )
+        html = templates.get_template(template_name).render(works=works)
+        works_fragment_cache.set(key, html)
+    return html
+
+def user_etag_parts(current_user: User) -> tuple:
+    """Данные пользователя, которые попадают в разметку страниц (шапка, кнопки по роли)"""
+    return current_user.id, current_user.full_name, current_user.position
+
+#____________________________________________________________________________________________________________________
+@app.get("/", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def main_page(
     request: Request,
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)  # Защита маршрута
 ):
     users = await orm_get_all_users(session)
-    works = await orm_get_works(session)  # Получаем отсортированные работы
+    # Последние работы и счетчики берем из кэша фрагментов
+    version = await orm_get_table_version(session, "works")
+    works_html = await render_works_fragment(session, "partials/work_list.html", version)
+    works_waiting, works_in_progress = await get_works_counters(session, version)
     return templates.TemplateResponse(
         "main.html",
         {
             "request": request,
             "users": users,
-            "works": works,  # Передаем работы в шаблон
+            "works_html": works_html,  # Готовый HTML списка работ (первые WORKS_PER_PAGE)
+            "works_per_page": WORKS_PER_PAGE,
+            "works_waiting": works_waiting,
+            "works_in_progress": works_in_progress,
             "current_user": current_user
         }
     )
 
 #####################################################################################################################
-@app.get("/profile", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+@app.get("/profile", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def profile(
     request: Request,
     current_user: User = Depends(get_current_user),
@@ -180,6 +345,11 @@ async def login_form(request: Request):
     return templates.TemplateResponse("login.html", {"request": request, "current_user": None})
 
 #____________________________________________________________________________________________________________________
+# Ограничение попыток входа: по IP-адресу и по паре (логин, IP) в минуту. Лимит по одному логину
+# без IP позволил бы любому заблокировать вход настоящему пользователю, перебирая его логин
+login_ip_throttle = AttemptThrottle(max_attempts=int(os.getenv("LOGIN_ATTEMPTS_PER_IP", "20")), window=60)
+login_name_throttle = AttemptThrottle(max_attempts=int(os.getenv("LOGIN_ATTEMPTS_PER_LOGIN", "5")), window=60)
+
 @app.post("/login")
 async def auth(
     request: Request,
@@ -187,6 +357,18 @@ async def auth(
     password: str = Form(...),
     session: AsyncSession = Depends(get_db),
 ):
+    # Ограничиваем частоту попыток до проверки пароля, чтобы всплеск логинов не загружал bcrypt
+    client_ip = request.client.host if request.client else "unknown"
+    login_key = (login, client_ip)
+    if not login_ip_throttle.hit(client_ip) or not login_name_throttle.hit(login_key):
+        retry_after = max(login_ip_throttle.retry_after(client_ip), login_name_throttle.retry_after(login_key))
+        return templates.TemplateResponse(
+            "login.html",
+            {"request": request, "error": f"Слишком много попыток входа. Повторите через {retry_after} с.", "current_user": None},
+            status_code=429,
+            headers={"Retry-After": str(retry_after)}
+        )
+
     user = await orm_get_user_info(session, login)
     
     if user is None or not await verify_password(password, user.password):
@@ -196,7 +378,10 @@ async def auth(
             status_code=401
         )
     
-    token = security.create_access_token(user.login)
+    login_name_throttle.reset(login_key)
+
+    # Роль кладем в токен, чтобы проверка прав не требовала запроса к БД
+    token = security.create_access_token(uid=user.login, data={"role": user.position})
     response = RedirectResponse(url="/", status_code=303)
     response.set_cookie(
         key="access_token",
@@ -217,31 +402,56 @@ async def logout(request: Request):
     return response
 
 #####################################################################################################################
-@app.get("/works", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+@app.get("/works", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def works_form(
     request: Request,
+    page: int = Query(1, ge=1),
+    status_filter: Optional[str] = Query(None, alias="status"),
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    works = await orm_get_works(session)
+    if status_filter not in WORKS_STATUS_FILTERS:
+        status_filter = None
+
+    version = await orm_get_table_version(session, "works")
+    # Страница не менялась с прошлого визита - отвечаем 304, ничего не загружая и не рендеря
+    etag = make_weak_etag("works", version, page, status_filter, *user_etag_parts(current_user))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    works_waiting, works_in_progress = await get_works_counters(session, version)
+    if status_filter == "waiting":
+        total = works_waiting
+    elif status_filter == "in_progress":
+        total = works_in_progress
+    else:
+        total = works_waiting + works_in_progress
+    pages = max((total + WORKS_PER_PAGE - 1) // WORKS_PER_PAGE, 1)
+    works_html = await render_works_fragment(session, "partials/work_cards.html", version, page, status_filter)
     
     # Получаем сообщение из cookies
     message = request.cookies.get("message")
     if message:
         message = unquote(message)  # Декодируем сообщение
     
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "works.html",
         {
             "request": request,
-            "works": works,
+            "works_html": works_html,
+            "works_waiting": works_waiting,
+            "works_in_progress": works_in_progress,
+            "status_filter": status_filter,
+            "page": page,
+            "pages": pages,
             "current_user": current_user,
             "message": message  # Передаем сообщение в шаблон
         }
     )
+    return set_etag(response, etag)
 
 #####################################################################################################################
-@app.get("/works/upload_fbx", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+@app.get("/works/upload_fbx", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def upload_fbx_page(
     request: Request,
     current_user: User = Depends(get_current_user),
@@ -250,126 +460,240 @@ async def upload_fbx_page(
     """
     Отображает форму загрузки FBX файлов (GET) 
     """
-    print("--- PRINT: Entered upload_fbx_page (GET) ---")
     # Проверяем, есть ли результат последней проверки в сессии
     last_result_path = request.session.get('last_check_result_path')
     if last_result_path and os.path.exists(last_result_path):
-        print(f"PRINT: Found existing result path in session AND file exists, redirecting to results: {last_result_path}")
+        logger.debug("Result of the last check is still available, redirecting to results", extra={"result_path": last_result_path})
         return RedirectResponse(url=f"/works/check_results", status_code=status.HTTP_303_SEE_OTHER)
     elif last_result_path: # Если путь в сессии есть, но файла нет
-        print(f"PRINT: Found stale result path in session, but file does not exist: {last_result_path}. Clearing session key.")
+        logger.debug("Stale result path in session, clearing it", extra={"result_path": last_result_path})
         del request.session['last_check_result_path']
 
     # Render the upload form if no redirect happened
-    print("--- PRINT: Rendering upload_fbx_page ---")
     return templates.TemplateResponse(
         "upload.html",
-        {"request": request, "current_user": current_user}
+        {"request": request, "current_user": current_user, "chunk_size": UPLOAD_CHUNK_SIZE, "check_timeout": CHECK_PENDING_TIMEOUT}
     )
 
+# ----------------------------- Запуск проверки архива -----------------------------
+# Одновременно выполняется не больше CHECK_CONCURRENCY проверок в воркере, остальные ждут своей очереди
+CHECK_CONCURRENCY = int(os.getenv("CHECK_CONCURRENCY", "2"))
+check_slots = asyncio.Semaphore(CHECK_CONCURRENCY)
+
+async def run_archive_check(archive, check_id: uuid.UUID) -> Path:
+    """
+    Проверяет архив из хранилища блобов и возвращает путь к UPLOAD_DIR/result_<check_id>.json.
+    Исключение - если проверка упала.
+    """
+    # Все записи лога проверки, в том числе из потока с Docker, - с check_id и архивом
+    with log_context(check_id=str(check_id), archive=archive.digest):
+        result_json_path = UPLOAD_DIR / f"result_{check_id}.json"
+
+        # Этот архив уже проверяли той же версией проверки - берем готовый результат
+        cached_result_path = check_cache_path(archive.digest)
+        if cached_result_path.exists():
+            logger.info("Using cached check result", extra={"cached_result": str(cached_result_path)})
+            cache_requests.inc(cache="check_result", result="hit")
+            shutil.copyfile(cached_result_path, result_json_path)
+            return result_json_path
+        cache_requests.inc(cache="check_result", result="miss")
+
+        with check_queue_depth.track():
+            await check_slots.acquire()
+        try:
+            # Каждая проверка работает в своей папке (архив, распаковка, текстуры, результат),
+            # папка удаляется после проверки. Блоб в папку ставится ссылкой или копией
+            with job_workspace(str(check_id)) as workspace:
+                temp_file_path = str(blob_store.link(archive.path, workspace.input_dir / f"{archive.digest[:16]}.zip"))
+                job_result_path = workspace.output_dir / result_json_path.name
+
+                with checks_running.track():
+                    # to_thread, а не run_in_executor: поток получает контекст (request_id, check_id для логов)
+                    await asyncio.to_thread(
+                        run_blender_check_docker_sync,
+                        temp_file_path,
+                        str(job_result_path),
+                        str(workspace.scratch_dir)
+                    )
+                if job_result_path.exists():
+                    check_result_size.observe(job_result_path.stat().st_size)
+                    shutil.copyfile(job_result_path, result_json_path)
+        finally:
+            check_slots.release()
+        save_check_result_to_cache(result_json_path, cached_result_path)
+        return result_json_path
+
+# result_<id>.meta.json - владелец проверки и время ее запуска. Пока у проверки есть метка, но нет
+# result_<id>.json, она ожидает очереди или выполняется. Фоновая проверка живет в памяти воркера: если метка старше CHECK_PENDING_TIMEOUT,
+# воркер перезапускался и проверка потеряна
+CHECK_PENDING_TIMEOUT = float(os.getenv("CHECK_PENDING_TIMEOUT", "3600"))
+
+def check_meta_path(check_id) -> Path:
+    return UPLOAD_DIR / f"result_{check_id}.meta.json"
+
+def write_check_meta(check_id, **fields):
+    check_meta_path(check_id).write_bytes(orjson.dumps({"started_at": time.time(), **fields}))
+
+def read_check_meta(check_id) -> Optional[dict]:
+    try:
+        return orjson.loads(check_meta_path(check_id).read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+async def run_queued_check(archive, check_id: uuid.UUID):
+    """Фоновая проверка (после загрузки частями). Ошибка записывается в файл результатов,
+    чтобы /api/v1/checks/{check_id} и страница результатов ее показали"""
+    try:
+        result_json_path = await run_archive_check(archive, check_id)
+        if not result_json_path.exists():
+            raise RuntimeError("Файл результата не был создан, хотя проверка завершилась без явной ошибки.")
+    except Exception as e:
+        logger.error("Queued check failed: %s", e, extra={"check_id": str(check_id)})
+        async with aiofiles.open(UPLOAD_DIR / f"result_{check_id}.json", "wb") as f:
+            await f.write(orjson.dumps({"check_error": f"Ошибка выполнения проверки: {e}"}))
+
 # --------------------------- Новая функция для обработки POST-запроса ---------------------------------
-@app.post("/works/upload_fbx", dependencies=[Depends(security.access_token_required)])
+@app.post("/works/upload_fbx", dependencies=[Depends(get_token_claims)])
 async def handle_upload_fbx(
     request: Request, # Восстанавливаем request
     file: UploadFile = File(...), # file после request
     current_user: User = Depends(get_current_user) # current_user после file
 ): 
-    print("--- PRINT: Entered handle_upload_fbx (POST) --- ") # Заменено на print
     if not file or not file.filename.endswith('.zip'):
         return JSONResponse(
             status_code=400,
             content={"detail": "Только ZIP архивы разрешены"}
         )
 
-    print("PRINT: Generating unique filename...") # Заменено на print
-    unique_filename = f"result_{uuid.uuid4()}.json"
+    check_id = uuid.uuid4() # Идентификатор проверки, по нему результаты доступны в /api/v1/checks/{check_id}
+    unique_filename = f"result_{check_id}.json"
     result_json_path = UPLOAD_DIR / unique_filename
-    temp_file_path = None
 
-    print("PRINT: Attempting to create temp file...") # Заменено на print
+    await asyncio.to_thread(write_check_meta, check_id, user_id=current_user.id)
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as temp_file:
-            print("PRINT: Reading file content...") # Заменено на print
-            content = await file.read()
-            print("PRINT: Writing content to temp file...") # Заменено на print
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-            print(f"PRINT: Saved uploaded file temporarily to: {temp_file_path}") # Заменено на print
+        archive = await blob_store.put_upload(file, suffix=".zip")
+        logger.info(
+            "Saved uploaded archive",
+            extra={"archive": archive.digest, "size": archive.size, "duplicate": archive.existed, "check_id": str(check_id)},
+        )
     except Exception as e_readwrite:
-        print(f"ERROR: Error reading/writing uploaded file: {e_readwrite}") # Заменено на print
+        logger.error("Error reading/writing uploaded file: %s", e_readwrite)
         # traceback.print_exc() # Раскомментировать для детальной ошибки
         return HTMLResponse(content="<h1>Ошибка обработки файла</h1><p>Не удалось прочитать или сохранить загруженный файл.</p>", status_code=500)
 
-    print(f"PRINT: Expecting result file at: {result_json_path}") # Заменено на print
-
-    loop = asyncio.get_running_loop()
-    print(f"PRINT: About to call run_in_executor for {temp_file_path}") # Заменено на print
     try:
-        await loop.run_in_executor(
-            None,
-            run_blender_check_docker_sync,
-            temp_file_path,
-            str(result_json_path)
-        )
-        print(f"PRINT: run_in_executor finished successfully for {temp_file_path}") # Заменено на print
+        await run_archive_check(archive, check_id)
     except Exception as executor_error:
-        print(f"ERROR: ERROR during run_in_executor: {executor_error}") # Заменено на print
+        logger.error("Check failed: %s", executor_error, extra={"check_id": str(check_id)})
         # traceback.print_exc() # Раскомментировать для детальной ошибки
-        if temp_file_path and os.path.exists(temp_file_path):
-            try: os.remove(temp_file_path); print(f"PRINT: Cleaned up temp archive on executor error: {temp_file_path}") # Заменено на print
-            except: pass
         return HTMLResponse(content=f"<h1>Ошибка выполнения проверки</h1><p>{executor_error}</p>", status_code=500)
 
-    file_exists = os.path.exists(result_json_path)
-    print(f"PRINT: Checking existence right after executor: {result_json_path} - Exists: {file_exists}") # Заменено на print
-    if not file_exists:
-        if temp_file_path and os.path.exists(temp_file_path):
-            try: os.remove(temp_file_path); print(f"PRINT: Cleaned up temp archive (result not found): {temp_file_path}") # Заменено на print
-            except: pass
-        print(f"ERROR: Result file NOT FOUND at {result_json_path} after executor finished without error.") # Заменено на print 
+    if not os.path.exists(result_json_path):
+        logger.error("Result file not found after the check finished without error", extra={"result_path": str(result_json_path)})
         return HTMLResponse(content="<h1>Ошибка проверки</h1><p>Файл результата не был создан, хотя проверка завершилась без явной ошибки.</p>", status_code=500)
 
     # Проверяем содержимое файла результатов
     try:
         with open(result_json_path, 'r', encoding='utf-8') as f:
             results = json.load(f)
-        print(f"PRINT: Successfully read results file. Content keys: {results.keys()}") # Добавлено логирование
-        print(f"PRINT: Content of results['error'] if exists: {results.get('error', 'Key \"error\" not found')}") # Добавлено логирование
+        logger.debug("Read check results", extra={"keys": list(results), "error": results.get("error")})
 
         # Проверяем наличие ошибки о отсутствии FBX файлов
         if "error" in results and "В данном архиве нет FBX файлов" in results["error"]:
             # Удаляем временные файлы
-            if temp_file_path and os.path.exists(temp_file_path):
-                try: os.remove(temp_file_path)
-                except: pass
-            if os.path.exists(result_json_path):
-                try: os.remove(result_json_path)
-                except: pass
+            for path in (result_json_path, check_meta_path(check_id)):
+                try: os.remove(path)
+                except OSError: pass
             # Возвращаем сообщение об ошибке
             return HTMLResponse(
                 content="<h1>Ошибка проверки</h1><p>В данном архиве нет FBX файлов. Загрузите другой архив</p>",
                 status_code=400
             )
     except Exception as e:
-        print(f"ERROR: Error reading results file: {e}")
+        logger.error("Error reading results file: %s", e, extra={"result_path": str(result_json_path)})
         return HTMLResponse(content="<h1>Ошибка чтения результатов</h1><p>Не удалось прочитать результаты проверки.</p>", status_code=500)
 
     request.session['last_check_result_path'] = str(result_json_path)
-    print(f"PRINT: Saved result path to session: {result_json_path}") # Заменено на print
-    print(f"PRINT: Session content after save: {request.session}") # Заменено на print
+    return RedirectResponse(
+        url=f"/works/check_results",
+        status_code=status.HTTP_303_SEE_OTHER,
+        headers={"X-Check-Id": str(check_id)}
+    )
+
+# ----------------------------- Кэш результатов проверки -----------------------------
+CHECK_CACHE_DIR = UPLOAD_DIR / "check_cache"
+# Результат зависит и от архива, и от кода проверки: после обновления model_checker.py кэш не используется
+CHECKER_SCRIPT = Path("blender-docker/addons/model_checker.py")
+CHECKER_VERSION = file_digest(CHECKER_SCRIPT)[:12] if CHECKER_SCRIPT.exists() else "unknown"
 
-    print("PRINT: Preparing to redirect...") # Заменено на print
-    return RedirectResponse(url=f"/works/check_results", status_code=status.HTTP_303_SEE_OTHER)
+def check_cache_path(archive_digest: str) -> Path:
+    return CHECK_CACHE_DIR / f"{archive_digest}_{CHECKER_VERSION}.json"
+
+def save_check_result_to_cache(result_json_path: Path, cached_result_path: Path):
+    """Сохраняет результат в кэш. Результаты с ошибкой запуска не кэшируются - их стоит перепроверить"""
+    try:
+        with open(result_json_path, "rb") as f:
+            results = orjson.loads(f.read())
+        if "traceback" in results or "final_error" in results:
+            return
+        CHECK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cached_result_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        shutil.copyfile(result_json_path, tmp_path)
+        os.replace(tmp_path, cached_result_path)
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning("Could not cache check result %s: %s", result_json_path, e)
+
+def format_phase_timings(timings: dict) -> str:
+    """Этапы проверки для лога: 'extraction 1.20s (+35 MB), import:a.fbx 4.10s (+410 MB), ...'"""
+    parts = []
+    for phase in timings.get("phases") or []:
+        text = f"{phase.get('phase')} {phase.get('seconds', 0):.2f}s"
+        if phase.get("peak_rss_delta_mb"):
+            text += f" (+{phase['peak_rss_delta_mb']:g} MB)"
+        parts.append(text)
+    return ", ".join(parts)
+
+def report_check_run(output_json_path, started_at: float, finished_at: float):
+    """
+    Пишет в лог итог проверки рядом с замерами этапов из results['timings'] и обновляет метрики:
+    время запуска делится на старт контейнера с Blender и саму проверку по времени старта скрипта.
+    """
+    try:
+        with open(output_json_path, "rb") as f:
+            results = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning("Could not read check results for timings %s: %s", output_json_path, e)
+        return
+    timings = results.get("timings") if isinstance(results, dict) else None
+    if not isinstance(timings, dict):
+        return  # Старый скрипт проверки без timings
+
+    verdict = check_verdict(results)
+    logger.info(
+        "Check %s: verdict %s, docker %.2fs, checker %.2fs, peak RSS %s MB",
+        Path(output_json_path).stem, verdict, finished_at - started_at, timings.get('total_seconds', 0), timings.get('peak_rss_mb'),
+        extra={
+            "verdict": verdict,
+            "docker_seconds": round(finished_at - started_at, 3),
+            "checker_seconds": timings.get("total_seconds"),
+            "peak_rss_mb": timings.get("peak_rss_mb"),
+            "phases": format_phase_timings(timings),
+        },
+    )
+    checker_started_at = timings.get("started_at")
+    if checker_started_at is None or not started_at <= checker_started_at <= finished_at:
+        return  # Сбитые часы
+    container_start_duration.observe(checker_started_at - started_at)
+    blender_run_duration.observe(finished_at - checker_started_at)
 
 # ----------------------------- Синхронная функция для Docker -----------------------------
-def run_blender_check_docker_sync(input_zip_path, output_json_path):
+def run_blender_check_docker_sync(input_zip_path, output_json_path, scratch_dir=None):
     input_zip_path = os.path.abspath(input_zip_path)
     output_json_path = os.path.abspath(output_json_path)
-    print(f"PRINT [Sync Func] Starting check for Input: {input_zip_path}, Output: {output_json_path}") # Заменено на print
     # Используем input_dir для входного файла
     input_dir = os.path.dirname(input_zip_path) 
-    # Используем UPLOAD_DIR для выходного JSON
-    output_dir = os.path.abspath(UPLOAD_DIR)
+    # Выходной JSON пишется в папку проверки (services/workspace.py)
+    output_dir = os.path.dirname(output_json_path)
     docker_image = "blender-docker_blender"
     # Пути внутри контейнера: /input для архива, /output для JSON
     container_input = f"/input/{os.path.basename(input_zip_path)}"
@@ -377,121 +701,114 @@ def run_blender_check_docker_sync(input_zip_path, output_json_path):
     checker_script = "/app/addons/model_checker.py"
     cmd = [
         "docker", "run", "--rm",
-        "-v", f"{input_dir}:/input", # Монтируем папку с архивом
-        "-v", f"{output_dir}:/output", # Монтируем папку uploads для вывода
+        # Архив в input_dir - жесткая ссылка на блоб хранилища (тот же inode): только чтение,
+        # иначе проверка могла бы изменить блоб, а кэш результатов по его хэшу отдавал бы чужие результаты
+        "-v", f"{input_dir}:/input:ro",
+        "-v", f"{output_dir}:/output", # Монтируем папку проверки для вывода
+    ]
+    if scratch_dir:
+        # Распаковка архива и текстуры - в папке этой проверки, а не рядом с общим output
+        cmd += ["-v", f"{os.path.abspath(scratch_dir)}:/scratch", "-e", "CHECK_WORKDIR=/scratch"]
+    cmd += [
         docker_image,
         "blender", "--background", "--python", checker_script, "--",
         container_input, container_output
     ]
-    print(f"PRINT: Running Docker command: {' '.join(cmd)}") # Заменено на print
+    logger.info("Running check container", extra={"command": " ".join(cmd)})
+    started_at = time.time()
     try:
         # Добавляем таймаут (например, 5 минут = 300 секунд)
         result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=300)
     except subprocess.TimeoutExpired:
-        print("ERROR: Docker command timed out after 300 seconds.") # Заменено на print
+        check_runs.inc(outcome="timeout")
+        logger.error("Docker command timed out after 300 seconds")
         raise RuntimeError("Проверка модели заняла слишком много времени.")
-    if result.stdout:
-        print(f"PRINT: Docker stdout:\n{result.stdout}") # Заменено на print
-    if result.stderr:
-        print(f"WARNING: Docker stderr:\n{result.stderr}") # Заменено на print
-
-    # --- ДОБАВЛЕНО ЛОГИРОВАНИЕ --- 
-    print(f"PRINT [Sync Func] Docker command finished with code {result.returncode}") # Заменено на print
+    finished_at = time.time()
+    # Полный вывод Blender нужен только при отладке; при ошибке - в записи ERROR (поля обрезаются)
+    checker_output_log.debug("Check container output", extra={"stdout": result.stdout, "stderr": result.stderr})
+    output_fields = {"returncode": result.returncode, "stdout": result.stdout, "stderr": result.stderr}
 
     if result.returncode != 0:
+        check_runs.inc(outcome="failed")
         error_message = f"Docker command failed with code {result.returncode}. Stderr: {result.stderr}"
-        print(f"ERROR: {error_message}") # Заменено на print
-        # Логируем stdout/stderr при ошибке
-        print(f"PRINT: Docker stdout (error case):\n{result.stdout}") # Заменено на print
-        print(f"WARNING: Docker stderr (error case):\n{result.stderr}") # Заменено на print
+        logger.error("Docker command failed with code %s", result.returncode, extra=output_fields)
         raise RuntimeError(error_message) # Caught by check_fbx_docker's except
-    
-    # Проверяем существование файла ПЕРЕД возвратом
-    print(f"PRINT [Sync Func] Checking existence BEFORE return: {output_json_path}") # Заменено на print
-    # ---> THIS CHECK <--- 
+
     if not os.path.exists(output_json_path):
+        check_runs.inc(outcome="failed")
         error_message = f"Output JSON file not found after Docker execution: {output_json_path}. Docker stdout: {result.stdout or '[empty]'}. Docker stderr: {result.stderr or '[empty]'}"
-        # Логируем stdout/stderr даже если returncode был 0, но файла нет
-        print(f"PRINT: Docker stdout (file not found case): {result.stdout}") # Заменено на print
-        print(f"WARNING: Docker stderr (file not found case): {result.stderr}") # Заменено на print
-        print(f"ERROR: {error_message}") # Заменено на print
+        # Логируем вывод даже если returncode был 0, но файла нет
+        logger.error("Output JSON file not found after Docker execution", extra=output_fields)
         raise FileNotFoundError(error_message) # Caught by check_fbx_docker's except
 
-    print(f"PRINT: Successfully created result file: {output_json_path}") # Заменено на print
+    check_runs.inc(outcome="ok")
+    report_check_run(output_json_path, started_at, finished_at)
     return output_json_path
 # --- Конец синхронной функции ---
 
 ###################################################################################################
 # --- Новый GET эндпоинт для отображения результатов --- 
-@app.get("/works/check_results", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+@app.get("/works/check_results", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def show_check_results(
     request: Request,
     current_user: User = Depends(get_current_user)
 ):
     result_json_path = request.session.get('last_check_result_path')
     if not result_json_path:
-        print("WARNING: Result path not found in session") # Заменено на print
+        # Ключ сессии убирается после первого показа, но браузер мог сохранить страницу -
+        # подтверждаем ее по ETag последнего показанного результата
+        last_etag = request.session.get('last_check_result_etag')
+        if last_etag and etag_matches(request, last_etag):
+            return not_modified(last_etag)
+        logger.warning("Result path not found in session")
         return HTMLResponse(content="<h1>Результаты не найдены</h1><p>Проверка не была завершена или результаты не сохранены.</p>", status_code=404)
 
     try:
         # Проверяем существование файла результатов
         if not os.path.exists(result_json_path):
-            print(f"WARNING: Result file not found: {result_json_path}") # Заменено на print
+            logger.warning("Result file not found: %s", result_json_path)
             return HTMLResponse(content="<h1>Результаты не найдены</h1><p>Файл результатов не найден.</p>", status_code=404)
 
+        # Имя файла результатов уникально для каждой проверки
+        etag = make_weak_etag("check_results", result_json_path, *user_etag_parts(current_user))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
         # Читаем результаты из файла
-        print(f"PRINT: Reading results from: {result_json_path}") # Заменено на print
         with open(result_json_path, 'r') as f:
             results = json.load(f)
 
-        # Удаляем файл и ключ сессии после успешного чтения (как было задумано)
-        # А также удаляем папку textures
-        try:
-            os.remove(result_json_path)
-            print(f"PRINT: Removed result JSON file after reading: {result_json_path}") # Заменено на print
-            if 'last_check_result_path' in request.session:
-                del request.session['last_check_result_path']
-                print("PRINT: Removed result path from session.") # Заменено на print
-
-            # Удаляем папку uploads/textures
-            textures_dir_path = UPLOAD_DIR / "textures"
-            print(f"PRINT: Checking for textures directory: {textures_dir_path}") # Заменено на print
-            if os.path.exists(textures_dir_path) and os.path.isdir(textures_dir_path):
-                print(f"PRINT: Attempting to remove textures directory: {textures_dir_path}") # Заменено на print
-                try:
-                    shutil.rmtree(textures_dir_path)
-                    print(f"PRINT: Successfully removed textures directory: {textures_dir_path}") # Заменено на print
-                except Exception as e_rmdir:
-                    print(f"ERROR: Could not remove textures directory {textures_dir_path}: {e_rmdir}") # Заменено на print
-            else:
-                 print(f"PRINT: Textures directory not found or not a directory: {textures_dir_path}") # Заменено на print
-
-        except OSError as e_remove:
-            print(f"WARNING: Could not remove result JSON file {result_json_path}: {e_remove}") # Заменено на print
+        # После показа убираем только ключ сессии, чтобы страница загрузки снова открывалась.
+        # Сам файл остается доступен владельцу через /api/v1/checks/{check_id}, его удаляет
+        # очистка (правило "check-results", RETENTION_CHECK_RESULTS_HOURS)
+        request.session.pop('last_check_result_path', None)
 
         # Отображаем результаты
-        return templates.TemplateResponse(
+        request.session['last_check_result_etag'] = etag
+        response = templates.TemplateResponse(
             "check_results.html",
             {
                 "request": request,
                 "results": results,
+                "check_error": results.get("check_error"),
                 "current_user": current_user,
             }
         )
+        return set_etag(response, etag)
     except Exception as e:
-        print(f"ERROR: Error reading results: {e}")
+        logger.error("Error reading results: %s", e, extra={"result_path": result_json_path})
         return HTMLResponse(content="<h1>Ошибка чтения результатов</h1><p>Не удалось прочитать результаты.</p>", status_code=500)
 
 
 # ------------------- Эндпоинты для создания новой работы -------------------
-@app.get("/works/new", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+@app.get("/works/new", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def new_work_form(request: Request, current_user: User = Depends(get_current_user)):
     return templates.TemplateResponse(
         "create_work.html",
         {"request": request, "current_user": current_user}
     )
 
-@app.post("/works/new", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+@app.post("/works/new", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def create_new_work(
     request: Request,
     title: str = Form(...),
@@ -511,27 +828,37 @@ async def create_new_work(
         )
 
 # ------------------- Существующий эндпоинт для просмотра работы -------------------
-@app.get("/works/{work_id}", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+@app.get("/works/{work_id}", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def works_list(
     work_id: int,
     request: Request,
     session: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    # Любое изменение работ и скриншотов увеличивает версию таблицы, поэтому их достаточно для ETag
+    version = await orm_get_table_version(session, "works")
+    screenshots_version = await orm_get_table_version(session, "review_screenshots")
+    etag = make_weak_etag("work", work_id, version, screenshots_version, *user_etag_parts(current_user))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     work = await orm_get_work(session, work_id)
     if not work:
         raise HTTPException(status_code=404, detail="Work not found")
-    return templates.TemplateResponse(
+    screenshots = await orm_get_review_screenshots(session, work_id)
+    response = templates.TemplateResponse(
         "work_id.html", 
             {
             "request": request, 
             "work": work, 
+            "screenshots": screenshots,
             "current_user": current_user,
             }
         )
+    return set_etag(response, etag)
 
 #____________________________________________________________________________________________________________________
-@app.get("/works/{work_id}/decline", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+@app.get("/works/{work_id}/decline", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def decline_work(
     work_id: int,
     request: Request,
@@ -545,7 +872,6 @@ async def decline_work(
 
         # Проверяем, что текущий пользователь является назначенным на работу
         if work.inspector != current_user.id:
-            print(current_user.id)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Работу проверяет другой сотрудник"
@@ -568,7 +894,7 @@ async def decline_work(
         raise HTTPException(status_code=500, detail=str(e))
 
 #______________________GET ЗАПРОС__________________________________________________________________________________________
-@app.get("/works/{work_id}/take", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+@app.get("/works/{work_id}/take", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def take_work_form(
     work_id: int,
     request: Request,
@@ -607,10 +933,34 @@ async def take_work_form(
         )
     
 #____________________________POST ЗАПРОС____________________________________________________________________________________
-@app.post("/works/{work_id}/take", response_class=HTMLResponse, dependencies=[Depends(security.access_token_required)])
+async def build_screenshot_variants(work_id: int, screenshots: list[tuple[int, str]]):
+    """
+    Фоновая задача: миниатюры и WebP-версии скриншотов, пути записываются в БД.
+    Затем заранее собирается DOCX-отчет, чтобы скачивание было мгновенным.
+    """
+    variants = await generate_variants([path for _, path in screenshots])
+    updates = [
+        {"id": screenshot_id, "thumb_path": result[0], "web_path": result[1]}
+        for (screenshot_id, _), result in zip(screenshots, variants)
+        if result is not None
+    ]
+    async with session_maker() as session:
+        await orm_set_screenshot_variants(session, updates)
+        work_screenshots = await orm_get_review_screenshots(session, work_id)
+    await build_review_report(work_id, work_screenshots)
+
+async def build_review_report(work_id: int, screenshots):
+    """Фоновая задача: сборка DOCX-отчета (ошибки только логируются)"""
+    try:
+        await ensure_report(work_id, screenshots)
+    except Exception as e:
+        logger.error("Could not build review report for work %s: %s", work_id, e)
+
+@app.post("/works/{work_id}/take", response_class=HTMLResponse, dependencies=[Depends(get_token_claims)])
 async def take_work(
     work_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     screenshots: list[UploadFile] = File(...),
     comments: list[str] = Form([]),  # Комментарии
     session: AsyncSession = Depends(get_db),
@@ -621,25 +971,45 @@ async def take_work(
         if not work:
             raise HTTPException(status_code=404, detail="Работа не найдена")
 
-        if work.assigned_to:
+        # GET /take уже назначает работу текущему пользователю
+        if work.assigned_to and work.inspector != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Работа уже назначена другому пользователю"
             )
 
-        # Сохраняем файлы и комментарии
-        for i, (screenshot, comment) in enumerate(zip(screenshots, comments), start=1):
-            file_path = f"uploads/work_{work_id}_user_{current_user.id}_{i}.png"
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(screenshot.file, buffer)
-
-            # Сохраняем комментарий
-            print(f"Скриншот {i}: {comment}")  # Пример обработки комментария
-
+        # Проверяем все файлы до сохранения (по заголовку, без полного декодирования)
+        for screenshot in screenshots:
+            if not await is_valid_image(screenshot):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Файл {screenshot.filename} не является изображением (PNG, JPEG, WebP, BMP) или слишком большой"
+                )
+
+        # Сохраняем файлы потоково, комментарии пишем вместе со скриншотами одной пачкой
+        rows = []
+        for position, screenshot in enumerate(screenshots, start=1):
+            blob = await store_screenshot(screenshot)
+            comment = comments[position - 1].strip() if position <= len(comments) else ""
+            rows.append({
+                "work_id": work_id,
+                "user_id": current_user.id,
+                "position": position,
+                "comment": comment or None,
+                "original_path": str(blob.path),
+            })
+        created = await orm_add_review_screenshots(session, rows)
+
+        # Миниатюры строятся после ответа, в пуле процессов
+        background_tasks.add_task(build_screenshot_variants, work_id, created)
+        return RedirectResponse(url="/works/upload_fbx", status_code=status.HTTP_303_SEE_OTHER)
+
+    except HTTPException:
+        raise
 
     except MissingTokenError as e:
         # Обработка исключения MissingTokenError
-        RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
+        return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
 
     except Exception as e:
         # Обработка всех остальных исключений
@@ -648,6 +1018,68 @@ async def take_work(
             detail=f"Произошла ошибка: {str(e)}"
         )
 
+#____________________________________________________________________________________________________________________
+@app.get("/works/{work_id}/screenshots/{screenshot_id}", dependencies=[Depends(get_token_claims)])
+async def review_screenshot_file(
+    work_id: int,
+    screenshot_id: int,
+    size: str = Query("web", pattern="^(thumb|web|original)$"),
+    session: AsyncSession = Depends(get_db),
+):
+    """Файл скриншота: миниатюра, версия для просмотра или оригинал"""
+    screenshot = await orm_get_review_screenshot(session, work_id, screenshot_id)
+    if not screenshot:
+        raise HTTPException(status_code=404, detail="Скриншот не найден")
+    # Пока уменьшенные версии не готовы, отдаем оригинал
+    path = {
+        "thumb": screenshot.thumb_path,
+        "web": screenshot.web_path,
+    }.get(size) or screenshot.original_path
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Файл скриншота не найден")
+    # Имена файлов уникальны и не переиспользуются - браузер может кэшировать их надолго
+    cache_control = "private, max-age=86400" if path != screenshot.original_path or size == "original" else "private, no-cache"
+    return FileResponse(path, headers={"Cache-Control": cache_control})
+
+#____________________________________________________________________________________________________________________
+@app.get("/works/{work_id}/report", dependencies=[Depends(get_token_claims)])
+async def review_report(
+    work_id: int,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    DOCX-отчет со скриншотами и комментариями. Готовый отчет берется из кэша,
+    иначе сборка запускается в фоне, а страница обновляется, пока отчет не будет готов.
+    Если сборка не удалась, показывается ошибка (без повторной сборки на каждое обновление).
+    """
+    screenshots = await orm_get_review_screenshots(session, work_id)
+    if not screenshots:
+        raise HTTPException(status_code=404, detail="Скриншотов для отчета нет")
+
+    key = report_key(screenshots)
+    path = report_path(work_id, key)
+    if path.exists():
+        return FileResponse(
+            path,
+            filename=f"report_work_{work_id}.docx",
+            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            headers={"Cache-Control": "private, no-cache"},
+        )
+
+    if report_failed(key):
+        return HTMLResponse(
+            content="<h1>Ошибка формирования отчёта</h1><p>Не удалось собрать отчёт. Попробуйте позже или обратитесь к администратору.</p>",
+            status_code=500,
+        )
+
+    background_tasks.add_task(build_review_report, work_id, screenshots)
+    return HTMLResponse(
+        content="<h1>Отчёт формируется</h1><p>Скачивание начнётся автоматически через несколько секунд.</p>",
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Refresh": "3"},
+    )
+
 ###################################################################################################
 # Маршруты для приглашения сотрудников - ПЕРЕМЕЩЕНО ВЫШЕ ДЛЯ ПРАВИЛЬНОГО МАТЧИНГА
 ###################################################################################################
@@ -723,6 +1155,7 @@ async def invite_employee_submit(
     try:
         await session.commit()
         await session.refresh(new_user)
+        invalidate_cached_user(email)
     except IntegrityError: # На случай очень редкой коллизии токенов
         await session.rollback()
         error_message = "Произошла ошибка при создании приглашения. Попробуйте еще раз."
@@ -763,16 +1196,25 @@ async def invite_employee_submit(
 @require_role("Проверяющий") # Указана роль
 async def get_employees_list(
     request: Request,
+    q: Optional[str] = Query(None), # Поиск по логину или ФИО
+    page: int = Query(1, ge=1),
     current_user: User = Depends(get_current_user)
 ):
+    search = q.strip() if q else None
     async with session_maker() as session:
-        users = await get_all_users(session)
+        # Сотрудники вместе со статистикой одним запросом
+        employees, total = await orm_get_employees_directory(session, search, page)
+        pages = max((total + EMPLOYEES_PER_PAGE - 1) // EMPLOYEES_PER_PAGE, 1)
         return templates.TemplateResponse(
             "employees.html",
             {
                 "request": request,
-                "users": users,
-                "current_user": current_user
+                "employees": employees,
+                "current_user": current_user,
+                "search": search or "",
+                "page": page,
+                "pages": pages,
+                "total": total
             }
         )
 
@@ -785,39 +1227,20 @@ async def get_employee_details(
     current_user: User = Depends(get_current_user)
 ):
     async with session_maker() as session:
-        # Получаем основную информацию о пользователе
-        user = await get_user_by_id(session, user_id)
-        if not user:
+        # Получаем пользователя, количество завершенных и проверяемых работ и текущий проект одним запросом
+        employee = await orm_get_employee_stats(session, user_id)
+        if not employee:
             raise HTTPException(status_code=404, detail="Сотрудник не найден")
         
-        # Получаем количество завершенных работ
-        completed_works_count = await session.execute(
-            select(func.count()).select_from(CompletedWorks).where(CompletedWorks.user_id == user_id)
-        )
-        completed_works_count = completed_works_count.scalar() or 0
-        
-        # Получаем количество проверяемых работ
-        inspected_works_count = await session.execute(
-            select(func.count()).select_from(Work).where(Work.inspector == user_id)
-        )
-        inspected_works_count = inspected_works_count.scalar() or 0
-        
-        # Получаем текущий проект
-        current_project = await session.execute(
-            select(Work).where(Work.id == user.current_project_id)
-        )
-        current_project = current_project.scalar()
-        current_project_title = current_project.title if current_project else "-"
-        
         return templates.TemplateResponse(
             "employee_details.html",
             {
                 "request": request,
-                "employee": user,
+                "employee": employee.User,
                 "current_user": current_user,
-                "completed_works_count": completed_works_count,
-                "inspected_works_count": inspected_works_count,
-                "current_project_title": current_project_title
+                "completed_works_count": employee.completed_works_count,
+                "inspected_works_count": employee.inspected_works_count,
+                "current_project_title": employee.current_project_title or "-"
             }
         )
 
@@ -827,13 +1250,16 @@ async def get_employee_details(
 async def update_employee_position(
     user_id: int,
     request: Request,
-    current_user: User = Depends(get_current_user)
+    # require_role для POST берет роль из БД без кэша: пониженный Мастер теряет права сразу
+    current_user: User = Depends(get_current_user),
 ):
+    if not isinstance(current_user, User):
+        return current_user
     try:
         data = await request.json()
         new_position = data.get("new_position")
         
-        if not new_position or new_position not in ["Ученик", "Проверяющий", "Мастер 3D"]:
+        if not new_position or new_position not in ROLE_LEVELS:
             raise HTTPException(status_code=400, detail="Недопустимая роль")
         
         async with session_maker() as session:
@@ -937,7 +1363,7 @@ async def set_password_submit(
         )
 
     # Хешируем пароль
-    hashed_password = pwd_context.hash(password)
+    hashed_password = await hash_password(password)
 
     # Обновляем пользователя
     user.password = hashed_password
@@ -947,6 +1373,7 @@ async def set_password_submit(
     # user.full_name = ??? 
     try:
         await session.commit()
+        invalidate_cached_user(user.login)
     except Exception as e:
         await session.rollback()
         logging.error(f"Error setting password for token {token}: {e}")
@@ -961,6 +1388,210 @@ async def set_password_submit(
     response.set_cookie("message", "Пароль успешно установлен! Теперь вы можете войти.".encode("utf-8"))
     return response
 
+###################################################################################################
+# JSON API v1 для Telegram-бота и дашбордов.
+# Те же запросы (пагинация, жадная загрузка проверяющего), что и у HTML страниц,
+# ответы - Pydantic модели, сериализуемые orjson
+###################################################################################################
+@app.get("/api/v1/works", response_class=ORJSONResponse, response_model=WorksPage, dependencies=[Depends(get_token_claims)])
+async def api_get_works(
+    request: Request,
+    page: int = Query(1, ge=1),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    session: AsyncSession = Depends(get_db),
+):
+    if status_filter is not None and status_filter not in WORKS_STATUS_FILTERS:
+        raise HTTPException(status_code=400, detail=f"Неизвестный статус: {status_filter}")
+
+    version = await orm_get_table_version(session, "works")
+    etag = make_weak_etag("api_works", version, page, status_filter)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    waiting, in_progress = await get_works_counters(session, version)
+    total = {"waiting": waiting, "in_progress": in_progress}.get(status_filter, waiting + in_progress)
+    works = await orm_get_works(
+        session,
+        assigned_to=WORKS_STATUS_FILTERS.get(status_filter),
+        limit=WORKS_PER_PAGE,
+        offset=(page - 1) * WORKS_PER_PAGE,
+    )
+    result = WorksPage(
+        items=[WorkOut.model_validate(work) for work in works],
+        page=page,
+        pages=max((total + WORKS_PER_PAGE - 1) // WORKS_PER_PAGE, 1),
+        total=total,
+        waiting=waiting,
+        in_progress=in_progress,
+    )
+    return set_etag(ORJSONResponse(result.model_dump()), etag)
+
+#____________________________________________________________________________________________________________________
+@app.get("/api/v1/works/{work_id}", response_class=ORJSONResponse, response_model=WorkOut, dependencies=[Depends(get_token_claims)])
+async def api_get_work(
+    work_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_db),
+):
+    version = await orm_get_table_version(session, "works")
+    etag = make_weak_etag("api_work", work_id, version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    work = await orm_get_work(session, work_id, with_inspector=True)
+    if not work:
+        raise HTTPException(status_code=404, detail="Работа не найдена")
+    return set_etag(ORJSONResponse(WorkOut.model_validate(work).model_dump()), etag)
+
+#____________________________________________________________________________________________________________________
+@app.get("/api/v1/employees", response_class=ORJSONResponse, response_model=EmployeesPage)
+@require_role("Проверяющий")
+async def api_get_employees(
+    request: Request,
+    q: Optional[str] = Query(None), # Поиск по логину или ФИО
+    page: int = Query(1, ge=1),
+    session: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),  # Роль из БД (снимок в кэше воркера, до USER_CACHE_TTL) для require_role
+):
+    if not isinstance(current_user, User):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Пользователь не найден")
+    employees, total = await orm_get_employees_directory(session, q.strip() if q else None, page)
+    result = EmployeesPage(
+        items=[EmployeeOut.from_row(row) for row in employees],
+        page=page,
+        pages=max((total + EMPLOYEES_PER_PAGE - 1) // EMPLOYEES_PER_PAGE, 1),
+        total=total,
+    )
+    return ORJSONResponse(result.model_dump())
+
+#____________________________________________________________________________________________________________________
+# Метрики в формате Prometheus (common/metrics.py), суммарно по всем воркерам
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Требуется токен метрик")
+    content = await asyncio.to_thread(lambda: render(collect_all()))
+    return PlainTextResponse(content, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+#____________________________________________________________________________________________________________________
+@app.get("/api/v1/checks/{check_id}", response_class=ORJSONResponse, response_model=CheckResultOut, dependencies=[Depends(get_token_claims)])
+async def api_get_check(check_id: uuid.UUID, current_user: User = Depends(get_current_user)):
+    """
+    200 - результаты, 202 {"status": "pending"} - проверка в очереди или выполняется,
+    410 - проверка потеряна (перезапуск воркера), 404 - проверки нет или она чужая.
+    Результаты хранятся RETENTION_CHECK_RESULTS_HOURS после проверки.
+    """
+    if not isinstance(current_user, User):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Пользователь не найден")
+    meta = await asyncio.to_thread(read_check_meta, check_id)
+    # Чужие проверки не отличаются от несуществующих
+    if meta is None or meta.get("user_id") != current_user.id:
+        raise HTTPException(status_code=404, detail="Результаты проверки не найдены")
+    # Идентификатор проверки - uuid из имени файла результатов (result_<uuid>.json)
+    result_json_path = UPLOAD_DIR / f"result_{check_id}.json"
+    try:
+        async with aiofiles.open(result_json_path, "rb") as f:
+            content = await f.read()
+    except FileNotFoundError:
+        if time.time() - meta.get("started_at", 0) > CHECK_PENDING_TIMEOUT:
+            raise HTTPException(status_code=410, detail="Проверка прервана перезапуском сервера, загрузите архив снова")
+        return ORJSONResponse({"id": str(check_id), "status": "pending"}, status_code=202)
+    result = CheckResultOut(id=str(check_id), results=orjson.loads(content))
+    return ORJSONResponse(result.model_dump())
+
+#____________________________________________________________________________________________________________________
+# Загрузка архива частями (services/chunked_upload.py). Оборванная загрузка продолжается
+# с offset из GET /api/v1/uploads/{upload_id}
+def get_own_upload(upload_id: uuid.UUID, current_user: User):
+    upload = load_upload(upload_id.hex)
+    if upload is None or upload.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Загрузка не найдена")
+    return upload
+
+def upload_status(upload) -> dict:
+    return UploadStatusOut(
+        upload_id=upload.upload_id,
+        filename=upload.filename,
+        size=upload.size,
+        offset=upload.offset,
+        chunk_size=UPLOAD_CHUNK_SIZE,
+    ).model_dump()
+
+def offset_conflict(e: ChunkOffsetError) -> ORJSONResponse:
+    # 409 с принятым смещением: клиент продолжает с него
+    return ORJSONResponse({"detail": str(e), "offset": e.offset}, status_code=409)
+
+@app.post("/api/v1/uploads", response_class=ORJSONResponse, response_model=UploadStatusOut, status_code=201, dependencies=[Depends(get_token_claims)])
+async def api_create_upload(data: UploadInit, current_user: User = Depends(get_current_user)):
+    try:
+        upload = await asyncio.to_thread(create_upload, current_user.id, data.filename, data.size, data.sha256)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info("Chunked upload started", extra={"upload_id": upload.upload_id, "upload_filename": upload.filename, "size": upload.size})
+    return ORJSONResponse(upload_status(upload), status_code=201)
+
+@app.get("/api/v1/uploads/{upload_id}", response_class=ORJSONResponse, response_model=UploadStatusOut, dependencies=[Depends(get_token_claims)])
+async def api_get_upload(upload_id: uuid.UUID, current_user: User = Depends(get_current_user)):
+    return ORJSONResponse(upload_status(get_own_upload(upload_id, current_user)))
+
+@app.put("/api/v1/uploads/{upload_id}", response_class=ORJSONResponse, response_model=UploadStatusOut, dependencies=[Depends(get_token_claims)])
+async def api_put_upload_chunk(
+    request: Request,
+    upload_id: uuid.UUID,
+    offset: int = Query(..., ge=0),
+    current_user: User = Depends(get_current_user),
+):
+    upload = get_own_upload(upload_id, current_user)
+    checksum = request.headers.get("X-Chunk-SHA256")
+    try:
+        await write_chunk(upload, offset, request.stream(), checksum)
+    except ChunkOffsetError as e:
+        return offset_conflict(e)
+    except ChunkChecksumError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except UploadGoneError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return ORJSONResponse(upload_status(upload))
+
+@app.delete("/api/v1/uploads/{upload_id}", status_code=204, dependencies=[Depends(get_token_claims)])
+async def api_cancel_upload(upload_id: uuid.UUID, current_user: User = Depends(get_current_user)):
+    await asyncio.to_thread(cancel_upload, get_own_upload(upload_id, current_user))
+
+@app.post("/api/v1/uploads/{upload_id}/finalize", response_class=ORJSONResponse, response_model=UploadFinalizeOut, status_code=202, dependencies=[Depends(get_token_claims)])
+async def api_finalize_upload(
+    request: Request,
+    upload_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+):
+    upload = get_own_upload(upload_id, current_user)
+    try:
+        archive = await finalize_upload(upload)
+    except ChunkOffsetError as e:
+        return offset_conflict(e)
+    except ChunkChecksumError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except UploadGoneError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    logger.info(
+        "Chunked upload finished",
+        extra={"upload_id": upload.upload_id, "archive": archive.digest, "size": archive.size, "duplicate": archive.existed},
+    )
+
+    # Проверка ставится в очередь, результат появится по status_url и на странице результатов
+    check_id = uuid.uuid4()
+    await asyncio.to_thread(write_check_meta, check_id, user_id=current_user.id)
+    background_tasks.add_task(run_queued_check, archive, check_id)
+    request.session['last_check_result_path'] = str(UPLOAD_DIR / f"result_{check_id}.json")
+    result = UploadFinalizeOut(
+        check_id=str(check_id),
+        status_url=f"/api/v1/checks/{check_id}",
+        results_url="/works/check_results",
+    )
+    return ORJSONResponse(result.model_dump(), status_code=202)
+
 ###################################################################################################
 # Функция отправки email
 async def send_invitation_email(recipient_email: str, token: str, request: Request):
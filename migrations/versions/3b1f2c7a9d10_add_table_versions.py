@@ -0,0 +1,31 @@
+"""Add table_versions change counters
+
+Revision ID: 3b1f2c7a9d10
+Revises: e608f63d8d40
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1f2c7a9d10'
+down_revision: Union[str, None] = 'e608f63d8d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'table_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
@@ -0,0 +1,42 @@
+"""Add review_screenshots table
+
+Revision ID: 8c4d2e1f6a73
+Revises: 3b1f2c7a9d10
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d2e1f6a73'
+down_revision: Union[str, None] = '3b1f2c7a9d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'review_screenshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('work_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('original_path', sa.String(length=255), nullable=False),
+        sa.Column('thumb_path', sa.String(length=255), nullable=True),
+        sa.Column('web_path', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.ForeignKeyConstraint(['work_id'], ['works.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_review_screenshots_work_id'), 'review_screenshots', ['work_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_review_screenshots_work_id'), table_name='review_screenshots')
+    op.drop_table('review_screenshots')
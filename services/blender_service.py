@@ -12,9 +12,12 @@ import uuid # Для уникальных имен JSON
 import asyncio
 import aiofiles
 
-# Настраиваем логирование
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from common.log import sampled_logger
+
+# Обработчики логов настраивает приложение (common/log.py)
 logger = logging.getLogger(__name__)
+# Построчный вывод контейнера: DEBUG и прореживается
+docker_stream_logger = sampled_logger(f"{__name__}.docker")
 
 class BlenderService:
     def __init__(self):
@@ -98,12 +101,16 @@ class BlenderService:
         host_addons_dir = self.blender_docker_dir_host / "addons"
 
         try:
-            logger.info(f"Начало проверки файла: {host_input_path}")
-            logger.info(f"Директория для вывода хоста: {self.host_output_dir}")
-            logger.info(f"Файл JSON результатов (хост): {host_json_output_path}")
-            logger.info(f"Файл логов Docker (хост): {host_docker_log_path}")
-            logger.info(f"Монтируемая директория с входным файлом (хост): {host_input_dir}")
-            logger.info(f"Монтируемая директория addons (хост): {host_addons_dir}")
+            logger.info(
+                "Начало проверки файла: %s", host_input_path,
+                extra={
+                    "output_dir": str(self.host_output_dir),
+                    "json_output": str(host_json_output_path),
+                    "docker_log": str(host_docker_log_path),
+                    "input_dir": str(host_input_dir),
+                    "addons_dir": str(host_addons_dir),
+                },
+            )
 
             # Удаляем старые файлы результатов/логов с таким же ID (маловероятно, но на всякий случай)
             if host_json_output_path.exists(): host_json_output_path.unlink()
@@ -187,7 +194,7 @@ class BlenderService:
                             break
                         decoded_line = line.decode('utf-8', errors='replace').strip()
                         await log_file.write(f"{prefix}: {decoded_line}\n")
-                        logger.debug(f"Docker {prefix}: {decoded_line}") # Опционально: дублируем в основной лог
+                        docker_stream_logger.debug(decoded_line, extra={"stream": prefix})
                 
                 await asyncio.gather(
                     log_stream(process.stdout, "stdout"),
@@ -198,16 +205,15 @@ class BlenderService:
             return_code = await process.wait()
             logger.info(f"Docker контейнер завершился с кодом {return_code}")
 
-            # Логируем содержимое лога Blender из контейнера (если он есть)
+            # Лог Blender из контейнера (если он есть) - только для отладки, поле обрезается по размеру.
             # Путь к логу Blender на хосте = self.host_output_dir / имя_файла_из_контейнера
             host_blender_log_path = self.host_output_dir / Path(container_blender_log_path).name
             if host_blender_log_path.exists():
                 try:
-                    async with aiofiles.open(host_blender_log_path, 'r', encoding='utf-8') as bf:
-                        blender_log_content = await bf.read()
-                    logger.info(f"--- Содержимое лога Blender ({host_blender_log_path}) ---")
-                    logger.info(blender_log_content)
-                    logger.info("--- Конец лога Blender ---")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        async with aiofiles.open(host_blender_log_path, 'r', encoding='utf-8') as bf:
+                            blender_log_content = await bf.read()
+                        logger.debug("Лог Blender", extra={"blender_log": blender_log_content, "path": str(host_blender_log_path)})
                 except Exception as e_log:
                     logger.warning(f"Не удалось прочитать лог Blender ({host_blender_log_path}): {e_log}")
             else:
@@ -240,7 +246,7 @@ class BlenderService:
                 try:
                      async with aiofiles.open(host_json_output_path, 'r', encoding='utf-8') as f_text:
                          raw_content = await f_text.read()
-                     logger.error(f"Содержимое файла {host_json_output_path}:\n{raw_content}")
+                     logger.error("Содержимое файла %s", host_json_output_path, extra={"content": raw_content})
                 except Exception as e_read_raw:
                      logger.error(f"Не удалось прочитать содержимое файла {host_json_output_path} как текст: {e_read_raw}")
                 raise Exception(f"Ошибка чтения JSON результатов из {host_json_output_path}")
@@ -255,7 +261,7 @@ class BlenderService:
                  try:
                       async with aiofiles.open(host_docker_log_path, 'r', encoding='utf-8') as lf_err:
                            docker_log_err = await lf_err.read()
-                      logger.error(f"--- Лог Docker ({host_docker_log_path}) при ошибке ---\n{docker_log_err}")
+                      logger.error("Лог Docker при ошибке", extra={"docker_log": docker_log_err, "path": str(host_docker_log_path)})
                  except Exception as e_log_read_err:
                       logger.error(f"Не удалось прочитать лог Docker ({host_docker_log_path}) при обработке ошибки: {e_log_read_err}")
             
@@ -263,7 +269,7 @@ class BlenderService:
                  try:
                       async with aiofiles.open(host_blender_log_path, 'r', encoding='utf-8') as bf_err:
                            blender_log_err = await bf_err.read()
-                      logger.error(f"--- Лог Blender ({host_blender_log_path}) при ошибке ---\n{blender_log_err}")
+                      logger.error("Лог Blender при ошибке", extra={"blender_log": blender_log_err, "path": str(host_blender_log_path)})
                  except Exception as e_log_read_err:
                       logger.error(f"Не удалось прочитать лог Blender ({host_blender_log_path}) при обработке ошибки: {e_log_read_err}")
                       
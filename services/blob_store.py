@@ -0,0 +1,117 @@
+"""
+Хранилище файлов по содержимому (content-addressed storage).
+
+Файл хранится один раз под именем SHA-256 своего содержимого:
+    uploads/blobs/3f/2a/3f2a9c...e1.zip
+Повторная загрузка того же файла не создает копию. Там, где файлу нужно другое имя
+(например, рабочая папка проверки), на блоб ставится жесткая ссылка.
+
+Весь остальной код работает с файлами только через этот модуль: хэш и ключи кэша
+берутся из одного места.
+"""
+import hashlib
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+import aiofiles
+from fastapi import UploadFile
+
+BLOBS_DIR = Path("uploads/blobs")
+CHUNK_SIZE = 1024 * 1024
+
+
+class Blob(NamedTuple):
+    digest: str  # SHA-256 содержимого (hex)
+    path: Path
+    size: int
+    existed: bool  # Такой файл уже был в хранилище (дубликат)
+
+
+class BlobStore:
+    def __init__(self, root: Path = BLOBS_DIR):
+        self.root = root
+        self.tmp_dir = root / "tmp"
+
+    def path_for(self, digest: str, suffix: str = "") -> Path:
+        """Путь блоба: две ступени каталогов по первым байтам хэша"""
+        return self.root / digest[:2] / digest[2:4] / f"{digest}{suffix}"
+
+    def _commit(self, tmp_path: Path, digest: str, suffix: str, size: int) -> Blob:
+        """Переносит временный файл в хранилище, если такого содержимого еще нет"""
+        path = self.path_for(digest, suffix)
+        try:
+            # Дубликат не перечитываем: хэш новых байтов уже известен. Размер - дешевая защита
+            # от обрезанного блоба
+            existing_size = path.stat().st_size
+        except FileNotFoundError:
+            existing_size = None
+        if existing_size == size:
+            try:
+                # Обновляем mtime, иначе очистка по возрасту (services/retention.py)
+                # может удалить блоб до того, как на него поставят ссылку
+                os.utime(path)
+            except FileNotFoundError:
+                pass  # Очистка успела удалить блоб - кладем новый
+            else:
+                tmp_path.unlink()
+                return Blob(digest, path, size, True)
+        # Новый файл или обрезанный блоб: содержимое временного файла уже сверено с хэшем
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, path)
+        return Blob(digest, path, size, False)
+
+    def _tmp_path(self) -> Path:
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        return self.tmp_dir / uuid.uuid4().hex
+
+    async def put_upload(self, upload: UploadFile, suffix: str = "") -> Blob:
+        """Потоково сохраняет загруженный файл, считая хэш по ходу записи"""
+        tmp_path = self._tmp_path()
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as buffer:
+                while chunk := await upload.read(CHUNK_SIZE):
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    await buffer.write(chunk)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return self._commit(tmp_path, hasher.hexdigest(), suffix, size)
+
+    def put_file(self, source: Path, suffix: str = "", move: bool = False, digest: str | None = None) -> Blob:
+        """Кладет существующий файл в хранилище (копированием или переносом). digest - если хэш уже посчитан"""
+        digest = digest or file_digest(source)
+        tmp_path = self._tmp_path()
+        if move:
+            shutil.move(source, tmp_path)  # Переименование, а между файловыми системами - копия
+        else:
+            shutil.copyfile(source, tmp_path)
+        return self._commit(tmp_path, digest, suffix, tmp_path.stat().st_size)
+
+    def link(self, blob_path: Path, destination: Path) -> Path:
+        """
+        Делает блоб доступным под другим именем: жесткая ссылка,
+        а если она невозможна (другая файловая система) - копия.
+        Ссылка - тот же файл, что и блоб: изменять его нельзя (в контейнер - только для чтения).
+        """
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.unlink(missing_ok=True)
+        try:
+            os.link(blob_path, destination)
+        except OSError:
+            shutil.copyfile(blob_path, destination)
+        return destination
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 файла"""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+blob_store = BlobStore()
@@ -0,0 +1,203 @@
+"""
+Возобновляемая загрузка больших архивов частями.
+
+Протокол (JSON API, см. /api/v1/uploads в main.py):
+    1. POST   /api/v1/uploads                          - создать загрузку (имя, размер, SHA-256 архива)
+    2. PUT    /api/v1/uploads/{id}?offset=N            - часть архива, заголовок X-Chunk-SHA256
+    3. GET    /api/v1/uploads/{id}                     - сколько байт уже принято (для продолжения)
+    4. POST   /api/v1/uploads/{id}/finalize            - архив собран, поставить проверку в очередь
+
+Части пишутся прямо в файл загрузки в ее рабочей папке (uploads/jobs/upload_<id>).
+Часть принимается, только если она начинается ровно с уже принятого смещения и ее
+хэш совпал; иначе файл обрезается обратно. Поэтому размер файла - это и есть
+последнее подтвержденное смещение, и оборванная загрузка продолжается с него,
+в том числе после перезапуска сервера или на другом воркере.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, NamedTuple, Optional
+
+import aiofiles
+
+from services.blob_store import Blob, blob_store, file_digest
+from services.workspace import DISK_ROOT
+
+MB = 1024 * 1024
+MAX_ARCHIVE_SIZE = int(os.getenv("MAX_ARCHIVE_SIZE", str(1024 * MB)))  # Как и в model_checker.py
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(8 * MB)))  # Максимальный размер одной части
+
+# Загрузки, в которые прямо сейчас пишется часть или которые завершаются (в пределах процесса)
+_locks: dict[str, asyncio.Lock] = {}
+
+
+class ChunkOffsetError(Exception):
+    """Часть начинается не с принятого смещения - клиент должен продолжить с offset"""
+    def __init__(self, offset: int):
+        super().__init__(f"Ожидается часть со смещения {offset}")
+        self.offset = offset
+
+
+class ChunkChecksumError(Exception):
+    """Хэш части (или всего архива) не совпал - часть не принята"""
+
+
+class UploadGoneError(Exception):
+    """Загрузки уже нет: ее завершил параллельный запрос, отменили или удалила очистка"""
+    def __init__(self):
+        super().__init__("Загрузка не найдена: она уже завершена или удалена")
+
+
+class UploadSession(NamedTuple):
+    upload_id: str
+    user_id: int
+    filename: str
+    size: int  # Заявленный размер архива
+    sha256: Optional[str]  # Заявленный хэш архива (необязательно)
+    created_at: float
+    root: Path
+
+    @property
+    def data_path(self) -> Path:
+        return self.root / "archive.part"
+
+    @property
+    def offset(self) -> int:
+        """Сколько байт уже принято"""
+        try:
+            return self.data_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+
+def _upload_root(upload_id: str) -> Path:
+    # Папки загрузок всегда на диске: архив до 1 ГБ не должен занимать tmpfs
+    return DISK_ROOT / f"upload_{upload_id}"
+
+
+def create_upload(user_id: int, filename: str, size: int, sha256: Optional[str] = None) -> UploadSession:
+    """Создает загрузку. ValueError - если архив не подходит"""
+    if not filename.lower().endswith(".zip"):
+        raise ValueError("Только ZIP архивы разрешены")
+    if size <= 0:
+        raise ValueError("Пустой архив")
+    if size > MAX_ARCHIVE_SIZE:
+        raise ValueError(f"Архив больше {MAX_ARCHIVE_SIZE // MB} МБ")
+
+    upload_id = uuid.uuid4().hex
+    session = UploadSession(
+        upload_id, user_id, os.path.basename(filename), size,
+        sha256.lower() if sha256 else None, time.time(), _upload_root(upload_id),
+    )
+    session.root.mkdir(parents=True, exist_ok=True)
+    session.data_path.touch()
+    meta = session._asdict()
+    meta["root"] = str(session.root)
+    tmp_path = session.root / "meta.json.tmp"
+    tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp_path, session.root / "meta.json")
+    return session
+
+
+def load_upload(upload_id: str) -> Optional[UploadSession]:
+    """Загрузка по идентификатору или None, если ее нет (завершена или удалена очисткой)"""
+    try:
+        meta = json.loads((_upload_root(upload_id) / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    meta["root"] = Path(meta["root"])
+    return UploadSession(**meta)
+
+
+async def write_chunk(
+    session: UploadSession, offset: int, chunks: AsyncIterator[bytes], checksum: Optional[str] = None
+) -> int:
+    """
+    Дописывает часть архива, начиная с offset, и возвращает новое принятое смещение.
+    Часть читается потоком и пишется сразу в файл; если поток оборвался, часть
+    больше допустимого или хэш не совпал, файл обрезается до offset.
+    """
+    lock = _locks.setdefault(session.upload_id, asyncio.Lock())
+    async with lock:
+        if not session.data_path.exists():
+            raise UploadGoneError()  # Пока часть ждала блокировку, загрузку завершили
+        current = session.offset
+        if offset != current:
+            raise ChunkOffsetError(current)
+
+        hasher = hashlib.sha256()
+        written = 0
+        try:
+            async with aiofiles.open(session.data_path, "r+b") as f:
+                await f.seek(offset)
+                try:
+                    async for chunk in chunks:
+                        written += len(chunk)
+                        if written > UPLOAD_CHUNK_SIZE or offset + written > session.size:
+                            raise ValueError("Часть больше допустимого размера")
+                        hasher.update(chunk)
+                        await f.write(chunk)
+                    if checksum and hasher.hexdigest() != checksum.lower():
+                        raise ChunkChecksumError("Контрольная сумма части не совпадает")
+                    await f.flush()
+                    # Смещение подтверждается клиенту только после того, как часть на диске
+                    await asyncio.to_thread(os.fsync, f.fileno())
+                except BaseException:
+                    await f.truncate(offset)
+                    raise
+            os.utime(session.root)  # Активная загрузка не считается брошенной (services/retention.py)
+        except FileNotFoundError:
+            raise UploadGoneError() from None
+        return offset + written
+
+
+async def finalize_upload(session: UploadSession) -> Blob:
+    """
+    Проверяет, что архив собран полностью, и переносит его в хранилище блобов.
+    Папка загрузки удаляется.
+
+    Завершение идет под блокировкой загрузки, поэтому часть или второй finalize ждут его
+    и затем получают UploadGoneError. Между воркерами загрузку забирает атомарное
+    переименование файла: проигравший запрос тоже получает UploadGoneError.
+    """
+    lock = _locks.setdefault(session.upload_id, asyncio.Lock())
+    async with lock:
+        if not session.data_path.exists():
+            raise UploadGoneError()
+        received = session.offset
+        if received != session.size:
+            raise ChunkOffsetError(received)
+        claimed_path = session.root / "archive.final"
+        try:
+            os.rename(session.data_path, claimed_path)
+        except FileNotFoundError:
+            raise UploadGoneError() from None
+        try:
+            # Архив читается целиком для хэша - в потоке
+            return await asyncio.to_thread(_store_archive, session, claimed_path)
+        finally:
+            await asyncio.to_thread(cancel_upload, session)
+
+
+def _store_archive(session: UploadSession, archive_path: Path) -> Blob:
+    try:
+        if archive_path.stat().st_size != session.size:
+            # Часть из другого воркера успела дописаться в уже забранный файл
+            raise ChunkChecksumError("Архив изменился во время завершения, загрузите его заново")
+        digest = file_digest(archive_path)
+        if session.sha256 and digest != session.sha256:
+            raise ChunkChecksumError("Контрольная сумма архива не совпадает, загрузите его заново")
+        return blob_store.put_file(archive_path, suffix=".zip", move=True, digest=digest)
+    except FileNotFoundError:
+        raise UploadGoneError() from None  # Папку удалили (отмена или очистка)
+
+
+def cancel_upload(session: UploadSession):
+    """Удаляет загрузку вместе с принятыми частями"""
+    shutil.rmtree(session.root, ignore_errors=True)
+    _locks.pop(session.upload_id, None)
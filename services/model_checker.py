@@ -4,10 +4,13 @@ import tempfile
 import zipfile
 import shutil
 import json
+import logging
 from typing import Dict, List, Tuple
 from pathlib import Path
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class ModelChecker:
     def __init__(self):
         self.blender_docker_dir = Path("blender-docker")
@@ -61,7 +64,7 @@ class ModelChecker:
                         docker_output_path = "/output/check_results.json"
                         
                         command_to_run = f'/app/check_model.sh "{docker_input_path}" "{docker_output_path}"'
-                        print(f"Running docker command: {command_to_run}")
+                        logger.info("Running docker command", extra={"command": command_to_run})
                         result = subprocess.run(
                             ["docker-compose", "run", "--rm", "blender", "sh", "-c", command_to_run],
                             cwd=str(self.blender_docker_dir),
@@ -123,7 +126,7 @@ class ModelChecker:
                 docker_output_path = "/output/check_results.json"
                 
                 command_to_run = f'/app/check_model.sh "{docker_input_path}" "{docker_output_path}"'
-                print(f"Running docker command: {command_to_run}")
+                logger.info("Running docker command", extra={"command": command_to_run})
                 result = subprocess.run(
                     ["docker-compose", "run", "--rm", "blender", "sh", "-c", command_to_run],
                     cwd=str(self.blender_docker_dir),
@@ -166,9 +169,9 @@ class ModelChecker:
             if temp_input and temp_input.exists():
                 try:
                     temp_input.unlink()
-                    print(f"Deleted temp input: {temp_input}")
+                    logger.debug("Deleted temp input: %s", temp_input)
                 except Exception as del_e:
-                    print(f"Error deleting temp input {temp_input}: {del_e}")
+                    logger.warning("Error deleting temp input %s: %s", temp_input, del_e)
             # Очищаем временную директорию
             if self.temp_dir.exists():
                 shutil.rmtree(self.temp_dir)
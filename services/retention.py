@@ -0,0 +1,194 @@
+"""
+Очистка артефактов проверок.
+
+Фоновая задача (запускается из lifespan) периодически проходит по рабочим папкам
+и удаляет файлы старше заданного возраста, а если папка все равно больше квоты -
+самые старые файлы сверх квоты. Удаляются также брошенные временные архивы
+и папки распаковки, оставшиеся после упавших проверок.
+"""
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from common.metrics import METRICS_DIR
+from services.blob_store import BLOBS_DIR
+from services.workspace import DISK_ROOT, TMPFS_ROOT
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+MB = 1024 * 1024
+
+
+class RetentionRule(NamedTuple):
+    name: str
+    directory: Path
+    patterns: tuple[str, ...]  # glob-шаблоны (файлы и папки) относительно directory
+    max_age: Optional[float] = None  # Секунды с последнего изменения
+    max_total_bytes: Optional[int] = None  # Квота на все подходящие файлы
+    own_files_only: bool = False  # Только файлы текущего пользователя ОС (для общих папок вроде /tmp)
+
+
+class SweepStats(NamedTuple):
+    removed: int
+    reclaimed_bytes: int
+    remaining_bytes: int
+
+
+def _env_hours(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default))) * HOUR
+
+
+def _env_mb(name: str, default: int) -> int:
+    return int(float(os.getenv(name, str(default))) * MB)
+
+
+def default_rules() -> list[RetentionRule]:
+    """Правила очистки по умолчанию (возраст и квоты настраиваются переменными окружения)"""
+    uploads = Path("uploads")
+    temp_dir = Path(tempfile.gettempdir())
+    return [
+        # Результаты и логи BlenderService: раньше не удалялись вообще
+        RetentionRule(
+            "blender-output",
+            Path("blender-docker/output2"),
+            ("results_*.json", "docker_run_*.log"),
+            max_age=_env_hours("RETENTION_BLENDER_OUTPUT_HOURS", 24),
+            max_total_bytes=_env_mb("RETENTION_BLENDER_OUTPUT_MB", 500),
+        ),
+        # Результаты проверок с метками владельцев (result_<id>.meta.json) и папки брошенных проверок
+        RetentionRule(
+            "check-results",
+            uploads,
+            ("result_*.json", "textures", "embedded_textures", "extracted_model", "Extracted_*"),
+            max_age=_env_hours("RETENTION_CHECK_RESULTS_HOURS", 6),
+        ),
+        # Рабочие папки проверок удаляются сразу после проверки; остаются только после падения процесса
+        RetentionRule("workspaces", DISK_ROOT, ("job_*",), max_age=_env_hours("RETENTION_WORKSPACES_HOURS", 1)),
+        RetentionRule("tmpfs-workspaces", TMPFS_ROOT, ("job_*",), max_age=_env_hours("RETENTION_WORKSPACES_HOURS", 1)),
+        # Брошенные загрузки частями: продолжить их можно, пока папка не удалена
+        RetentionRule("chunked-uploads", DISK_ROOT, ("upload_*",), max_age=_env_hours("RETENTION_CHUNKED_UPLOADS_HOURS", 24)),
+        RetentionRule(
+            "check-cache",
+            uploads / "check_cache",
+            ("*.json",),
+            max_age=_env_hours("RETENTION_CHECK_CACHE_HOURS", 30 * 24),
+            max_total_bytes=_env_mb("RETENTION_CHECK_CACHE_MB", 1024),
+        ),
+        RetentionRule(
+            "reports",
+            uploads / "reports",
+            ("*.docx", "*.tmp"),
+            max_age=_env_hours("RETENTION_REPORTS_HOURS", 7 * 24),
+            max_total_bytes=_env_mb("RETENTION_REPORTS_MB", 1024),
+        ),
+        # Архивы нужны только на время проверки (результат остается в check_cache);
+        # скриншоты в хранилище не трогаем - на них ссылается БД
+        RetentionRule(
+            "archive-blobs",
+            BLOBS_DIR,
+            ("*/*/*.zip",),
+            max_age=_env_hours("RETENTION_ARCHIVES_HOURS", 7 * 24),
+            max_total_bytes=_env_mb("RETENTION_ARCHIVES_MB", 10 * 1024),
+        ),
+        RetentionRule("blob-tmp", BLOBS_DIR / "tmp", ("*",), max_age=HOUR),
+        # Снимки метрик завершившихся воркеров (живые перезаписывают свой файл каждые несколько секунд)
+        RetentionRule("metrics-snapshots", METRICS_DIR, ("metrics_*.json", "metrics_*.tmp"), max_age=_env_hours("RETENTION_METRICS_HOURS", 24)),
+        # Временные архивы и папки распаковки из системной временной папки (старый способ загрузки)
+        RetentionRule(
+            "system-temp",
+            temp_dir,
+            ("tmp*.zip", "Extracted_tmp*"),
+            max_age=_env_hours("RETENTION_TEMP_HOURS", 6),
+            own_files_only=True,
+        ),
+    ]
+
+
+def _entry_size(path: Path) -> int:
+    if path.is_dir() and not path.is_symlink():
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+    return path.lstat().st_size
+
+
+def _remove(path: Path):
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def sweep_rule(rule: RetentionRule, now: Optional[float] = None) -> SweepStats:
+    """Применяет одно правило: сначала возраст, потом квота (удаляются самые старые)"""
+    if not rule.directory.is_dir():
+        return SweepStats(0, 0, 0)
+    now = time.time() if now is None else now
+    uid = os.getuid() if hasattr(os, "getuid") else None
+
+    entries = {}
+    for pattern in rule.patterns:
+        for path in rule.directory.glob(pattern):
+            try:
+                stat = path.lstat()
+                if rule.own_files_only and uid is not None and stat.st_uid != uid:
+                    continue
+                entries[path] = (stat.st_mtime, _entry_size(path))
+            except OSError:
+                continue  # Файл удалили параллельно
+
+    removed = reclaimed = 0
+    kept = []
+    for path, (mtime, size) in entries.items():
+        if rule.max_age is not None and now - mtime > rule.max_age:
+            _remove(path)
+            removed += 1
+            reclaimed += size
+        else:
+            kept.append((mtime, size, path))
+
+    remaining = sum(size for _, size, _ in kept)
+    if rule.max_total_bytes is not None and remaining > rule.max_total_bytes:
+        for mtime, size, path in sorted(kept, key=lambda entry: entry[0]):
+            if remaining <= rule.max_total_bytes:
+                break
+            _remove(path)
+            removed += 1
+            reclaimed += size
+            remaining -= size
+
+    return SweepStats(removed, reclaimed, remaining)
+
+
+def sweep(rules: list[RetentionRule]) -> dict[str, SweepStats]:
+    """Один проход по всем правилам"""
+    now = time.time()
+    return {rule.name: sweep_rule(rule, now) for rule in rules}
+
+
+async def run_sweeper(rules: list[RetentionRule], interval: float):
+    """Бесконечный цикл очистки. Работа с диском идет в потоке, чтобы не блокировать event loop"""
+    while True:
+        try:
+            stats = await asyncio.to_thread(sweep, rules)
+            reclaimed = sum(item.reclaimed_bytes for item in stats.values())
+            if reclaimed:
+                details = ", ".join(
+                    f"{name}: {item.removed} шт., {item.reclaimed_bytes / MB:.1f} МБ"
+                    for name, item in stats.items() if item.removed
+                )
+                logger.info("Retention sweep reclaimed %.1f MB (%s)", reclaimed / MB, details)
+        except Exception as e:
+            logger.error("Retention sweep failed: %s", e, exc_info=True)
+        await asyncio.sleep(interval)
@@ -0,0 +1,89 @@
+"""
+DOCX-отчет проверки (скриншоты + комментарии).
+
+Отчет собирается в пуле процессов и кэшируется на диске по хэшу входных данных:
+пока скриншоты и комментарии работы не изменились, повторное скачивание отдает
+готовый файл без пересборки.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from common.metrics import cache_requests
+from common.schemas import create_docx_with_screenshots_and_comments, REPORT_IMAGE_DPI
+from services.screenshots import screenshot_executor
+
+REPORTS_DIR = Path("uploads/reports")
+# Увеличивается при изменении вида отчета, чтобы старые файлы из кэша не отдавались
+REPORT_FORMAT_VERSION = 1
+
+# Отчеты, которые собираются прямо сейчас: повторный запрос ждет ту же сборку
+_building: dict[str, asyncio.Future] = {}
+# Неудачные сборки: ключ отчета -> время ошибки. Пока ошибка свежая, тот же отчет заново не
+# собирается; новые скриншоты или комментарии дают новый ключ
+_failures: dict[str, float] = {}
+REPORT_RETRY_AFTER = 10 * 60
+REPORT_FAILURES_MAX = 1000
+
+
+def report_key(screenshots) -> str:
+    """Хэш входных данных отчета (скриншоты ReviewScreenshot по порядку и их комментарии)"""
+    parts = [REPORT_FORMAT_VERSION, REPORT_IMAGE_DPI]
+    for screenshot in screenshots:
+        try:
+            size = os.path.getsize(screenshot.original_path)
+        except OSError:
+            size = None
+        parts.append([screenshot.id, screenshot.original_path, size, screenshot.comment])
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def report_path(work_id: int, key: str) -> Path:
+    return REPORTS_DIR / f"work_{work_id}_{key[:16]}.docx"
+
+
+def _build_report(paths: list[str], comments: list[str | None], output_path: str):
+    """Собирает отчет во временный файл и атомарно переименовывает (выполняется в пуле процессов)"""
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    create_docx_with_screenshots_and_comments(paths, comments, tmp_path)
+    os.replace(tmp_path, output_path)
+
+
+async def ensure_report(work_id: int, screenshots) -> Path:
+    """Возвращает путь к готовому отчету, при необходимости собирая его"""
+    key = report_key(screenshots)
+    path = report_path(work_id, key)
+    if path.exists():
+        cache_requests.inc(cache="review_report", result="hit")
+        return path
+    cache_requests.inc(cache="review_report", result="miss")
+
+    future = _building.get(key)
+    if future is None:
+        REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        # Для отчета берем WebP-версию, если она уже готова - ее быстрее уменьшать
+        paths = [screenshot.web_path or screenshot.original_path for screenshot in screenshots]
+        comments = [screenshot.comment for screenshot in screenshots]
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(screenshot_executor, _build_report, paths, comments, str(path))
+        _building[key] = future
+        future.add_done_callback(lambda _: _building.pop(key, None))
+    try:
+        await asyncio.shield(future)
+    except Exception:
+        _failures.pop(key, None)
+        _failures[key] = time.monotonic()
+        while len(_failures) > REPORT_FAILURES_MAX:
+            del _failures[next(iter(_failures))]
+        raise
+    _failures.pop(key, None)
+    return path
+
+
+def report_failed(key: str) -> bool:
+    """Последняя сборка этого отчета завершилась ошибкой меньше REPORT_RETRY_AFTER назад"""
+    failed_at = _failures.get(key)
+    return failed_at is not None and time.monotonic() - failed_at < REPORT_RETRY_AFTER
@@ -0,0 +1,91 @@
+"""
+Скриншоты проверки: сохранение загрузок и подготовка уменьшенных версий.
+
+Оригинал потоково сохраняется в хранилище по содержимому (services/blob_store.py),
+миниатюра и WebP-версия для просмотра строятся рядом с ним в отдельном пуле процессов,
+чтобы декодирование картинок не занимало event loop и GIL веб-воркера.
+Одинаковые скриншоты хранятся и обрабатываются один раз.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fastapi import UploadFile
+from PIL import Image, ImageOps
+
+from services.blob_store import Blob, blob_store
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".bmp"}
+
+THUMB_SIZE = (320, 320)  # Миниатюра для списка скриншотов
+WEB_MAX_SIZE = (1600, 1600)  # Версия для просмотра в браузере
+WEBP_QUALITY = 80
+
+# spawn, а не fork: процесс веб-воркера многопоточный, fork из него небезопасен
+screenshot_executor = ProcessPoolExecutor(
+    max_workers=int(os.getenv("SCREENSHOT_WORKERS", "2")),
+    mp_context=multiprocessing.get_context("spawn"),
+)
+
+
+async def store_screenshot(upload: UploadFile) -> Blob:
+    """Сохраняет скриншот в хранилище (дубликаты не копируются)"""
+    suffix = Path(upload.filename or "").suffix.lower()
+    if suffix not in ALLOWED_SUFFIXES:
+        suffix = ".png"
+    return await blob_store.put_upload(upload, suffix=suffix)
+
+
+def _save_webp(image: Image.Image, path: Path):
+    """Пишет во временный файл и переименовывает: параллельная обработка того же скриншота не увидит недописанный файл"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    image.save(tmp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+    os.replace(tmp_path, path)
+
+
+def make_variants(original_path: str) -> tuple[str, str]:
+    """
+    Строит миниатюру и WebP-версию для просмотра (выполняется в пуле процессов).
+    Возвращает пути (thumb_path, web_path).
+    """
+    original = Path(original_path)
+    thumb_path = original.with_name(f"{original.stem}_thumb.webp")
+    web_path = original.with_name(f"{original.stem}_web.webp")
+    if thumb_path.exists() and web_path.exists():
+        # Этот скриншот уже загружали - версии построены раньше
+        return str(thumb_path), str(web_path)
+    with Image.open(original) as image:
+        # draft ускоряет декодирование больших JPEG: сразу читается уменьшенная версия
+        image.draft("RGB", WEB_MAX_SIZE)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        web = image.copy()
+        web.thumbnail(WEB_MAX_SIZE)
+        _save_webp(web, web_path)
+        web.thumbnail(THUMB_SIZE)
+        _save_webp(web, thumb_path)
+    return str(thumb_path), str(web_path)
+
+
+async def generate_variants(paths: list[str]) -> list[tuple[str, str] | None]:
+    """
+    Параллельно строит уменьшенные версии для списка оригиналов.
+    Для файлов, которые не удалось обработать, возвращается None.
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [loop.run_in_executor(screenshot_executor, make_variants, path) for path in paths]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    variants = []
+    for path, result in zip(paths, results):
+        if isinstance(result, BaseException):
+            logger.warning("Could not build screenshot variants for %s: %s", path, result)
+            variants.append(None)
+        else:
+            variants.append(result)
+    return variants
@@ -0,0 +1,55 @@
+"""
+Изолированные рабочие папки проверок.
+
+Каждая проверка получает свою папку (архив, распаковка, текстуры, результат),
+которая целиком монтируется в контейнер и удаляется после проверки. Параллельные
+проверки не видят и не затирают файлы друг друга.
+
+При CHECK_WORKSPACE_TMPFS=1 папки создаются в tmpfs (по умолчанию /dev/shm),
+и распаковка архива не нагружает диск.
+"""
+import logging
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple
+
+DISK_ROOT = Path(os.getenv("CHECK_WORKSPACE_ROOT", "uploads/jobs"))
+TMPFS_ROOT = Path(os.getenv("CHECK_WORKSPACE_TMPFS_ROOT", "/dev/shm/model-checks"))
+USE_TMPFS = os.getenv("CHECK_WORKSPACE_TMPFS", "0") == "1"
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorkspace(NamedTuple):
+    root: Path
+    input_dir: Path  # Входной архив
+    scratch_dir: Path  # Распаковка, извлеченные текстуры
+    output_dir: Path  # JSON результатов
+
+
+def workspace_root() -> Path:
+    """Папка для рабочих папок: tmpfs, если включен и доступен, иначе диск"""
+    if USE_TMPFS:
+        try:
+            TMPFS_ROOT.mkdir(parents=True, exist_ok=True)
+            return TMPFS_ROOT
+        except OSError as e:
+            logger.warning("tmpfs workspace root %s is not available, using disk: %s", TMPFS_ROOT, e)
+    DISK_ROOT.mkdir(parents=True, exist_ok=True)
+    return DISK_ROOT
+
+
+@contextmanager
+def job_workspace(job_id: str | None = None):
+    """Создает рабочую папку проверки и удаляет ее при выходе (в том числе при ошибке)"""
+    root = (workspace_root() / f"job_{job_id or uuid.uuid4().hex}").resolve()
+    workspace = JobWorkspace(root, root / "input", root / "scratch", root / "output")
+    for directory in (workspace.input_dir, workspace.scratch_dir, workspace.output_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+    try:
+        yield workspace
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
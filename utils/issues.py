@@ -0,0 +1,124 @@
+"""
+Тексты замечаний проверки модели.
+
+Проверка в Blender (blender-docker/addons/model_checker.py) пишет замечания
+в виде {"code": ..., "object": ..., "params": {...}}. Здесь коды переводятся
+в русский текст. Шаблоны разбираются один раз при импорте модуля.
+"""
+from string import Formatter
+
+ISSUE_TEXTS = {
+    'ARCHIVE_NOT_FOUND': "Архив не найден",
+    'ARCHIVE_SIZE': "Размер архива {size_mb} МБ",
+    'ARCHIVE_TOO_LARGE': "Размер архива {size_mb} МБ превышает лимит 1 ГБ",
+    'ARCHIVE_CONTENTS_OK': "Содержимое архива корректно",
+    'ARCHIVE_CONTENTS_ERROR': "Ошибка проверки содержимого архива: {error}",
+    'FBX_COUNT_INVALID': "Найдено FBX файлов: {count}, ожидается от {min} до {max}",
+    'GROUND_FBX_MISSING': "Не найден FBX файл Ground",
+    'GROUND_FBX_MULTIPLE': "Найдено несколько FBX файлов Ground: {files}",
+    'OKS_FBX_TOO_MANY': "Слишком много FBX файлов ОКС: {count}, допускается не более {max}",
+    'OKS_FBX_NAME_INVALID': "Неверное имя FBX файла ОКС: {object}, ожидается [xxxx]_[адрес]_[01-20].fbx",
+    'FBX_NAME_VALID': "Корректное имя FBX файла: {object}",
+    'FBX_NAME_INVALID': "Неверное имя FBX файла: {object}. Ожидается имя ОКС или Ground",
+    'SCENE_INVALID_OBJECT_TYPE': "{object}: недопустимый тип объекта ({type})",
+    'SCENE_OBJECT_HAS_HIERARCHY': "{object}: есть родитель или дочерние объекты",
+    'SCENE_OBJECT_HAS_ANIMATION': "{object}: есть анимация",
+    'SCENE_HAS_ARMATURES': "Найдены кости (арматуры)",
+    'SCENE_HAS_CAMERAS': "Найдены камеры",
+    'SCENE_HAS_LIGHTS': "Найдены источники света",
+    'SCENE_HAS_SOUNDS': "Найдены звуки",
+    'GROUND_NOT_FOUND': "Объекты Ground не найдены",
+    'GROUND_NO_FACES': "{object}: нет полигонов",
+    'GROUND_DROP_TOO_SMALL': "{object}: опуск Ground {drop} м меньше {min} м",
+    'GROUND_DROP_OK': "Проверка опуска Ground пройдена",
+    'FLOATING_VERTEX': "{object}: летающих вершин: {count}, например в точках {samples}",
+    'DEGENERATE_EDGE': "{object}: вырожденных рёбер: {count}, например в точках {samples}",
+    'NON_TRIANGULATED_POLYGON': "{object}: найден нетриангулированный полигон (вершин: {vertices})",
+    'TRIANGULATION_OK': "Вся геометрия триангулирована",
+    'ROTATION_NOT_RESET': "{object}: не сброшено вращение (ось {axis}: {angle})",
+    'SCALE_NOT_RESET': "{object}: не сброшен масштаб ({scale})",
+    'UV_MISSING': "{object}: нет UV-развёртки",
+    'UV_OUT_OF_BOUNDS': "{object}: UV выходит за пределы 0-1 или ближе {padding} px к краю",
+    'POLY_COUNT_OKS': "Полигонов ОКС: {count}/{limit}",
+    'POLY_COUNT_GROUND': "Полигонов Ground: {count}/{limit}",
+    'POLY_COUNT_OTHER': "Прочих полигонов: {count}",
+    'NO_TEXTURES': "Текстуры не найдены",
+    'TEXTURE_NOT_PNG': "Текстура {object} не в формате PNG",
+    'TEXTURE_HAS_ALPHA': "{object}: есть альфа-канал (режим: {mode}, бит: {bits})",
+    'TEXTURE_SIZE_INVALID': "{object}: размер {size}, ожидается {expected}",
+    'NO_GLASS_OBJECTS': "Стеклянные объекты не найдены",
+    'GLASS_TOO_MANY_MATERIALS': "{object}: материалов {count} (допускается не более {max})",
+    'GLASS_HAS_TEXTURE': "{object}: у материала {material} есть текстура {texture} (для стекла текстуры запрещены)",
+    'NO_GROUND_OBJECTS': "Объекты Ground не найдены",
+    'GROUND_TOO_MANY_MATERIALS': "{object}: материалов {count} (допускается не более {max})",
+    'NO_MESH_OBJECTS': "В сцене нет mesh-объектов",
+    'GEOMETRY_NAME_OK': "{object}",
+    'GEOMETRY_NAME_INVALID': "{object}",
+    'MATERIAL_NAME_OK': "{object}",
+    'MATERIAL_NAME_INVALID': "{object}",
+    'INVALID_CHARS': "{object}: недопустимые символы ({chars})",
+    'DUPLICATE_MATERIAL': "{object}: дубликат имени материала",
+    'DUPLICATE_TEXTURE': "{object}: дубликат имени текстуры",
+    'MORE_ISSUES': "...и ещё замечаний: {count}",
+}
+
+
+def _compile(template: str) -> list[tuple[str, str | None]]:
+    """Разбирает шаблон на пары (текст, имя поля)"""
+    return [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+
+_COMPILED = {code: _compile(template) for code, template in ISSUE_TEXTS.items()}
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        return f"{value:g}"
+    if isinstance(value, (list, tuple)):
+        return "(" + ", ".join(_format_value(item) for item in value) + ")"
+    return str(value)
+
+
+def issue_text(issue) -> str:
+    """
+    Фильтр Jinja2: текст замечания по коду.
+    Строки (результаты старого формата) возвращаются без изменений.
+    """
+    if isinstance(issue, str):
+        return issue
+    parts = _COMPILED.get(issue.get('code'))
+    if parts is None:
+        return issue.get('object') or issue.get('code', '')
+    values = issue.get('params') or {}
+    result = []
+    for literal, field in parts:
+        result.append(literal)
+        if field == 'object':
+            result.append(str(issue.get('object', '')))
+        elif field is not None:
+            result.append(_format_value(values.get(field, '')))
+    return "".join(result)
+
+
+def issue_status(issue) -> str:
+    """Статус пункта проверки нейминга: passed / failed / warning"""
+    code = issue.get('code', '') if isinstance(issue, dict) else ''
+    if code.endswith('_OK'):
+        return 'passed'
+    if code.endswith('_INVALID'):
+        return 'failed'
+    return 'warning'
+
+
+def check_verdict(results: dict) -> str:
+    """Итог проверки для логов: ERROR (проверка не выполнилась), FAILED или PASSED"""
+    if "error" in results or "final_error" in results or "check_error" in results:
+        return "ERROR"
+    for group in ("geometry_data", "texture_material"):
+        for details in (results.get(group) or {}).values():
+            if isinstance(details, dict) and details.get("status") == "FAILED":
+                return "FAILED"
+    for issues in (results.get("naming") or {}).values():
+        if any(issue_status(issue) == "failed" for issue in issues):
+            return "FAILED"
+    return "PASSED"
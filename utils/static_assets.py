@@ -0,0 +1,143 @@
+"""
+Сборка и раздача статических файлов.
+
+Сборка (запускается при деплое, после изменения файлов в static/):
+    python -m utils.static_assets
+
+Для каждого файла создается копия с хэшем содержимого в имени (css/custom.3f2a9c1b7d.css),
+а рядом с текстовыми файлами - сжатые варианты .gz и .br. Соответствие исходных путей
+и путей с хэшем записывается в static/manifest.json.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import pass_context
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # brotli не обязателен - без него собираются только .gz
+    brotli = None
+
+STATIC_DIR = Path("static")
+MANIFEST_NAME = "manifest.json"
+FINGERPRINT_LENGTH = 10
+# Сжимаем только текстовые форматы и только если файл больше порога
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".map", ".svg", ".json", ".txt", ".html", ".xml"}
+MIN_COMPRESS_SIZE = 256
+# Файлы с хэшем в имени никогда не меняются, браузер может хранить их год
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{%d}(\.[^./]+)$" % FINGERPRINT_LENGTH)
+# Варианты сжатия в порядке предпочтения: (кодировка, расширение файла)
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def _write_compressed(path: Path, content: bytes):
+    """Пишет .gz и .br рядом с файлом, если сжатие дает выигрыш"""
+    if path.suffix not in COMPRESSIBLE_SUFFIXES or len(content) < MIN_COMPRESS_SIZE:
+        return
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    for suffix, data in variants.items():
+        if len(data) < len(content):
+            Path(f"{path}{suffix}").write_bytes(data)
+
+
+def build_static(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    """
+    Собирает статику: файлы с хэшем в имени, сжатые варианты и manifest.json.
+    Результаты предыдущей сборки удаляются.
+    """
+    for path in list(static_dir.rglob("*")):
+        if path.is_file() and (path.suffix in (".gz", ".br") or FINGERPRINT_RE.search(path.name)):
+            path.unlink()
+
+    manifest = {}
+    for path in sorted(static_dir.rglob("*")):
+        if not path.is_file() or path.name == MANIFEST_NAME:
+            continue
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()[:FINGERPRINT_LENGTH]
+        hashed_path = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+        hashed_path.write_bytes(content)
+        _write_compressed(path, content)
+        _write_compressed(hashed_path, content)
+        manifest[path.relative_to(static_dir).as_posix()] = hashed_path.relative_to(static_dir).as_posix()
+
+    (static_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+@lru_cache(maxsize=1)
+def load_manifest(static_dir: Path = STATIC_DIR) -> dict[str, str]:
+    """Читает manifest.json. Без сборки возвращает пустой словарь - ссылки ведут на исходные файлы"""
+    try:
+        return json.loads((static_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+@pass_context
+def static_url(context, path: str) -> str:
+    """Jinja2-функция: URL статического файла с хэшем в имени (если статика собрана)"""
+    return str(context["request"].url_for("static", path=load_manifest().get(path, path)))
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Кодировки из Accept-Encoding, кроме явно запрещенных через q=0"""
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if name and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles, который отдает заранее сжатые варианты (.br/.gz) по Accept-Encoding
+    и ставит Cache-Control: immutable для файлов с хэшем в имени.
+    """
+
+    async def get_response(self, path: str, scope):
+        response = None
+        compressible = Path(path).suffix in COMPRESSIBLE_SUFFIXES
+        if compressible:
+            accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+            for encoding, suffix in ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                try:
+                    response = await super().get_response(path + suffix, scope)
+                except HTTPException:
+                    continue
+                response.headers["Content-Encoding"] = encoding
+                if "content-type" in response.headers:
+                    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                    if media_type.startswith("text/"):
+                        media_type += "; charset=utf-8"
+                    response.headers["Content-Type"] = media_type
+                break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+        if compressible:
+            response.headers["Vary"] = "Accept-Encoding"
+        if FINGERPRINT_RE.search(path) and response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+if __name__ == "__main__":
+    built = build_static()
+    print(f"Собрано файлов: {len(built)}" + ("" if brotli else " (brotli не установлен, только gzip)"))
@@ -0,0 +1,35 @@
+"""
+Окружение Jinja2 для шаблонов приложения.
+
+Скомпилированные шаблоны сохраняются в файловый кэш байткода: после перезапуска
+воркера шаблон не разбирается заново, а загружается из кэша. Кэш сбрасывается
+автоматически при изменении исходного файла шаблона.
+"""
+import os
+
+import jinja2
+
+
+def create_template_env(directory: str, cache_dir: str | None = None, auto_reload: bool = True) -> jinja2.Environment:
+    """Окружение Jinja2 с файловым кэшем байткода (если указан cache_dir)"""
+    bytecode_cache = None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(cache_dir)
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(directory),
+        autoescape=True,
+        bytecode_cache=bytecode_cache,
+        auto_reload=auto_reload,
+    )
+
+
+def warm_up_templates(env: jinja2.Environment) -> list[str]:
+    """
+    Компилирует все шаблоны заранее (вызывается при старте приложения),
+    чтобы первые запросы после перезапуска не тратили время на компиляцию.
+    """
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    return names